@@ -0,0 +1,85 @@
+"""
+Compara la latencia de los métodos de búsqueda de find_path_with_charging
+para consultas de un solo par (origen de almacenamiento, destino cliente).
+
+Uso:
+    python benchmarks/bench_search_modes.py --sizes 150 1000 5000 --queries 30
+    python benchmarks/bench_search_modes.py --methods bfs bidirectional alt
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model.Graph import Graph
+from src.sim.SimulationInitializer import SimulationInitializer, SEARCH_METHODS
+
+
+def build_network(simulation, num_nodes, seed):
+    """
+    Crea una red con la misma distribución que initialize_network (20% S,
+    20% C, 60% T, cadena inicial más aristas aleatorias) sin su límite de 150 nodos.
+    """
+    rng = random.Random(seed)
+    if num_nodes <= 150:
+        random.seed(seed)
+        simulation.initialize_network(num_nodes)
+        return
+    graph = Graph()
+    storage = max(1, int(num_nodes * 0.2))
+    charging = max(1, int(num_nodes * 0.2))
+    simulation._storage_nodes = [f"S{i + 1}" for i in range(storage)]
+    simulation._charging_nodes = [f"C{i + 1}" for i in range(charging)]
+    simulation._client_nodes = [f"T{i + 1}" for i in range(num_nodes - storage - charging)]
+    nodes = simulation._storage_nodes + simulation._charging_nodes + simulation._client_nodes
+    rng.shuffle(nodes)  # Mezclar roles a lo largo de la cadena
+    for vertex in nodes:
+        graph.add_vertex(vertex)
+    for u, v in zip(nodes, nodes[1:]):
+        graph.add_edge(u, v, rng.randint(1, 5))
+    for _ in range(num_nodes // 2):
+        u, v = rng.sample(nodes, 2)
+        graph.add_edge(u, v, rng.randint(1, 5))
+    simulation.graph = graph
+
+
+def run(sizes, methods, queries, seed):
+    print(f"{'nodos':>7} {'método':>14} {'mediana ms':>11} {'p95 ms':>9} {'completas':>10}")
+    for size in sizes:
+        simulation = SimulationInitializer()
+        build_network(simulation, size, seed)
+        rng = random.Random(seed)
+        pairs = [(rng.choice(simulation._storage_nodes), rng.choice(simulation._client_nodes))
+                 for _ in range(queries)]
+        for method in methods:
+            simulation.find_path_with_charging(*pairs[0], method=method)  # Preprocesamiento
+            timings = []
+            completed = 0
+            for start, end in pairs:
+                simulation.path_cache.clear()
+                began = time.perf_counter()
+                result = simulation.find_path_with_charging(start, end, method=method)
+                timings.append((time.perf_counter() - began) * 1000)
+                completed += result['completed']
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{size:>7} {method:>14} {statistics.median(timings):>11.3f} {p95:>9.3f} "
+                  f"{completed:>5}/{len(pairs)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[150, 1000, 5000])
+    parser.add_argument('--methods', nargs='+', default=['bfs', 'bidirectional'], choices=SEARCH_METHODS)
+    parser.add_argument('--queries', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.sizes, args.methods, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,511 @@
+"""
+Prueba de carga de find_path_with_charging: N clientes concurrentes emiten
+consultas (almacenamiento, cliente) sobre un mismo simulador y se mide cómo
+se comportan la búsqueda y su caché bajo concurrencia.
+
+Cada consulta es fría (un par que nadie consultó antes, por lo que debe
+ejecutar una búsqueda) o tibia (un par del conjunto caliente, precalentado
+antes de empezar). La proporción de consultas tibias, la distribución con
+que se eligen los pares calientes (uniforme o Zipf), la mezcla de métodos
+de búsqueda y el tiempo de espera entre consultas son configurables. Los
+clientes son hilos que llaman al simulador directamente o, con
+--transport http, a un servicio HTTP local que atiende las consultas.
+
+Por cada cantidad de clientes se reporta el throughput, los percentiles de
+latencia (total y por tipo de consulta), el histograma de latencias, la
+efectividad de la caché y una serie temporal por intervalo. Los resultados
+se pueden guardar en JSON y comparar contra una ejecución anterior, como en
+run_benchmarks.py.
+
+Uso:
+    python benchmarks/load_harness.py --clients 1 4 16 --duration 10
+    python benchmarks/load_harness.py --warm-ratio 0.9 --distribution zipf --zipf-s 1.2
+    python benchmarks/load_harness.py --methods bfs=0.7 bidirectional=0.3 --think-ms 5
+    python benchmarks/load_harness.py --transport http --save load.json
+    python benchmarks/load_harness.py --compare load.json --threshold 0.15
+"""
+import argparse
+import bisect
+import datetime
+import http.client
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_benchmarks import build_simulation
+from src.sim.SimulationInitializer import SEARCH_METHODS
+from src.sim.RouteCacheStore import RouteCacheStore
+from src.sim.Instrumentation import LATENCY_BUCKETS_MS, CACHE_MEMORY, CACHE_STORE, CACHE_MISS
+from src.sim.Metrics import MetricsRegistry
+
+KIND_COLD = 'cold'
+KIND_WARM = 'warm'
+
+DISTRIBUTIONS = ('uniform', 'zipf')
+
+
+def parse_methods(values):
+    """
+    Mezcla de métodos a partir de argumentos 'método=peso' (sin peso = 1).
+
+    Returns:
+        list: Pares (método, peso)
+
+    Raises:
+        argparse.ArgumentTypeError: Si un método o peso no es válido
+    """
+    mix = []
+    for value in values:
+        method, _, weight = value.partition('=')
+        if method not in SEARCH_METHODS:
+            raise argparse.ArgumentTypeError(f"Método de búsqueda no válido: {method}")
+        try:
+            weight = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Peso no válido: {value}")
+        if weight <= 0:
+            raise argparse.ArgumentTypeError(f"El peso debe ser positivo: {value}")
+        mix.append((method, weight))
+    return mix
+
+
+class Workload:
+    """
+    Generador de consultas compartido por los clientes.
+
+    Los pares fríos se toman sin repetición de una permutación de todos los
+    pares (almacenamiento, cliente) que no están en el conjunto caliente; si
+    se agotan, la consulta se emite como tibia. Cada cliente usa su propio
+    random.Random, así que con la misma semilla y cantidad de clientes la
+    secuencia de cada cliente es la misma en cada ejecución (el reparto de
+    pares fríos entre clientes depende del orden de llegada).
+    """
+
+    def __init__(self, simulation, options):
+        rng = random.Random(options.seed)
+        storage, clients = simulation._storage_nodes, simulation._client_nodes
+        total = len(storage) * len(clients)
+        hot = min(options.hot_pairs, total)
+        # Índices de pares sin materializar el producto completo (puede ser muy grande)
+        chosen = rng.sample(range(total), min(total, hot + options.max_cold_pairs))
+        pairs = [(storage[index // len(clients)], clients[index % len(clients)]) for index in chosen]
+        self.hot = pairs[:hot]
+        self._cold = pairs[hot:]
+        self._next_cold = itertools.count()
+        self.warm_ratio = options.warm_ratio
+        self.methods = [method for method, _ in options.methods]
+        total_weight = sum(weight for _, weight in options.methods)
+        self._method_cdf = list(itertools.accumulate(weight / total_weight for _, weight in options.methods))
+        if options.distribution == 'zipf':
+            weights = [1 / (rank + 1) ** options.zipf_s for rank in range(len(self.hot))]
+        else:
+            weights = [1.0] * len(self.hot)
+        total_weight = sum(weights)
+        self._hot_cdf = list(itertools.accumulate(weight / total_weight for weight in weights))
+        self.cold_exhausted = 0
+
+    def method(self, rng):
+        """Método de búsqueda de la próxima consulta según la mezcla."""
+        return self.methods[min(bisect.bisect_left(self._method_cdf, rng.random()), len(self.methods) - 1)]
+
+    def hot_pair(self, rng):
+        """Par del conjunto caliente según la distribución configurada."""
+        return self.hot[min(bisect.bisect_left(self._hot_cdf, rng.random()), len(self.hot) - 1)]
+
+    def next_query(self, rng):
+        """
+        Próxima consulta de un cliente.
+
+        Returns:
+            tuple: (tipo, origen, destino, método)
+        """
+        method = self.method(rng)
+        if self.hot and rng.random() < self.warm_ratio:
+            return (KIND_WARM, *self.hot_pair(rng), method)
+        index = next(self._next_cold)  # itertools.count es atómico bajo el GIL
+        if index < len(self._cold):
+            return (KIND_COLD, *self._cold[index], method)
+        self.cold_exhausted += 1
+        if not self.hot:
+            raise RuntimeError("No quedan pares para consultar")
+        return (KIND_WARM, *self.hot_pair(rng), method)
+
+
+def query(simulation, start, end, method):
+    """
+    Consulta directa. Usa la implementación interna de find_path_with_charging
+    para conocer el origen del resultado (memoria, caché persistente o búsqueda).
+
+    Returns:
+        tuple: (completed, origen del resultado)
+    """
+    stats = {}
+    result = simulation._find_path_with_charging(start, end, method, stats)
+    return result['completed'], stats.get('cache', 'error')  # Sin 'cache': nodos inexistentes
+
+
+class RouteService:
+    """Servicio HTTP local de consultas de rutas: GET /route?start=..&end=..&method=.."""
+
+    def __init__(self, simulation, host='127.0.0.1', port=0):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Conexiones persistentes por cliente
+            disable_nagle_algorithm = True  # Encabezados y cuerpo van en escrituras separadas
+
+            def do_GET(handler):
+                url = urllib.parse.urlsplit(handler.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                if url.path != '/route' or 'start' not in params or 'end' not in params:
+                    handler.send_error(404)
+                    return
+                try:
+                    completed, cache = query(simulation, params['start'], params['end'],
+                                             params.get('method', 'bfs'))
+                    body = json.dumps({'completed': completed, 'cache': cache}).encode('utf-8')
+                    status = 200
+                except ValueError as e:
+                    body = json.dumps({'error': str(e)}).encode('utf-8')
+                    status = 400
+                handler.send_response(status)
+                handler.send_header('Content-Type', 'application/json')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='route-service', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class HttpClient:
+    """Cliente del RouteService con una conexión persistente."""
+
+    def __init__(self, host, port):
+        self._connection = http.client.HTTPConnection(host, port, timeout=60)
+
+    def __call__(self, start, end, method):
+        self._connection.request('GET', '/route?' + urllib.parse.urlencode(
+            {'start': start, 'end': end, 'method': method}))
+        response = self._connection.getresponse()
+        payload = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(payload.get('error', response.status))
+        return payload['completed'], payload['cache']
+
+    def close(self):
+        self._connection.close()
+
+
+def client_loop(number, workload, call, options, began, deadline, records):
+    """
+    Ciclo de un cliente: emite consultas hasta el plazo o la cantidad pedida
+    y guarda (fin relativo s, latencia s, tipo, método, origen del resultado,
+    completed) por consulta; los errores se guardan con origen 'error'.
+    """
+    rng = random.Random(options.seed * 1000 + number)
+    issued = 0
+    while time.perf_counter() < deadline and (not options.requests or issued < options.requests):
+        kind, start, end, method = workload.next_query(rng)
+        sent = time.perf_counter()
+        try:
+            completed, cache = call(start, end, method)
+        except (RuntimeError, OSError, http.client.HTTPException, ValueError):
+            completed, cache = False, 'error'
+        finished = time.perf_counter()
+        records.append((finished - began, finished - sent, kind, method, cache, completed))
+        issued += 1
+        if options.think_ms:
+            time.sleep(rng.expovariate(1000 / options.think_ms))
+
+
+def run_level(clients, options):
+    """
+    Ejecuta la carga con una cantidad de clientes sobre un simulador nuevo
+    (misma red y mismo conjunto caliente en todos los niveles).
+
+    Returns:
+        dict: Resumen del nivel (ver summarize)
+    """
+    simulation = build_simulation(options.size, options.seed)
+    store_directory = None
+    if options.route_store:
+        store_directory = tempfile.mkdtemp(prefix='load_harness_')
+        simulation.use_route_store(RouteCacheStore(os.path.join(store_directory, 'routes.sqlite')))
+    server = None
+    if options.metrics_port is not None:
+        registry = MetricsRegistry.shared()
+        simulation.use_metrics(registry)
+        server = registry.serve(port=options.metrics_port)
+        print(f"  métricas en {server.url}")
+
+    workload = Workload(simulation, options)
+    for start, end in workload.hot:  # Precalentar el conjunto caliente con todos los métodos de la mezcla
+        for method in workload.methods:
+            query(simulation, start, end, method)
+
+    service = RouteService(simulation) if options.transport == 'http' else None
+    per_client = [[] for _ in range(clients)]
+    calls = [HttpClient(service.host, service.port) if service else
+             (lambda start, end, method: query(simulation, start, end, method)) for _ in range(clients)]
+    began = time.perf_counter()
+    deadline = began + options.duration
+    threads = [threading.Thread(target=client_loop, name=f'client-{number}',
+                                args=(number, workload, calls[number], options, began, deadline, per_client[number]))
+               for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    for call in calls:
+        if isinstance(call, HttpClient):
+            call.close()
+    if service is not None:
+        service.close()
+    if server is not None:
+        server.close()
+    if simulation.route_store is not None:
+        simulation.route_store.close()
+
+    records = [record for client_records in per_client for record in client_records]
+    summary = summarize(records, elapsed, options.interval)
+    summary['clients'] = clients
+    summary['cold_exhausted'] = workload.cold_exhausted
+    return summary
+
+
+def latency_stats(latencies):
+    """Percentiles de latencia en ms de un arreglo de segundos."""
+    if not len(latencies):
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {'count': int(len(latencies)), 'mean_ms': float(latencies.mean() * 1000), 'p50_ms': float(p50),
+            'p95_ms': float(p95), 'p99_ms': float(p99), 'max_ms': float(latencies.max() * 1000)}
+
+
+def cache_stats(caches):
+    """Consultas por origen del resultado y fracción resuelta desde caché."""
+    counts = {cache: int(np.count_nonzero(caches == cache))
+              for cache in (CACHE_MEMORY, CACHE_STORE, CACHE_MISS, 'error')}
+    answered = counts[CACHE_MEMORY] + counts[CACHE_STORE] + counts[CACHE_MISS]
+    counts['hit_ratio'] = (counts[CACHE_MEMORY] + counts[CACHE_STORE]) / answered if answered else 0.0
+    return counts
+
+
+def summarize(records, elapsed, interval):
+    """
+    Resumen de las consultas de un nivel.
+
+    Returns:
+        dict: 'requests', 'throughput', 'latency' (total y por tipo y método),
+            'cache', 'histogram' (pares intervalo, consultas) y 'timeline'
+            (por intervalo: throughput, p95 y fracción de aciertos)
+    """
+    ends = np.array([record[0] for record in records], dtype=np.float64)
+    latencies = np.array([record[1] for record in records], dtype=np.float64)
+    kinds = np.array([record[2] for record in records], dtype=object)
+    methods = np.array([record[3] for record in records], dtype=object)
+    caches = np.array([record[4] for record in records], dtype=object)
+    completed = np.array([record[5] for record in records], dtype=bool)
+
+    labels = [f"≤{bound:g} ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]:g} ms"]
+    counts = np.bincount(np.searchsorted(LATENCY_BUCKETS_MS, latencies * 1000, side='left'),
+                         minlength=len(labels))
+
+    # Las consultas que terminan después del último intervalo completo se suman a ese intervalo
+    last = max(int(elapsed // interval) - 1, 0)
+    slots = np.minimum(ends // interval, last).astype(np.int64)
+    timeline = []
+    for slot in range(last + 1 if len(records) else 0):
+        length = elapsed - slot * interval if slot == last else interval
+        selected = slots == slot
+        window = latencies[selected]
+        answered = caches[selected]
+        hits = np.count_nonzero((answered == CACHE_MEMORY) | (answered == CACHE_STORE))
+        misses = np.count_nonzero(answered == CACHE_MISS)
+        timeline.append({
+            'start_s': slot * interval,
+            'requests': int(len(window)),
+            'throughput': len(window) / length if length > 0 else 0.0,
+            'p95_ms': float(np.percentile(window, 95) * 1000) if len(window) else 0.0,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+        })
+
+    return {
+        'requests': len(records),
+        'seconds': elapsed,
+        'throughput': len(records) / elapsed if elapsed > 0 else 0.0,
+        'completed_ratio': float(completed.mean()) if len(completed) else 0.0,
+        'latency': {
+            'all': latency_stats(latencies),
+            **{kind: latency_stats(latencies[kinds == kind]) for kind in (KIND_COLD, KIND_WARM)},
+            **{f"method.{method}": latency_stats(latencies[methods == method]) for method in sorted(set(methods))},
+        },
+        'cache': {
+            'all': cache_stats(caches),
+            **{kind: cache_stats(caches[kinds == kind]) for kind in (KIND_COLD, KIND_WARM)},
+        },
+        'histogram': [[label, int(count)] for label, count in zip(labels, counts)],
+        'timeline': timeline,
+    }
+
+
+def print_level(key, summary):
+    latency, cache = summary['latency'], summary['cache']['all']
+    print(f"{key:<16} {summary['requests']:>9} {summary['throughput']:>10.1f} {latency['all']['p50_ms']:>9.3f} "
+          f"{latency['all']['p95_ms']:>9.3f} {latency['all']['p99_ms']:>9.3f} {latency[KIND_COLD]['p95_ms']:>10.3f} "
+          f"{latency[KIND_WARM]['p95_ms']:>10.3f} {cache['hit_ratio']:>9.1%} {cache['error']:>7}")
+
+
+def print_details(summary):
+    print("  histograma: " + '  '.join(f"{label} {count}" for label, count in summary['histogram'] if count))
+    print("  serie temporal (s: consultas/s, p95 ms, aciertos):")
+    for point in summary['timeline']:
+        print(f"    {point['start_s']:>6.1f}: {point['throughput']:>10.1f} {point['p95_ms']:>9.3f} "
+              f"{point['hit_ratio']:>7.1%}")
+    if summary['cold_exhausted']:
+        print(f"  {summary['cold_exhausted']} consultas frías se emitieron como tibias (pares fríos agotados)")
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara contra una ejecución anterior e imprime las diferencias.
+
+    Returns:
+        list: Claves con regresión (latencia p95 mayor o throughput menor que el umbral)
+    """
+    regressions = []
+    print(f"\n{'nivel':<16} {'p95 base':>10} {'p95 actual':>11} {'Δ p95':>8} {'Δ ops/s':>8} {'Δ aciertos':>11}  estado")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"{key:<16} {'—':>10} {current['latency']['all']['p95_ms']:>11.3f} {'':>8} {'':>8} {'':>11}  nuevo")
+            continue
+        before, after = previous['latency']['all']['p95_ms'], current['latency']['all']['p95_ms']
+        latency = after / before - 1 if before > 0 else 0.0
+        throughput = current['throughput'] / previous['throughput'] - 1 if previous['throughput'] > 0 else 0.0
+        hits = current['cache']['all']['hit_ratio'] - previous['cache']['all']['hit_ratio']
+        regressed = latency > threshold or throughput < -threshold
+        status = 'REGRESIÓN' if regressed else ('mejora' if latency < -threshold or throughput > threshold else 'ok')
+        print(f"{key:<16} {before:>10.3f} {after:>11.3f} {latency:>+8.1%} {throughput:>+8.1%} {hits:>+11.1%}  {status}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16],
+                        help='Cantidades de clientes concurrentes (un nivel por cantidad)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Segundos de carga por nivel')
+    parser.add_argument('--requests', type=int, default=0,
+                        help='Consultas por cliente (0 = sin límite, hasta --duration)')
+    parser.add_argument('--size', type=int, default=1_000, help='Cantidad de nodos de la red')
+    parser.add_argument('--methods', nargs='+', default=['bfs'], metavar='MÉTODO[=PESO]',
+                        help=f"Mezcla de métodos ({', '.join(SEARCH_METHODS)}) con pesos relativos")
+    parser.add_argument('--warm-ratio', type=float, default=0.8,
+                        help='Fracción de consultas tibias (pares del conjunto caliente)')
+    parser.add_argument('--hot-pairs', type=int, default=200, help='Tamaño del conjunto caliente')
+    parser.add_argument('--max-cold-pairs', type=int, default=200_000,
+                        help='Pares fríos distintos disponibles por nivel')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform',
+                        help='Distribución de los pares calientes')
+    parser.add_argument('--zipf-s', type=float, default=1.1, help='Exponente de la distribución Zipf')
+    parser.add_argument('--think-ms', type=float, default=0.0,
+                        help='Espera media (exponencial) entre consultas de un cliente, en ms')
+    parser.add_argument('--transport', choices=('direct', 'http'), default='direct',
+                        help='Llamar al simulador directamente o a través de un servicio HTTP local')
+    parser.add_argument('--route-store', action='store_true',
+                        help='Usar una caché persistente de rutas (en un directorio temporal)')
+    parser.add_argument('--interval', type=float, default=1.0, help='Segundos por punto de la serie temporal')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Exponer las métricas del simulador en este puerto durante la carga (0 = libre)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', metavar='JSON', help='Guardar el reporte')
+    parser.add_argument('--compare', metavar='JSON', help='Comparar contra un reporte guardado')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Aumento de p95 o caída de throughput relativos que se consideran regresión')
+    options = parser.parse_args()
+    try:
+        options.methods = parse_methods(options.methods)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if not 0 <= options.warm_ratio <= 1:
+        parser.error('--warm-ratio debe estar entre 0 y 1')
+    if options.interval <= 0:
+        parser.error('--interval debe ser positivo')
+
+    # generate_orders y otros informan por Streamlit; fuera de la app solo ensucia la salida
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    results = {}
+    print(f"{'nivel':<16} {'consultas':>9} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'p95 fría':>10} {'p95 tibia':>10} {'aciertos':>9} {'errores':>7}")
+    for clients in options.clients:
+        key = f"{options.transport}.c{clients}"
+        summary = run_level(clients, options)
+        results[key] = summary
+        print_level(key, summary)
+        print_details(summary)
+
+    if options.save:
+        document = {
+            'meta': {
+                'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': options.seed,
+                'size': options.size,
+                'duration': options.duration,
+                'requests': options.requests,
+                'methods': options.methods,
+                'warm_ratio': options.warm_ratio,
+                'hot_pairs': options.hot_pairs,
+                'distribution': options.distribution,
+                'zipf_s': options.zipf_s,
+                'think_ms': options.think_ms,
+                'transport': options.transport,
+                'route_store': options.route_store,
+            },
+            'results': results,
+        }
+        with open(options.save, 'w', encoding='utf-8') as handle:
+            json.dump(document, handle, indent=2)
+        print(f"\nReporte guardado en {options.save}")
+
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)['results']
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresión(es): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nSin regresiones")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+"""
+Suite de benchmarks reproducible: búsqueda de rutas, generación de la red,
+generación de órdenes, inserción en el AVL y dibujo del grafo, sobre varios
+tamaños de red.
+
+Cada benchmark usa semillas fijas, reporta throughput, percentiles de
+latencia (p50/p95/p99) y memoria máxima (tracemalloc, medida en una pasada
+aparte para no alterar los tiempos). Los resultados se pueden guardar como
+línea base JSON y comparar contra una línea base anterior: el modo de
+comparación marca las regresiones y termina con código 1 si hay alguna.
+
+Uso:
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --preset full --save full.json
+    python benchmarks/run_benchmarks.py --suites routing avl --sizes 150 10000
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')  # Sin ventana: se mide el dibujo sobre un lienzo en memoria
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_search_modes import build_network
+from src.domain.Client import Client
+from src.domain.Route import Route
+from src.sim.SimulationInitializer import SimulationInitializer, SEARCH_METHODS
+from src.tda.AVL import AVL
+from src.visual.NetworkXAdapter import NetworkXAdapter
+
+# Límites de initialize_network (para tamaños mayores se usa build_network)
+MIN_GENERATED_NODES = 10
+MAX_GENERATED_NODES = 150
+
+SUITES = ('routing', 'network', 'orders', 'avl', 'render')
+
+PRESETS = {
+    'quick': {'sizes': [15, 150, 1000], 'orders': [1_000, 10_000], 'queries': 50, 'repeat': 3},
+    'full': {'sizes': [15, 150, 1_000, 10_000, 100_000], 'orders': [1_000, 100_000, 1_000_000],
+             'queries': 200, 'repeat': 5},
+}
+
+
+def build_simulation(size, seed):
+    """
+    Simulación con una red de `size` nodos: la de initialize_network si el
+    tamaño está en su rango y, si no, la red equivalente de build_network
+    con un Client por nodo cliente.
+    """
+    random.seed(seed)
+    simulation = SimulationInitializer()
+    if MIN_GENERATED_NODES <= size <= MAX_GENERATED_NODES:
+        simulation.initialize_network(size)
+        return simulation
+    build_network(simulation, size, seed)
+    client_types = ["Regular", "Premium", "VIP"]
+    for nodes, node_type in ((simulation._storage_nodes, "storage"), (simulation._charging_nodes, "charging"),
+                             (simulation._client_nodes, "client")):
+        for node_id in nodes:
+            simulation.node_types[node_id] = node_type
+    for i, node_id in enumerate(simulation._client_nodes):
+        client = Client(f"CLI{i+1}", f"Cliente {i+1}", random.choice(client_types))
+        client.node_id = node_id
+        simulation.clients.append(client)
+    return simulation
+
+
+def bench_routing(size, options, method):
+    """Latencia de find_path_with_charging por consulta (sin caché) para un método."""
+    simulation = build_simulation(size, options.seed)
+    rng = random.Random(options.seed)
+    pairs = [(rng.choice(simulation._storage_nodes), rng.choice(simulation._client_nodes))
+             for _ in range(options.queries)]
+    simulation.find_path_with_charging(*pairs[0], method=method)  # Preprocesamiento del método
+    samples = []
+    for _ in range(options.repeat):
+        for start, end in pairs:
+            simulation.path_cache.clear()
+            began = time.perf_counter()
+            simulation.find_path_with_charging(start, end, method=method)
+            samples.append(time.perf_counter() - began)
+    return samples, 1
+
+
+def bench_network(size, options):
+    """Tiempo de construir la red (initialize_network o build_network según el tamaño)."""
+    samples = []
+    for i in range(options.repeat):
+        began = time.perf_counter()
+        build_simulation(size, options.seed + i)
+        samples.append(time.perf_counter() - began)
+    return samples, size
+
+
+def bench_orders(size, options, num_orders):
+    """Tiempo de generate_orders; el throughput se expresa en órdenes por segundo."""
+    simulation = build_simulation(size, options.seed)
+    samples = []
+    for i in range(options.repeat):
+        random.seed(options.seed + i)
+        simulation.path_cache.clear()
+        began = time.perf_counter()
+        simulation.generate_orders(num_orders)
+        samples.append(time.perf_counter() - began)
+    return samples, num_orders
+
+
+def bench_avl(size, options):
+    """Latencia de AVL.insert con `size` rutas, un 20% repetidas (incremento de frecuencia)."""
+    rng = random.Random(options.seed)
+    nodes = [f"{prefix}{i}" for prefix in 'SCT' for i in range(1, 51)]
+    distinct = max(1, int(size * 0.8))
+    routes = [Route(f"Route_{i + 1}", rng.sample(nodes, rng.randint(2, 8))) for i in range(distinct)]
+    keys = routes + [rng.choice(routes) for _ in range(size - distinct)]
+    rng.shuffle(keys)
+    samples = []
+    for _ in range(options.repeat):
+        for route in routes:
+            route.frequency = 1
+        tree = AVL()
+        for route in keys:
+            began = time.perf_counter()
+            tree.insert(route)
+            samples.append(time.perf_counter() - began)
+    return samples, 1
+
+
+def bench_render(size, options):
+    """Tiempo de NetworkXAdapter.draw_graph más el dibujo efectivo del lienzo."""
+    simulation = build_simulation(size, options.seed)
+    adapter = NetworkXAdapter(simulation.graph)
+    adapter.convert_to_networkx()  # Layout fuera de la medición
+    samples = []
+    for _ in range(options.repeat):
+        began = time.perf_counter()
+        figure = adapter.draw_graph()
+        (figure or plt.gcf()).canvas.draw()
+        samples.append(time.perf_counter() - began)
+        plt.close('all')
+    return samples, 1
+
+
+def planned_benchmarks(options):
+    """Lista (clave, función) de los benchmarks a ejecutar según las opciones."""
+    plan = []
+    for size in options.sizes:
+        if 'routing' in options.suites:
+            for method in options.methods:
+                plan.append((f"routing.{method}[{size}]", lambda s=size, m=method: bench_routing(s, options, m)))
+        if 'network' in options.suites:
+            plan.append((f"network[{size}]", lambda s=size: bench_network(s, options)))
+        if 'orders' in options.suites:
+            for num_orders in options.orders:
+                plan.append((f"orders[{size}x{num_orders}]",
+                             lambda s=size, n=num_orders: bench_orders(s, options, n)))
+        if 'avl' in options.suites:
+            plan.append((f"avl.insert[{size}]", lambda s=size: bench_avl(s, options)))
+        if 'render' in options.suites and size <= options.max_render_nodes:
+            plan.append((f"render[{size}]", lambda s=size: bench_render(s, options)))
+    return plan
+
+
+def summarize(samples, ops_per_sample):
+    """Throughput y percentiles de latencia (ms) de las muestras de una ejecución."""
+    values = np.array(samples, dtype=np.float64)
+    total = float(values.sum())
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+    return {
+        'samples': len(values),
+        'throughput': len(values) * ops_per_sample / total if total > 0 else float('inf'),
+        'mean_ms': float(values.mean() * 1000),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+    }
+
+
+def peak_memory(function):
+    """
+    Memoria máxima (MB) asignada durante una ejecución, medida con
+    tracemalloc. Se ejecuta una vez antes sin medir para que los registros
+    compartidos del proceso (p. ej. el NodeRegistry) ya contengan los IDs y
+    la medición no dependa de los benchmarks que corrieron antes.
+    """
+    function()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run(options):
+    results = {}
+    print(f"{'benchmark':<32} {'ops/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'pico MB':>9}")
+    for key, function in planned_benchmarks(options):
+        try:
+            result = summarize(*function())
+            if options.memory:
+                single = argparse.Namespace(**{**vars(options), 'repeat': 1})
+                result['peak_mb'] = peak_memory(lambda: dict(planned_benchmarks(single))[key]())
+        except (ValueError, RuntimeError, ImportError) as e:
+            print(f"{key:<32} omitido: {e}")
+            continue
+        results[key] = result
+        print(f"{key:<32} {result['throughput']:>12.1f} {result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f} "
+              f"{result['p99_ms']:>10.3f} {result.get('peak_mb', float('nan')):>9.1f}")
+    return results
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """
+    Compara contra una línea base e imprime las diferencias.
+
+    Returns:
+        list: Claves con regresión (latencia p50 o memoria por sobre el umbral)
+    """
+    regressions = []
+    print(f"\n{'benchmark':<32} {'p50 base':>10} {'p50 actual':>11} {'Δ p50':>8} {'Δ memoria':>10}  estado")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"{key:<32} {'—':>10} {current['p50_ms']:>11.3f} {'':>8} {'':>10}  nuevo")
+            continue
+        latency = current['p50_ms'] / previous['p50_ms'] - 1 if previous['p50_ms'] > 0 else 0.0
+        memory = None
+        if 'peak_mb' in current and previous.get('peak_mb'):
+            memory = current['peak_mb'] / previous['peak_mb'] - 1
+        regressed = latency > threshold or (memory is not None and memory > memory_threshold)
+        status = 'REGRESIÓN' if regressed else ('mejora' if latency < -threshold else 'ok')
+        memory_text = f"{memory:>+10.1%}" if memory is not None else f"{'—':>10}"
+        print(f"{key:<32} {previous['p50_ms']:>10.3f} {current['p50_ms']:>11.3f} {latency:>+8.1%} "
+              f"{memory_text}  {status}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick')
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=list(SUITES))
+    parser.add_argument('--sizes', type=int, nargs='+', help='Cantidades de nodos (por defecto las del preset)')
+    parser.add_argument('--orders', type=int, nargs='+', help='Cantidades de órdenes (por defecto las del preset)')
+    parser.add_argument('--methods', nargs='+', default=['bfs', 'bidirectional'], choices=SEARCH_METHODS)
+    parser.add_argument('--queries', type=int, help='Consultas de ruta por tamaño')
+    parser.add_argument('--repeat', type=int, help='Repeticiones de cada benchmark')
+    parser.add_argument('--max-render-nodes', type=int, default=1_000,
+                        help='Tamaño máximo de red para el benchmark de dibujo')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='No medir la memoria máxima (evita la pasada extra con tracemalloc)')
+    parser.add_argument('--save', metavar='JSON', help='Guardar los resultados como línea base')
+    parser.add_argument('--compare', metavar='JSON', help='Comparar contra una línea base guardada')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Aumento relativo de la latencia p50 que se considera regresión')
+    parser.add_argument('--memory-threshold', type=float, default=0.20,
+                        help='Aumento relativo de la memoria máxima que se considera regresión')
+    options = parser.parse_args()
+    for name, value in PRESETS[options.preset].items():
+        if getattr(options, name) is None:
+            setattr(options, name, value)
+
+    # generate_orders informa por st.warning/st.error; fuera de Streamlit solo ensucia la salida
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    results = run(options)
+
+    if options.save:
+        document = {
+            'meta': {
+                'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': options.seed,
+                'sizes': options.sizes,
+                'orders': options.orders,
+                'queries': options.queries,
+                'repeat': options.repeat,
+            },
+            'results': results,
+        }
+        with open(options.save, 'w', encoding='utf-8') as handle:
+            json.dump(document, handle, indent=2)
+        print(f"\nLínea base guardada en {options.save}")
+
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)['results']
+        regressions = compare(results, baseline, options.threshold, options.memory_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresión(es): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nSin regresiones")
+
+
+if __name__ == '__main__':
+    main()
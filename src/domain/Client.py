@@ -1,4 +1,6 @@
 class Client:
+    __slots__ = ('client_id', 'name', 'client_type', 'orders', 'node_id')
+
     def __init__(self, client_id, name, client_type):
         """
         Inicializa un cliente.
@@ -12,6 +14,7 @@ class Client:
         self.name = name
         self.client_type = client_type
         self.orders = []  # Lista de órdenes del cliente
+        self.node_id = None  # Nodo del grafo asociado al cliente
 
     def add_order(self, order):
         """
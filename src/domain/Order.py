@@ -1,10 +1,20 @@
 import datetime
+from src.domain.OrderTable import OrderTable
 
 class Order:
-    def __init__(self, order_id, origin, destination, client_id=None, client_name=None, priority="Normal"):
+    """
+    Vista liviana de una orden almacenada en un OrderTable.
+
+    La orden solo guarda la tabla y su número de fila; todos los atributos se
+    leen y escriben directamente en las columnas de la tabla.
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, order_id, origin, destination, client_id=None, client_name=None, priority="Normal",
+                 table=None):
         """
         Inicializa una orden de entrega.
-        
+
         Args:
             order_id: ID único de la orden
             origin: Nodo de origen
@@ -12,78 +22,153 @@ class Order:
             client_id: ID del cliente (opcional)
             client_name: Nombre del cliente (opcional)
             priority: Prioridad de la orden ("Alta", "Normal", "Baja")
+            table: OrderTable donde registrar la orden (por defecto una tabla propia
+                de una fila, que se libera junto con la orden)
         """
-        self.order_id = order_id
-        self.client_id = client_id if client_id else "SYSTEM"
-        self.client_name = client_name if client_name else "Sistema"
-        self.origin = origin
-        self.destination = destination
-        self.status = "Pendiente"
-        self.priority = priority
-        self.creation_date = datetime.datetime.now()
-        self.delivery_date = None
-        self.delivered_to = None
-        self.route = None
-        self.route_cost = 0
-        self.origin_type = self._get_node_type(origin)
-        self.destination_type = self._get_node_type(destination)
-
-    def _get_node_type(self, node_id):
+        self._table = table if table is not None else OrderTable(capacity=1)
+        self._row = self._table.append(
+            order_id,
+            origin,
+            destination,
+            client_id if client_id else "SYSTEM",
+            client_name if client_name else "Sistema",
+            priority
+        )
+
+    @classmethod
+    def from_row(cls, table, row):
         """
-        Determina el tipo de nodo basado en su ID.
-        
+        Crea una vista sobre una fila existente sin registrar una orden nueva.
+
         Args:
-            node_id: ID del nodo
-            
+            table: OrderTable que contiene la fila
+            row: Índice de la fila
+
         Returns:
-            str: Tipo de nodo ('Almacenamiento', 'Carga', 'Cliente')
+            Order: Vista sobre la fila
         """
-        if node_id.startswith('S'):
-            return 'Almacenamiento'
-        elif node_id.startswith('C'):
-            return 'Carga'
-        elif node_id.startswith('T'):
-            return 'Cliente'
-        return 'Desconocido'
+        order = cls.__new__(cls)
+        order._table = table
+        order._row = row
+        return order
+
+    @property
+    def table(self):
+        return self._table
+
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def order_id(self):
+        return self._table.get_order_id(self._row)
+
+    @property
+    def client_id(self):
+        return self._table.get_client(self._row)[0]
+
+    @property
+    def client_name(self):
+        return self._table.get_client(self._row)[1]
+
+    @property
+    def origin(self):
+        return self._table.get_node('origin', self._row)
+
+    @property
+    def destination(self):
+        return self._table.get_node('destination', self._row)
+
+    @property
+    def origin_type(self):
+        return self._table.get_node_type('origin', self._row)
+
+    @property
+    def destination_type(self):
+        return self._table.get_node_type('destination', self._row)
+
+    @property
+    def status(self):
+        return self._table.get_status(self._row)
+
+    @status.setter
+    def status(self, value):
+        self._table.set_status(self._row, value)
+
+    @property
+    def priority(self):
+        return self._table.get_priority(self._row)
+
+    @priority.setter
+    def priority(self, value):
+        self._table.set_priority(self._row, value)
+
+    @property
+    def creation_date(self):
+        return self._table.get_date('created', self._row)
+
+    @property
+    def delivery_date(self):
+        return self._table.get_date('delivered', self._row)
+
+    @property
+    def delivered_to(self):
+        return self._table.get_node('delivered_to', self._row)
+
+    @property
+    def route(self):
+        return self._table.get_route(self._row)
+
+    @property
+    def route_cost(self):
+        return self._table.get_route_cost(self._row)
+
+    @route_cost.setter
+    def route_cost(self, value):
+        self._table.set_route_cost(self._row, value)
 
     def assign_route(self, route):
         """
         Asigna una ruta a la orden.
-        
+
         Args:
             route: Objeto Route a asignar
         """
-        self.route = route
+        self._table.set_route(self._row, route)
 
-    def calculate_route_cost(self):
+    def calculate_route_cost(self, graph=None):
         """
         Calcula el costo total de la ruta sumando los pesos de las aristas.
+        Para muchas órdenes usar OrderTable.fill_route_costs().
+        
+        Args:
+            graph: Grafo con los pesos de las aristas; si se omite se usa el
+                costo ya calculado en la ruta
         """
-        if self.route and self.route.nodes:
-            total_cost = 0
-            nodes = self.route.nodes
-            for i in range(len(nodes) - 1):
-                # Aquí deberíamos obtener el peso de la arista entre nodes[i] y nodes[i+1]
-                # Este método necesitará acceso al grafo para obtener los pesos
-                edge_cost = 0  # Esto se debe reemplazar con el peso real de la arista
-                total_cost += edge_cost
-            self.route_cost = total_cost
+        route = self.route
+        if route:
+            self.route_cost = route.calculate_total_cost(graph) if graph is not None else route.total_cost
 
     def complete_delivery(self):
         """
         Marca la orden como completada y registra la fecha de entrega.
         """
         self.status = "Completada"
-        self.delivery_date = datetime.datetime.now()
-        self.delivered_to = self.destination
+        self._table.set_date('delivered', self._row, datetime.datetime.now())
+        self._table.set_delivered_to(self._row, self.destination)
 
     def to_dict(self):
         """
         Convierte la orden a un diccionario para serialización.
-        
+        Para exportar muchas órdenes usar OrderTable.to_frame().
+
         Returns:
             dict: Diccionario con los datos de la orden
         """
+        creation_date = self.creation_date
+        delivery_date = self.delivery_date
+        delivered_to = self.delivered_to
         return {
             'ID': self.order_id,
             'ID_Cliente': self.client_id,
@@ -94,11 +179,11 @@ class Order:
             'Tipo_Destino': self.destination_type,
             'Estado': self.status,
             'Prioridad': self.priority,
-            'Fecha_Creacion': self.creation_date.strftime("%Y-%m-%d %H:%M:%S") if self.creation_date else "NULL",
-            'Fecha_Entrega': self.delivery_date.strftime("%Y-%m-%d %H:%M:%S") if self.delivery_date else "NULL",
-            'Entregado_en': self.delivered_to if self.delivered_to else "NULL",
+            'Fecha_Creacion': creation_date.strftime("%Y-%m-%d %H:%M:%S") if creation_date else "NULL",
+            'Fecha_Entrega': delivery_date.strftime("%Y-%m-%d %H:%M:%S") if delivery_date else "NULL",
+            'Entregado_en': delivered_to if delivered_to else "NULL",
             'Costo_Total': self.route_cost
         }
 
     def __str__(self):
-        return f"Order {self.order_id} - From: {self.origin} ({self.origin_type}) To: {self.destination} ({self.destination_type}), Status: {self.status}" 
\ No newline at end of file
+        return f"Order {self.order_id} - From: {self.origin} ({self.origin_type}) To: {self.destination} ({self.destination_type}), Status: {self.status}"
\ No newline at end of file
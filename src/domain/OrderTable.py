@@ -0,0 +1,402 @@
+import datetime
+import time
+import numpy as np
+import pandas as pd
+from src.model.NodeRegistry import NodeRegistry
+
+
+# Etiqueta legible de cada rol de nodo, indexada por el código de rol del registro
+NODE_TYPE_LABELS = ('Almacenamiento', 'Carga', 'Cliente', 'Desconocido')
+
+
+class _Categories:
+    """Internamiento de valores categóricos a códigos enteros pequeños."""
+    __slots__ = ('_codes', '_values')
+
+    def __init__(self):
+        self._codes = {}
+        self._values = []
+
+    def code(self, value):
+        """
+        Obtiene el código de un valor, registrándolo si es nuevo.
+
+        Args:
+            value: Valor categórico (debe ser hashable)
+
+        Returns:
+            int: Código del valor
+        """
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def value(self, code):
+        """Retorna el valor asociado a un código."""
+        return self._values[code]
+
+    def values(self):
+        """Retorna la lista de valores en orden de código."""
+        return self._values
+
+    def __len__(self):
+        return len(self._values)
+
+
+class OrderTable:
+    """
+    Almacén columnar de órdenes.
+
+    Cada orden es una fila de columnas NumPy; los textos repetidos (estado,
+    prioridad, clientes) se guardan como códigos categóricos, los nodos como
+    códigos del NodeRegistry compartido y las
+    rutas como índices a una lista de objetos Route compartidos. Los objetos
+    Order son vistas livianas (tabla, fila) sobre esta estructura. Los IDs
+    de orden van en una columna de bytes de ancho fijo que se ensancha
+    cuando llega un ID más largo.
+    """
+    ORDER_ID_WIDTH = 16  # Ancho inicial (bytes UTF-8) de la columna de IDs
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, capacity=INITIAL_CAPACITY, registry=None):
+        self._size = 0
+        self._capacity = 0
+        self._cols = {}
+        self._order_id_width = self.ORDER_ID_WIDTH
+        self._statuses = _Categories()
+        self._priorities = _Categories()
+        self._registry = registry if registry is not None else NodeRegistry.shared()
+        self._clients = _Categories()  # Pares (client_id, client_name)
+        self._routes = []
+        self._route_codes = {}  # id(route) -> código
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        """Amplía todas las columnas a la capacidad indicada."""
+        specs = {
+            'order_id': (f'S{self._order_id_width}', b''),
+            'client': (np.int32, -1),
+            'origin': (np.int32, -1),
+            'destination': (np.int32, -1),
+            'delivered_to': (np.int32, -1),
+            'status': (np.int8, -1),
+            'priority': (np.int8, -1),
+            'created': (np.float64, np.nan),
+            'delivered': (np.float64, np.nan),
+            'route': (np.int32, -1),
+            'route_cost': (np.float32, 0.0),
+        }
+        for name, (dtype, fill) in specs.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            if name in self._cols:
+                column[:self._size] = self._cols[name][:self._size]
+            self._cols[name] = column
+        self._capacity = capacity
+
+    def _widen_order_ids(self, width):
+        """
+        Ensancha la columna de IDs de orden para que quepa un ID de width
+        bytes (al menos al doble, para no copiarla en cada ID más largo).
+        """
+        self._order_id_width = max(width, self._order_id_width * 2)
+        self._cols['order_id'] = self._cols['order_id'].astype(f'S{self._order_id_width}')
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError("Fila de orden fuera de rango")
+        from src.domain.Order import Order
+        return Order.from_row(self, row)
+
+    def __iter__(self):
+        for row in range(self._size):
+            yield self[row]
+
+    def node_code(self, node_id):
+        """
+        Obtiene el código interno de un nodo, registrándolo si es nuevo.
+
+        Args:
+            node_id: ID del nodo
+
+        Returns:
+            int: Código del nodo
+        """
+        return self._registry.intern(node_id)
+
+    def append(self, order_id, origin, destination, client_id, client_name, priority, status="Pendiente"):
+        """
+        Agrega una orden como nueva fila.
+
+        Args:
+            order_id: ID único de la orden
+            origin: Nodo de origen
+            destination: Nodo de destino
+            client_id: ID del cliente
+            client_name: Nombre del cliente
+            priority: Prioridad de la orden
+            status: Estado inicial
+
+        Returns:
+            int: Índice de la fila creada
+        """
+        encoded_id = str(order_id).encode('utf-8')
+        if len(encoded_id) > self._order_id_width:
+            self._widen_order_ids(len(encoded_id))
+        if self._size == self._capacity:
+            self._grow(self._capacity * 2)
+        row = self._size
+        cols = self._cols
+        cols['order_id'][row] = encoded_id
+        cols['client'][row] = self._clients.code((client_id, client_name))
+        cols['origin'][row] = self.node_code(origin)
+        cols['destination'][row] = self.node_code(destination)
+        cols['status'][row] = self._statuses.code(status)
+        cols['priority'][row] = self._priorities.code(priority)
+        cols['created'][row] = time.time()
+        self._size += 1
+        return row
+
+    # Acceso por fila (usado por las vistas Order)
+
+    def get_order_id(self, row):
+        return self._cols['order_id'][row].decode('utf-8')
+
+    def get_client(self, row):
+        return self._clients.value(self._cols['client'][row])
+
+    def get_node(self, column, row):
+        code = self._cols[column][row]
+        return self._registry.node_id(code) if code >= 0 else None
+
+    def get_node_type(self, column, row):
+        """Retorna el tipo legible ('Almacenamiento', 'Carga', ...) del nodo de una fila."""
+        return NODE_TYPE_LABELS[self._registry.role(self._cols[column][row])]
+
+    def get_status(self, row):
+        return self._statuses.value(self._cols['status'][row])
+
+    def set_status(self, row, status):
+        self._cols['status'][row] = self._statuses.code(status)
+
+    def get_priority(self, row):
+        return self._priorities.value(self._cols['priority'][row])
+
+    def set_priority(self, row, priority):
+        self._cols['priority'][row] = self._priorities.code(priority)
+
+    def get_date(self, column, row):
+        value = self._cols[column][row]
+        return None if np.isnan(value) else datetime.datetime.fromtimestamp(value)
+
+    def set_date(self, column, row, value):
+        self._cols[column][row] = np.nan if value is None else value.timestamp()
+
+    def set_delivered_to(self, row, node_id):
+        self._cols['delivered_to'][row] = -1 if node_id is None else self.node_code(node_id)
+
+    def get_route(self, row):
+        code = self._cols['route'][row]
+        return self._routes[code] if code >= 0 else None
+
+    def set_route(self, row, route):
+        if route is None:
+            self._cols['route'][row] = -1
+            return
+        code = self._route_codes.get(id(route))
+        if code is None:
+            code = len(self._routes)
+            self._routes.append(route)
+            self._route_codes[id(route)] = code
+        self._cols['route'][row] = code
+
+    def get_route_cost(self, row):
+        return float(self._cols['route_cost'][row])
+
+    def set_route_cost(self, row, cost):
+        self._cols['route_cost'][row] = cost
+
+    # Operaciones masivas
+
+    def column(self, name):
+        """
+        Retorna una vista de solo lectura de una columna interna.
+
+        Args:
+            name: Nombre de la columna ('status', 'priority', 'route_cost', ...)
+
+        Returns:
+            numpy.ndarray: Vista sobre las filas ocupadas
+        """
+        view = self._cols[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def _decode(values, codes):
+        """Convierte códigos a un arreglo de objetos (el código -1 se traduce a None)."""
+        lookup = np.array(list(values) + [None], dtype=object)
+        return lookup[codes]
+
+    def to_frame(self, start=0, stop=None):
+        """
+        Exporta las órdenes a un DataFrame en una sola pasada.
+
+        Reemplaza la construcción de un diccionario por orden: cada columna
+        se decodifica de forma vectorizada a partir de sus códigos.
+
+        Args:
+            start: Primera fila a exportar
+            stop: Fila siguiente a la última (None = hasta el final)
+
+        Returns:
+            pandas.DataFrame: Una fila por orden, con las claves de Order.to_dict
+        """
+        rows = slice(start, self._size if stop is None else min(stop, self._size))
+        cols = self._cols
+        clients = self._clients.values()
+        client_codes = cols['client'][rows]
+        node_ids = self._registry.ids()
+        node_types = np.array(NODE_TYPE_LABELS, dtype=object)[self._registry.roles()]
+        route_labels = np.array([' → '.join(route.nodes) for route in self._routes] + ['No asignada'],
+                                dtype=object)
+        return pd.DataFrame({
+            'ID': np.char.decode(cols['order_id'][rows], 'utf-8'),
+            'ID_Cliente': self._decode([c[0] for c in clients], client_codes),
+            'Cliente': self._decode([c[1] for c in clients], client_codes),
+            'Origen': self._decode(node_ids, cols['origin'][rows]),
+            'Tipo_Origen': self._decode(node_types, cols['origin'][rows]),
+            'Destino': self._decode(node_ids, cols['destination'][rows]),
+            'Tipo_Destino': self._decode(node_types, cols['destination'][rows]),
+            'Estado': pd.Categorical.from_codes(cols['status'][rows], self._statuses.values()),
+            'Prioridad': pd.Categorical.from_codes(cols['priority'][rows], self._priorities.values()),
+            'Fecha_Creacion': _to_local_datetimes(cols['created'][rows]),
+            'Fecha_Entrega': _to_local_datetimes(cols['delivered'][rows]),
+            'Entregado_en': self._decode(node_ids, cols['delivered_to'][rows]),
+            'Costo_Total': cols['route_cost'][rows],
+            'Ruta': route_labels[cols['route'][rows]],
+        })
+
+    def fill_route_costs(self, graph):
+        """
+        Calcula el costo de ruta de todas las órdenes en una sola pasada.
+        Cada ruta distinta se evalúa una vez (con su caché de costos acumulados)
+        y el resultado se reparte a las filas con un gather vectorizado.
+
+        Args:
+            graph: Grafo con los pesos de las aristas
+        """
+        n = self._size
+        costs = np.array([route.calculate_total_cost(graph) for route in self._routes] + [0.0],
+                         dtype=np.float32)
+        self._cols['route_cost'][:n] = costs[self._cols['route'][:n]]
+
+    def mean_route_cost(self):
+        """Costo promedio de todas las órdenes (0 si no hay órdenes)."""
+        if not self._size:
+            return 0.0
+        return float(self._cols['route_cost'][:self._size].mean(dtype=np.float64))
+
+    def _counts(self, column, categories):
+        counts = np.bincount(self._cols[column][:self._size], minlength=len(categories))
+        return {value: int(count) for value, count in zip(categories.values(), counts) if count}
+
+    def status_counts(self):
+        """Cantidad de órdenes por estado."""
+        return self._counts('status', self._statuses)
+
+    def priority_counts(self):
+        """Cantidad de órdenes por prioridad."""
+        return self._counts('priority', self._priorities)
+
+    def most_common_priority(self):
+        """Prioridad más frecuente o "N/A" si no hay órdenes."""
+        counts = self.priority_counts()
+        return max(counts, key=counts.get) if counts else "N/A"
+
+    def orders_per_client(self):
+        """
+        Cantidad de órdenes por ID de cliente.
+
+        Returns:
+            dict: {client_id: cantidad}
+        """
+        counts = np.bincount(self._cols['client'][:self._size], minlength=len(self._clients))
+        result = {}
+        for (client_id, _), count in zip(self._clients.values(), counts):
+            result[client_id] = result.get(client_id, 0) + int(count)
+        return result
+
+    def nbytes(self):
+        """Memoria ocupada por las columnas NumPy (capacidad reservada incluida)."""
+        return sum(column.nbytes for column in self._cols.values())
+
+    def export_state(self):
+        """
+        Estado completo de la tabla para serializarlo (p. ej. en un snapshot).
+        Los nodos quedan como códigos del NodeRegistry de la tabla.
+
+        Returns:
+            dict: 'columns' (arreglos recortados a las filas ocupadas),
+                'statuses', 'priorities', 'clients' (valores en orden de código)
+                y 'routes' (objetos Route en orden de código)
+        """
+        n = self._size
+        return {
+            'columns': {name: column[:n] for name, column in self._cols.items()},
+            'statuses': list(self._statuses.values()),
+            'priorities': list(self._priorities.values()),
+            'clients': list(self._clients.values()),
+            'routes': list(self._routes),
+        }
+
+    @classmethod
+    def from_state(cls, columns, statuses, priorities, clients, routes, registry=None):
+        """
+        Reconstruye una tabla a partir de columnas ya codificadas, sin
+        recorrer las filas.
+
+        Args:
+            columns: Dict nombre -> arreglo (mismas columnas que export_state)
+            statuses: Estados en orden de código
+            priorities: Prioridades en orden de código
+            clients: Pares (client_id, client_name) en orden de código
+            routes: Objetos Route en orden de código
+            registry: NodeRegistry de los códigos de nodo (por defecto el compartido)
+
+        Returns:
+            OrderTable: Tabla restaurada
+        """
+        size = len(columns['order_id'])
+        table = cls(capacity=max(1, size), registry=registry)
+        width = np.asarray(columns['order_id']).dtype.itemsize
+        if width > table._order_id_width:
+            table._widen_order_ids(width)
+        for name, values in columns.items():
+            table._cols[name][:size] = values
+        table._size = size
+        for value in statuses:
+            table._statuses.code(value)
+        for value in priorities:
+            table._priorities.code(value)
+        for value in clients:
+            table._clients.code(tuple(value))
+        for route in routes:
+            table._route_codes[id(route)] = len(table._routes)
+            table._routes.append(route)
+        return table
+
+
+def _to_local_datetimes(seconds):
+    """Convierte segundos epoch (NaN = vacío) a fechas locales sin zona horaria."""
+    local_tz = datetime.datetime.now().astimezone().tzinfo
+    return (pd.to_datetime(seconds, unit='s', utc=True)
+            .tz_convert(local_tz)
+            .tz_localize(None))
@@ -0,0 +1,73 @@
+from collections.abc import Sequence
+import numpy as np
+
+
+class OrderViews(Sequence):
+    """
+    Secuencia perezosa de órdenes sobre filas de un OrderTable.
+
+    Las vistas Order se crean recién al acceder a cada elemento, de modo que
+    restaurar millones de órdenes no crea millones de objetos. Admite
+    append() como una lista: las órdenes de la misma tabla se guardan como
+    filas y las de otra tabla se conservan tal cual al final.
+    """
+
+    def __init__(self, table, rows=None):
+        """
+        Inicializa la secuencia.
+
+        Args:
+            table: OrderTable con las órdenes
+            rows: Filas incluidas, en orden (None = todas las filas de la tabla)
+        """
+        self._table = table
+        self._rows = np.arange(len(table), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        self._appended_rows = []  # Filas de la misma tabla agregadas con append()
+        self._foreign = []  # Órdenes de otras tablas agregadas con append()
+
+    def _row_at(self, index):
+        base = len(self._rows)
+        if index < base:
+            return int(self._rows[index])
+        return self._appended_rows[index - base]
+
+    def __len__(self):
+        return len(self._rows) + len(self._appended_rows) + len(self._foreign)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de orden fuera de rango")
+        own = len(self._rows) + len(self._appended_rows)
+        if index >= own:
+            return self._foreign[index - own]
+        from src.domain.Order import Order
+        return Order.from_row(self._table, self._row_at(index))
+
+    def __iter__(self):
+        from src.domain.Order import Order
+        table = self._table
+        for row in self._rows.tolist():
+            yield Order.from_row(table, row)
+        for row in self._appended_rows:
+            yield Order.from_row(table, row)
+        yield from self._foreign
+
+    def append(self, order):
+        """
+        Agrega una orden al final de la secuencia.
+
+        Args:
+            order: Objeto Order
+        """
+        if order.table is self._table and not self._foreign:
+            self._appended_rows.append(order.row)
+        else:
+            self._foreign.append(order)
+
+    def copy(self):
+        """Copia materializada como lista de vistas Order."""
+        return list(self)
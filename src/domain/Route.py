@@ -1,7 +1,16 @@
+from collections import Counter
+import numpy as np
+from src.model.NodeRegistry import NodeRegistry, ROLE_CHARGING
+
+
 class Route:
+    __slots__ = ('route_id', '_codes', '_nodes', 'frequency', 'total_cost', 'charging_points',
+                 '_cum_cost', '_battery', '_min_battery', '_profile_autonomy')
+
     def __init__(self, route_id, nodes, total_cost=0, charging_points=None):
         """
         Inicializa una ruta con un ID y una lista de nodos.
+        Los nodos se guardan como códigos array('I') del NodeRegistry compartido.
         
         Args:
             route_id: Identificador único de la ruta
@@ -10,22 +19,54 @@ class Route:
             charging_points: Lista de puntos de recarga en la ruta
         """
         self.route_id = route_id
-        self.nodes = nodes
+        self._codes = NodeRegistry.shared().encode(nodes)
+        self._nodes = None  # Tupla decodificada (se arma en el primer acceso)
         self.frequency = 1
         self.total_cost = total_cost
-        self.charging_points = charging_points if charging_points else []
-        self._hash = hash(tuple(nodes))
-        self.node_visits = {}  # Diccionario para registrar visitas a nodos
-        self._initialize_node_visits()
+        self.charging_points = tuple(charging_points) if charging_points else ()
+        self._cum_cost = None  # Costo acumulado hasta cada nodo (prefix sums)
+        self._battery = None  # Batería restante al llegar a cada nodo
+        self._min_battery = None
+        self._profile_autonomy = None
 
-    def _initialize_node_visits(self):
-        """Inicializa el contador de visitas para cada nodo en la ruta."""
-        for node in self.nodes:
-            self.node_visits[node] = self.node_visits.get(node, 0) + 1
+    @property
+    def nodes(self):
+        """
+        Secuencia de nodos de la ruta. Se decodifica una sola vez: los códigos
+        de una ruta no cambian y el registro nunca reasigna un código.
+        
+        Returns:
+            tuple: IDs de los nodos en orden (inmutable)
+        """
+        if self._nodes is None:
+            self._nodes = NodeRegistry.shared().decode(self._codes)
+        return self._nodes
+
+    @property
+    def codes(self):
+        """
+        Secuencia de nodos como códigos del NodeRegistry compartido.
+        
+        Returns:
+            array: Arreglo array('I') de códigos
+        """
+        return self._codes
+
+    def _hop_weights(self, graph):
+        """Pesos de cada tramo de la ruta (0 si la arista no existe en el grafo)."""
+        nodes = self.nodes
+        weights = np.zeros(max(len(nodes) - 1, 0), dtype=np.float64)
+        for i in range(len(nodes) - 1):
+            weight = graph.get_edge_weight(nodes[i], nodes[i + 1])
+            if weight is not None:
+                weights[i] = weight
+        return weights
 
     def calculate_total_cost(self, graph):
         """
         Calcula el costo total de la ruta usando el grafo proporcionado.
+        El costo acumulado por nodo se guarda, por lo que las llamadas
+        siguientes (y segment_cost) son O(1) hasta invalidate_profile().
         
         Args:
             graph: Grafo que contiene los nodos y aristas
@@ -33,19 +74,84 @@ class Route:
         Returns:
             float: Costo total de la ruta
         """
-        total = 0
-        for i in range(len(self.nodes) - 1):
-            edge = graph.get_edge(self.nodes[i], self.nodes[i + 1])
-            if edge:
-                total += edge.element()
+        if self._cum_cost is None:
+            weights = self._hop_weights(graph)
+            self._cum_cost = np.concatenate(([0.0], np.cumsum(weights)))
+        total = self._cum_cost[-1].item()
         self.total_cost = total
         return total
 
+    def energy_profile(self, graph, drone_autonomy):
+        """
+        Calcula (una vez) el costo acumulado y la batería restante en cada nodo.
+        Usa la misma regla que find_path_with_charging: un tramo que sale de o
+        llega a una estación de carga deja la batería en la autonomía máxima;
+        cualquier otro tramo descuenta su peso.
+        
+        Args:
+            graph: Grafo que contiene los nodos y aristas
+            drone_autonomy: Autonomía máxima del dron
+            
+        Returns:
+            Route: La propia ruta, para encadenar consultas
+        """
+        if self._battery is not None and self._profile_autonomy == drone_autonomy:
+            return self
+        self.calculate_total_cost(graph)
+        weights = np.diff(self._cum_cost)
+        codes = np.frombuffer(self._codes, dtype=np.uint32)
+        is_charging = NodeRegistry.shared().roles()[codes] == ROLE_CHARGING
+        recharge_hop = is_charging[:-1] | is_charging[1:]
+        energy = np.where(recharge_hop, 0.0, weights)
+        cum_energy = np.concatenate(([0.0], np.cumsum(energy)))
+        # Índice del último nodo donde la batería quedó llena (0 = origen)
+        reset_at = np.zeros(len(codes), dtype=np.int64)
+        reset_at[1:] = np.where(recharge_hop, np.arange(1, len(codes)), 0)
+        reset_at = np.maximum.accumulate(reset_at)
+        self._battery = drone_autonomy - (cum_energy - cum_energy[reset_at])
+        self._min_battery = self._battery.min().item()
+        self._profile_autonomy = drone_autonomy
+        return self
+
+    def invalidate_profile(self):
+        """Descarta los costos y baterías precalculados (p. ej. si cambió el grafo)."""
+        self._cum_cost = None
+        self._battery = None
+        self._min_battery = None
+        self._profile_autonomy = None
+
+    def segment_cost(self, start, end):
+        """
+        Costo del tramo entre las posiciones start y end de la ruta en O(1).
+        Requiere calculate_total_cost o energy_profile previo.
+        
+        Args:
+            start: Índice del nodo inicial
+            end: Índice del nodo final
+            
+        Returns:
+            float: Costo del sub-recorrido
+        """
+        return (self._cum_cost[end] - self._cum_cost[start]).item()
+
+    def remaining_energy(self, index):
+        """
+        Batería restante al llegar al nodo en la posición index, en O(1).
+        Requiere energy_profile previo.
+        
+        Args:
+            index: Índice del nodo en la ruta
+            
+        Returns:
+            float: Batería restante
+        """
+        return self._battery[index].item()
+
     def identify_charging_points(self):
         """
         Identifica los puntos de recarga en la ruta.
         """
-        self.charging_points = [node for node in self.nodes if node.startswith('C')]
+        self.charging_points = tuple(node for node in self.nodes if node.startswith('C'))
         return self.charging_points
 
     def __eq__(self, other):
@@ -60,7 +166,7 @@ class Route:
         """
         if not isinstance(other, Route):
             return False
-        return self.nodes == other.nodes
+        return self._codes == other._codes
 
     def __lt__(self, other):
         """
@@ -97,7 +203,7 @@ class Route:
         Returns:
             int: Hash de la ruta
         """
-        return self._hash
+        return hash(self._codes.tobytes())
 
     def __str__(self):
         """
@@ -111,11 +217,10 @@ class Route:
 
     def increment_frequency(self):
         """
-        Incrementa la frecuencia de uso de la ruta y actualiza las visitas a nodos.
+        Incrementa la frecuencia de uso de la ruta.
+        Las visitas a nodos se derivan de la frecuencia (ver get_node_visits).
         """
         self.frequency += 1
-        for node in self.nodes:
-            self.node_visits[node] = self.node_visits.get(node, 0) + 1
 
     def get_frequency(self):
         """
@@ -128,12 +233,14 @@ class Route:
 
     def get_node_visits(self):
         """
-        Obtiene el diccionario de visitas a nodos.
+        Obtiene el diccionario de visitas a nodos: cada aparición de un nodo
+        en la ruta cuenta una visita por cada uso de la ruta.
         
         Returns:
             dict: Diccionario con nodos y sus visitas
         """
-        return self.node_visits
+        ids = NodeRegistry.shared().ids()
+        return {ids[code]: count * self.frequency for code, count in Counter(self._codes).items()}
 
     def get_most_visited_nodes(self, node_type=None):
         """
@@ -145,9 +252,9 @@ class Route:
         Returns:
             list: Lista de tuplas (nodo, visitas) ordenadas por visitas
         """
-        filtered_visits = self.node_visits
+        filtered_visits = self.get_node_visits()
         if node_type:
-            filtered_visits = {node: visits for node, visits in self.node_visits.items() 
+            filtered_visits = {node: visits for node, visits in filtered_visits.items() 
                              if node.startswith(node_type[0].upper())}
         
         return sorted(filtered_visits.items(), key=lambda x: x[1], reverse=True)
@@ -155,6 +262,8 @@ class Route:
     def is_viable(self, drone_autonomy):
         """
         Verifica si la ruta es viable dado la autonomía del dron.
+        Con un perfil de energía calculado para esa autonomía la respuesta es
+        O(1) y considera las recargas; sin perfil compara el costo total.
         
         Args:
             drone_autonomy: Autonomía máxima del dron
@@ -162,6 +271,8 @@ class Route:
         Returns:
             bool: True si la ruta es viable
         """
+        if self._battery is not None and self._profile_autonomy == drone_autonomy:
+            return self._min_battery >= 0
         return self.total_cost <= drone_autonomy
 
     def __le__(self, other):
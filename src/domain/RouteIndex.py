@@ -0,0 +1,144 @@
+from src.model.NodeRegistry import NodeRegistry, ROLE_CHARGING
+from src.tda.RouteTrie import RouteTrie
+
+
+class RouteIndex:
+    """
+    Índice de rutas factibles para reutilizar sub-recorridos.
+
+    Combina un trie de prefijos sobre las secuencias de nodos (para encontrar
+    un prefijo ya calculado que llegue a un destino) con un índice invertido
+    nodo -> rutas (para saber qué rutas pasan por un nodo o una arista).
+    Solo deben agregarse rutas factibles: todo prefijo de una ruta factible
+    también lo es.
+    """
+
+    def __init__(self):
+        self._trie = RouteTrie()
+        self._routes = set()
+        self._by_node = {}  # código de nodo -> {Route: apariciones}
+
+    def __len__(self):
+        return len(self._routes)
+
+    def __contains__(self, route):
+        return route in self._routes
+
+    def add(self, route, graph):
+        """
+        Indexa una ruta factible.
+
+        Args:
+            route: Ruta a indexar
+            graph: Grafo para calcular los costos acumulados de la ruta
+        """
+        if route in self._routes:
+            return
+        codes = route.codes
+        self._routes.add(route)
+        route.calculate_total_cost(graph)
+        registry = NodeRegistry.shared()
+        recharges = [0] * len(codes)
+        for i in range(1, len(codes)):
+            arrives_charging = (registry.role(codes[i]) == ROLE_CHARGING
+                                and registry.role(codes[i - 1]) != ROLE_CHARGING)
+            recharges[i] = recharges[i - 1] + (1 if arrives_charging else 0)
+        # Cada prefijo guarda (recargas, costo) desde el origen
+        self._trie.insert(codes, lambda i: (recharges[i], route.segment_cost(0, i)))
+        for code in codes:
+            routes = self._by_node.setdefault(code, {})
+            routes[route] = routes.get(route, 0) + 1
+
+    def remove(self, route):
+        """
+        Quita una ruta del índice (p. ej. cuando deja de ser factible).
+
+        Args:
+            route: Ruta a quitar
+
+        Returns:
+            bool: True si la ruta estaba indexada
+        """
+        if route not in self._routes:
+            return False
+        self._routes.discard(route)
+        self._trie.remove(route.codes)
+        for code in set(route.codes):
+            routes = self._by_node.get(code)
+            if routes is not None:
+                routes.pop(route, None)
+                if not routes:
+                    del self._by_node[code]
+        return True
+
+    def find_prefix(self, origin, destination):
+        """
+        Busca un prefijo de una ruta indexada que vaya de origin a destination.
+        Entre varios candidatos elige el de menos recargas y luego menor costo.
+
+        Args:
+            origin: Nodo de origen
+            destination: Nodo de destino
+
+        Returns:
+            list: Nodos del prefijo o None si no hay uno indexado
+        """
+        registry = NodeRegistry.shared()
+        origin_code = registry.find(origin)
+        destination_code = registry.find(destination)
+        if origin_code is None or destination_code is None:
+            return None
+        candidates = self._trie.prefixes_reaching(origin_code, destination_code)
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda node: node.data)
+        return list(registry.decode(self._trie.path(best)))
+
+    def routes_through(self, node_id):
+        """
+        Rutas indexadas que pasan por un nodo.
+
+        Args:
+            node_id: ID del nodo (e.g., 'C4')
+
+        Returns:
+            list: Objetos Route
+        """
+        code = NodeRegistry.shared().find(node_id)
+        if code is None:
+            return []
+        return list(self._by_node.get(code, ()))
+
+    def routes_through_edge(self, start, end):
+        """
+        Rutas indexadas que recorren la arista start -> end.
+
+        Args:
+            start: Vértice de inicio
+            end: Vértice de fin
+
+        Returns:
+            list: Objetos Route
+        """
+        registry = NodeRegistry.shared()
+        start_code = registry.find(start)
+        end_code = registry.find(end)
+        if start_code is None or end_code is None:
+            return []
+        start_routes = self._by_node.get(start_code)
+        end_routes = self._by_node.get(end_code)
+        if not start_routes or not end_routes:
+            return []  # Algún extremo no está en ninguna ruta indexada
+        candidates = end_routes if len(end_routes) < len(start_routes) else start_routes
+        result = []
+        for route in candidates:
+            codes = route.codes
+            if any(codes[i] == start_code and codes[i + 1] == end_code for i in range(len(codes) - 1)):
+                result.append(route)
+        return result
+
+    def clear(self):
+        """Vacía el índice."""
+        self._trie.clear()
+        self._routes.clear()
+        self._by_node.clear()
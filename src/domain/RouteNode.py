@@ -1,4 +1,6 @@
 class RouteNode:
+    __slots__ = ('route', 'frequency', 'left', 'right', 'height')
+
     def __init__(self, route, frequency=1):
         """
         Inicializa un nodo de ruta.
@@ -0,0 +1,161 @@
+from src.domain.Route import Route
+from src.model.NodeRegistry import NodeRegistry
+
+
+class RouteRegistry:
+    """
+    Registro canónico de rutas (hash-consing por secuencia de nodos).
+
+    Cada secuencia de nodos tiene un único objeto Route compartido por el
+    simulador y el dashboard; la frecuencia de uso vive solo en ese objeto.
+    """
+
+    def __init__(self, id_prefix="Route_"):
+        """
+        Inicializa un registro vacío.
+
+        Args:
+            id_prefix: Prefijo para los IDs de las rutas creadas
+        """
+        self.id_prefix = id_prefix
+        self._routes = []  # Rutas en orden de registro
+        self._by_key = {}  # bytes de los códigos de nodo -> Route
+        self._by_endpoints = {}  # (origen, destino) -> primera Route registrada
+
+    @staticmethod
+    def _key(nodes):
+        return NodeRegistry.shared().encode(nodes).tobytes()
+
+    def get(self, nodes):
+        """
+        Busca la ruta canónica de una secuencia de nodos.
+
+        Args:
+            nodes: Secuencia de nodos
+
+        Returns:
+            Route: Ruta registrada o None si no existe
+        """
+        return self._by_key.get(self._key(nodes))
+
+    def find_by_endpoints(self, origin, destination):
+        """
+        Busca una ruta registrada entre un origen y un destino.
+
+        Args:
+            origin: Nodo de origen
+            destination: Nodo de destino
+
+        Returns:
+            Route: Primera ruta registrada con esos extremos o None
+        """
+        return self._by_endpoints.get((origin, destination))
+
+    def record_use(self, nodes):
+        """
+        Registra un uso de la secuencia de nodos.
+        Si la ruta ya existe incrementa su frecuencia; si no, la crea con frecuencia 1.
+
+        Args:
+            nodes: Secuencia de nodos
+
+        Returns:
+            Route: Ruta canónica de la secuencia
+        """
+        key = self._key(nodes)
+        route = self._by_key.get(key)
+        if route is not None:
+            route.increment_frequency()
+        else:
+            route = Route(f"{self.id_prefix}{len(self._routes) + 1}", nodes)
+            self._by_key[key] = route
+            self._routes.append(route)
+        self._by_endpoints.setdefault((nodes[0], nodes[-1]), route)
+        return route
+
+    def retire(self, route):
+        """
+        Deja de ofrecer una ruta para su par origen-destino (p. ej. porque un
+        cambio del grafo la volvió infactible). La ruta y su frecuencia se
+        conservan como historial y vuelve a ofrecerse si se registra otro uso.
+
+        Args:
+            route: Ruta a retirar
+        """
+        nodes = route.nodes
+        endpoints = (nodes[0], nodes[-1])
+        if self._by_endpoints.get(endpoints) is route:
+            del self._by_endpoints[endpoints]
+
+    def restore(self, routes, offered):
+        """
+        Reemplaza el contenido del registro por rutas ya creadas (p. ej. al
+        restaurar un snapshot), conservando sus IDs y frecuencias.
+
+        Args:
+            routes: Objetos Route en orden de creación
+            offered: Por cada ruta, si se ofrece para su par origen-destino
+                (False para las rutas retiradas)
+        """
+        self.clear()
+        for route, is_offered in zip(routes, offered):
+            nodes = route.nodes
+            self._by_key[route.codes.tobytes()] = route
+            self._routes.append(route)
+            if is_offered:
+                self._by_endpoints.setdefault((nodes[0], nodes[-1]), route)
+
+    def is_offered(self, route):
+        """Indica si la ruta es la que se ofrece para su par origen-destino."""
+        nodes = route.nodes
+        return self._by_endpoints.get((nodes[0], nodes[-1])) is route
+
+    def routes(self):
+        """
+        Retorna las rutas registradas en orden de creación.
+
+        Returns:
+            list: Lista de objetos Route
+        """
+        return list(self._routes)
+
+    def frequencies(self):
+        """
+        Frecuencias de uso indexadas por la representación textual de la ruta.
+
+        Returns:
+            dict: {'A → B → C': frecuencia}
+        """
+        return {' → '.join(route.nodes): route.frequency for route in self._routes}
+
+    def total_frequency(self):
+        """Suma de las frecuencias de todas las rutas."""
+        return sum(route.frequency for route in self._routes)
+
+    def node_visits(self):
+        """
+        Visitas acumuladas por nodo sobre todas las rutas registradas.
+
+        Returns:
+            dict: {nodo: visitas}
+        """
+        visits = {}
+        for route in self._routes:
+            for node, count in route.get_node_visits().items():
+                visits[node] = visits.get(node, 0) + count
+        return visits
+
+    def clear(self):
+        """Elimina todas las rutas registradas."""
+        self._routes.clear()
+        self._by_key.clear()
+        self._by_endpoints.clear()
+
+    def __len__(self):
+        return len(self._routes)
+
+    def __iter__(self):
+        return iter(self._routes)
+
+    def __contains__(self, nodes):
+        return self._key(nodes) in self._by_key
@@ -0,0 +1,101 @@
+"""Compact array snapshot of a Graph for the routing algorithms."""
+import numpy as np
+from .NodeRegistry import role_of, ROLE_CHARGING
+
+
+class CompactGraph:
+    """
+    Instantánea del grafo con vértices numerados 0..n-1 y aristas en formato
+    CSR (arreglos NumPy), en sentido directo e inverso.
+
+    Las aristas que tocan vértices deshabilitados se omiten. La instantánea
+    guarda la versión del grafo de origen para detectar si quedó obsoleta.
+    """
+
+    def __init__(self, graph):
+        """
+        Construye la instantánea a partir de un Graph.
+
+        Args:
+            graph: Grafo de origen
+        """
+        self.version = graph.version
+        self.ids = graph.vertices()
+        self.index = {vertex: i for i, vertex in enumerate(self.ids)}
+        n = len(self.ids)
+        self.roles = np.fromiter((role_of(vertex) for vertex in self.ids), dtype=np.uint8, count=n)
+        self.is_charging = self.roles == ROLE_CHARGING
+        self.enabled = np.fromiter((not graph.is_disabled(vertex) for vertex in self.ids), dtype=bool, count=n)
+
+        m = len(graph.edge_weights)
+        src = np.empty(m, dtype=np.int64)
+        dst = np.empty(m, dtype=np.int64)
+        weights = np.empty(m, dtype=np.float64)
+        index = self.index
+        for k, ((start, end), weight) in enumerate(graph.edge_weights.items()):
+            src[k] = index[start]
+            dst[k] = index[end]
+            weights[k] = weight
+        keep = self.enabled[src] & self.enabled[dst]
+        src, dst, weights = src[keep], dst[keep], weights[keep]
+
+        self.num_vertices = n
+        self.num_edges = len(src)
+        self.integral_weights = bool(np.all(weights == np.round(weights)))
+        self.indptr, self.indices, self.weights = self._csr(src, dst, weights, n)
+        self.rev_indptr, self.rev_indices, self.rev_weights = self._csr(dst, src, weights, n)
+        self._out_lists = None
+        self._in_lists = None
+
+    @staticmethod
+    def _csr(src, dst, weights, n):
+        order = np.argsort(src, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return indptr, dst[order], weights[order]
+
+    def is_stale(self, graph):
+        """Return True if the graph changed after this snapshot was built."""
+        return graph.version != self.version
+
+    def energy_weights(self, reverse=False):
+        """
+        Consumo de batería de cada arista según la regla de recarga del
+        simulador: las aristas que tocan una estación de carga no consumen.
+
+        Args:
+            reverse: Usar el orden de las aristas del CSR inverso
+
+        Returns:
+            numpy.ndarray: Consumo por arista, alineado con weights/rev_weights
+        """
+        if reverse:
+            heads = np.repeat(np.arange(self.num_vertices), np.diff(self.rev_indptr))
+            return np.where(self.is_charging[heads] | self.is_charging[self.rev_indices], 0.0, self.rev_weights)
+        tails = np.repeat(np.arange(self.num_vertices), np.diff(self.indptr))
+        return np.where(self.is_charging[tails] | self.is_charging[self.indices], 0.0, self.weights)
+
+    def out_lists(self):
+        """
+        Adyacencia directa como listas de Python [(vecino, peso), ...] por vértice,
+        más rápidas de recorrer en bucles de búsqueda que los arreglos NumPy.
+        """
+        if self._out_lists is None:
+            self._out_lists = self._lists(self.indptr, self.indices, self._list_weights(self.weights))
+        return self._out_lists
+
+    def in_lists(self):
+        """Adyacencia inversa como listas de Python [(predecesor, peso), ...] por vértice."""
+        if self._in_lists is None:
+            self._in_lists = self._lists(self.rev_indptr, self.rev_indices, self._list_weights(self.rev_weights))
+        return self._in_lists
+
+    def _list_weights(self, weights):
+        """Pesos como enteros de Python si el grafo solo tiene pesos enteros."""
+        return weights.astype(np.int64) if self.integral_weights else weights
+
+    @staticmethod
+    def _lists(indptr, indices, weights):
+        bounds = indptr.tolist()
+        pairs = list(zip(indices.tolist(), weights.tolist()))
+        return [pairs[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
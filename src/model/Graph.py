@@ -1,10 +1,46 @@
+import hashlib
 from .Edge import Edge
 from .vertex import Vertex
+from .GraphChange import (GraphChange, EDGE_ADDED, EDGE_REMOVED, EDGE_UPDATED,
+                          VERTEX_DISABLED, VERTEX_ENABLED)
 
 class Graph:
     def __init__(self):
         self.adjacency_list = {}  # Para almacenar los vértices y sus conexiones
         self.edge_weights = {}    # Para almacenar los pesos de las aristas
+        self._disabled = set()    # Vértices fuera de servicio (e.g., cargadores caídos)
+        self._listeners = []      # Suscriptores a los cambios del grafo
+        self.version = 0          # Se incrementa con cada mutación
+        self._compact = None      # Instantánea CompactGraph de la última versión
+        self._fingerprint = None  # (versión, huella) de la última huella calculada
+
+    def subscribe(self, callback):
+        """
+        Registra una función que recibirá un GraphChange por cada mutación.
+        
+        Args:
+            callback: Función callback(change)
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Quita un suscriptor registrado con subscribe.
+        
+        Args:
+            callback: Función registrada previamente
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _publish(self, kind, start, end=None, old_weight=None, new_weight=None):
+        """Registra una mutación y la notifica a los suscriptores (si los hay)."""
+        self.version += 1
+        if self._listeners:
+            change = GraphChange(kind, start, end, old_weight, new_weight)
+            for callback in list(self._listeners):
+                callback(change)
 
     def add_vertex(self, vertex):
         """
@@ -15,6 +51,7 @@ class Graph:
         """
         if vertex not in self.adjacency_list:
             self.adjacency_list[vertex] = set()
+            self.version += 1
 
     def add_edge(self, start, end, weight=1):
         """
@@ -30,8 +67,143 @@ class Graph:
         self.add_vertex(end)
         
         # Agregar la conexión y el peso
+        old_weight = self.edge_weights.get((start, end))
         self.adjacency_list[start].add(end)
         self.edge_weights[(start, end)] = weight
+        
+        if old_weight is None:
+            self._publish(EDGE_ADDED, start, end, None, weight)
+        elif old_weight != weight:
+            self._publish(EDGE_UPDATED, start, end, old_weight, weight)
+
+    def add_edges(self, starts, ends, weights):
+        """
+        Agrega muchas aristas de una vez (e.g., al importar una red). Sin
+        suscriptores no se publica un evento por arista: la versión se
+        incrementa una sola vez.
+
+        Args:
+            starts: Vértices de inicio
+            ends: Vértices de fin
+            weights: Pesos de las aristas
+        """
+        if self._listeners:
+            for start, end, weight in zip(starts, ends, weights):
+                self.add_edge(start, end, weight)
+            return
+        adjacency = self.adjacency_list
+        edge_weights = self.edge_weights
+        for start, end, weight in zip(starts, ends, weights):
+            successors = adjacency.get(start)
+            if successors is None:
+                successors = adjacency[start] = set()
+            if end not in adjacency:
+                adjacency[end] = set()
+            successors.add(end)
+            edge_weights[(start, end)] = weight
+        self.version += 1
+
+    def remove_edge(self, start, end):
+        """
+        Elimina la arista entre dos vértices (e.g., un enlace cerrado por clima).
+        
+        Args:
+            start: Vértice de inicio
+            end: Vértice de fin
+            
+        Raises:
+            ValueError: Si la arista no existe
+        """
+        if (start, end) not in self.edge_weights:
+            raise ValueError(f"No existe la arista {start} -> {end}")
+        old_weight = self.edge_weights.pop((start, end))
+        self.adjacency_list[start].discard(end)
+        self._publish(EDGE_REMOVED, start, end, old_weight, None)
+
+    def update_edge_weight(self, start, end, weight):
+        """
+        Cambia el peso de una arista existente.
+        
+        Args:
+            start: Vértice de inicio
+            end: Vértice de fin
+            weight: Nuevo peso de la arista
+            
+        Raises:
+            ValueError: Si la arista no existe
+        """
+        if (start, end) not in self.edge_weights:
+            raise ValueError(f"No existe la arista {start} -> {end}")
+        self.add_edge(start, end, weight)
+
+    def disable_vertex(self, vertex):
+        """
+        Deja un vértice fuera de servicio: no aparece como vecino ni tiene vecinos.
+        
+        Args:
+            vertex: Identificador del vértice
+            
+        Raises:
+            ValueError: Si el vértice no existe
+        """
+        if vertex not in self.adjacency_list:
+            raise ValueError(f"No existe el vértice {vertex}")
+        if vertex not in self._disabled:
+            self._disabled.add(vertex)
+            self._publish(VERTEX_DISABLED, vertex)
+
+    def enable_vertex(self, vertex):
+        """
+        Vuelve a poner en servicio un vértice deshabilitado.
+        
+        Args:
+            vertex: Identificador del vértice
+        """
+        if vertex in self._disabled:
+            self._disabled.discard(vertex)
+            self._publish(VERTEX_ENABLED, vertex)
+
+    def compact(self):
+        """
+        Obtiene una instantánea en arreglos (CSR) del grafo, reconstruida solo
+        si el grafo cambió desde la última llamada.
+        
+        Returns:
+            CompactGraph: Instantánea del grafo
+        """
+        if self._compact is None or self._compact.is_stale(self):
+            from .CompactGraph import CompactGraph
+            self._compact = CompactGraph(self)
+        return self._compact
+
+    def fingerprint(self):
+        """
+        Huella estable del contenido del grafo (vértices, aristas con pesos y
+        vértices deshabilitados), independiente del orden de inserción.
+        Sirve para validar índices persistidos en disco.
+        
+        Returns:
+            str: Hash SHA-1 en hexadecimal
+        """
+        if self._fingerprint is None or self._fingerprint[0] != self.version:
+            digest = hashlib.sha1()
+            for vertex in sorted(self.adjacency_list):
+                digest.update(f"v\t{vertex}\n".encode())
+            for (start, end), weight in sorted(self.edge_weights.items()):
+                digest.update(f"e\t{start}\t{end}\t{weight!r}\n".encode())
+            for vertex in sorted(self._disabled):
+                digest.update(f"d\t{vertex}\n".encode())
+            self._fingerprint = (self.version, digest.hexdigest())
+        return self._fingerprint[1]
+
+    def is_disabled(self, vertex):
+        """
+        Verifica si un vértice está fuera de servicio.
+        
+        Returns:
+            bool: True si el vértice está deshabilitado
+        """
+        return vertex in self._disabled
 
     def vertices(self):
         """
@@ -52,6 +224,10 @@ class Graph:
         Returns:
             list: Lista de vértices vecinos
         """
+        if self._disabled:
+            if vertex in self._disabled:
+                return []
+            return [n for n in self.adjacency_list.get(vertex, ()) if n not in self._disabled]
         return list(self.adjacency_list.get(vertex, set()))
 
     def get_edge(self, start, end):
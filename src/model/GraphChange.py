@@ -0,0 +1,65 @@
+"""Graph change events published by Graph mutations."""
+
+EDGE_ADDED = 'edge_added'
+EDGE_REMOVED = 'edge_removed'
+EDGE_UPDATED = 'edge_updated'
+VERTEX_DISABLED = 'vertex_disabled'
+VERTEX_ENABLED = 'vertex_enabled'
+
+
+class GraphChange:
+    """Describe un cambio puntual del grafo para que los suscriptores reparen sus cachés."""
+    __slots__ = 'kind', 'start', 'end', 'old_weight', 'new_weight'
+
+    def __init__(self, kind, start, end=None, old_weight=None, new_weight=None):
+        """
+        Inicializa el evento.
+
+        Args:
+            kind: Tipo de cambio (EDGE_ADDED, EDGE_REMOVED, EDGE_UPDATED,
+                VERTEX_DISABLED, VERTEX_ENABLED)
+            start: Vértice de inicio de la arista, o el vértice afectado
+            end: Vértice de fin de la arista (None para cambios de vértice)
+            old_weight: Peso anterior de la arista (si aplica)
+            new_weight: Peso nuevo de la arista (si aplica)
+        """
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.old_weight = old_weight
+        self.new_weight = new_weight
+
+    def is_edge_change(self):
+        """Return True if the change affects a single edge."""
+        return self.end is not None
+
+    def improves(self):
+        """
+        Indica si el cambio puede acortar rutas o habilitar rutas nuevas.
+
+        Returns:
+            bool: True para aristas nuevas, pesos menores y vértices rehabilitados
+        """
+        if self.kind in (EDGE_ADDED, VERTEX_ENABLED):
+            return True
+        if self.kind == EDGE_UPDATED:
+            return self.new_weight < self.old_weight
+        return False
+
+    def degrades(self):
+        """
+        Indica si el cambio puede invalidar rutas existentes.
+
+        Returns:
+            bool: True para aristas eliminadas, pesos mayores y vértices deshabilitados
+        """
+        if self.kind in (EDGE_REMOVED, VERTEX_DISABLED):
+            return True
+        if self.kind == EDGE_UPDATED:
+            return self.new_weight > self.old_weight
+        return False
+
+    def __repr__(self):
+        if self.is_edge_change():
+            return f"GraphChange({self.kind}, {self.start} -> {self.end}, {self.old_weight} -> {self.new_weight})"
+        return f"GraphChange({self.kind}, {self.start})"
@@ -0,0 +1,272 @@
+"""Importación por bloques de redes reales desde CSV, listas de aristas o GraphML."""
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+from .Graph import Graph
+from .NodeRegistry import role_of, ROLE_STORAGE, ROLE_CHARGING, ROLE_CLIENT, ROLE_UNKNOWN
+
+# Prefijo de ID que corresponde a cada rol (ver NodeRegistry.role_of)
+ROLE_PREFIXES = {ROLE_STORAGE: 'S', ROLE_CHARGING: 'C', ROLE_CLIENT: 'T'}
+
+# Valores aceptados en una columna de rol
+ROLE_NAMES = {
+    's': ROLE_STORAGE, 'storage': ROLE_STORAGE, 'depot': ROLE_STORAGE, 'almacenamiento': ROLE_STORAGE,
+    'c': ROLE_CHARGING, 'charging': ROLE_CHARGING, 'charger': ROLE_CHARGING, 'carga': ROLE_CHARGING,
+    't': ROLE_CLIENT, 'client': ROLE_CLIENT, 'customer': ROLE_CLIENT, 'cliente': ROLE_CLIENT,
+}
+
+
+def count_components(num_vertices, starts, ends):
+    """
+    Cantidad de componentes débilmente conexas con union-find (unión por
+    tamaño y compresión de caminos), en tiempo casi lineal.
+
+    Args:
+        num_vertices: Cantidad de vértices (códigos 0..n-1)
+        starts: Códigos de inicio de las aristas
+        ends: Códigos de fin de las aristas
+
+    Returns:
+        int: Cantidad de componentes
+    """
+    parent = list(range(num_vertices))
+    size = [1] * num_vertices
+    components = num_vertices
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in zip(starts, ends):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            if size[ra] < size[rb]:
+                ra, rb = rb, ra
+            parent[rb] = ra
+            size[ra] += size[rb]
+            components -= 1
+    return components
+
+
+class GraphLoader:
+    """
+    Construye un Graph a partir de archivos grandes leídos por bloques.
+
+    Cada bloque se convierte a códigos enteros (un diccionario por nodo
+    distinto, no por fila) y se acumula en arreglos NumPy; el grafo se arma
+    al final en una sola pasada con Graph.add_edges. Los roles se infieren
+    del prefijo del ID (S/C/T) o de una columna de rol; en ese caso los IDs
+    cuyo prefijo no coincide con el rol se renombran anteponiendo la letra
+    del rol, porque el resto del sistema deduce el rol del prefijo.
+
+    Después de cargar quedan disponibles los nodos por rol, la cantidad de
+    componentes conexas y el mapeo de IDs renombrados.
+    """
+
+    def __init__(self, chunk_size=200_000, bidirectional=False, validate='raise'):
+        """
+        Inicializa el cargador.
+
+        Args:
+            chunk_size: Filas por bloque de lectura
+            bidirectional: Agregar también la arista inversa de cada arista
+            validate: 'raise' para fallar si la red no es conexa, 'warn' para
+                solo registrarlo en components, None para no validar
+        """
+        self.chunk_size = chunk_size
+        self.bidirectional = bidirectional
+        self.validate = validate
+        self._reset()
+
+    def _reset(self):
+        self._codes = {}  # ID -> código
+        self._ids = []  # Código -> ID
+        self._starts = []  # Bloques de códigos de inicio
+        self._ends = []
+        self._weights = []
+        self._roles = {}  # ID original -> rol declarado
+        self.storage_nodes = []
+        self.charging_nodes = []
+        self.client_nodes = []
+        self.renamed = {}  # ID original -> ID con prefijo de rol
+        self.unknown_nodes = 0  # Nodos sin rol reconocible
+        self.components = None
+        self.num_edges = 0
+
+    def _encode(self, values):
+        """Convierte un bloque de IDs a códigos registrando solo los IDs nuevos."""
+        values = pd.Series(values, dtype=object).astype(str)
+        codes = self._codes
+        for value in pd.unique(values):
+            if value not in codes:
+                codes[value] = len(self._ids)
+                self._ids.append(value)
+        return values.map(codes).to_numpy(dtype=np.int64)
+
+    def _add_chunk(self, starts, ends, weights):
+        self._starts.append(self._encode(starts))
+        self._ends.append(self._encode(ends))
+        weights = pd.to_numeric(pd.Series(weights), errors='coerce').fillna(1).to_numpy(dtype=np.float64)
+        self._weights.append(weights)
+
+    def _add_roles(self, ids, roles):
+        """Registra los nodos de un bloque (aunque no tengan aristas) y sus roles declarados."""
+        ids = pd.Series(ids, dtype=object).astype(str)
+        self._encode(ids)
+        for node_id, role in zip(ids, roles):
+            if isinstance(role, str) and role.strip().lower() in ROLE_NAMES:
+                self._roles[node_id] = ROLE_NAMES[role.strip().lower()]
+
+    def load_csv(self, path, source='source', target='target', weight='weight', nodes_path=None,
+                 node_id='id', role='role', sep=','):
+        """
+        Carga una lista de aristas en CSV con encabezado.
+
+        Args:
+            path: Archivo CSV de aristas
+            source: Columna del vértice de inicio
+            target: Columna del vértice de fin
+            weight: Columna del peso (si no existe, todos los pesos valen 1)
+            nodes_path: CSV de nodos con columnas de ID y rol (opcional)
+            node_id: Columna de ID en el CSV de nodos
+            role: Columna de rol en el CSV de nodos
+            sep: Separador de columnas
+
+        Returns:
+            Graph: Grafo construido
+        """
+        self._reset()
+        header = pd.read_csv(path, sep=sep, nrows=0).columns
+        columns = [source, target] + ([weight] if weight in header else [])
+        for chunk in pd.read_csv(path, sep=sep, usecols=columns, dtype={source: str, target: str},
+                                 chunksize=self.chunk_size):
+            weights = chunk[weight] if weight in chunk else np.ones(len(chunk))
+            self._add_chunk(chunk[source], chunk[target], weights)
+        if nodes_path is not None:
+            for chunk in pd.read_csv(nodes_path, sep=sep, usecols=[node_id, role], dtype=str,
+                                     chunksize=self.chunk_size):
+                self._add_roles(chunk[node_id], chunk[role])
+        return self._build()
+
+    def load_edge_list(self, path, comment='#'):
+        """
+        Carga una lista de aristas separada por espacios: "origen destino [peso]".
+
+        Args:
+            path: Archivo de texto
+            comment: Prefijo de las líneas de comentario
+
+        Returns:
+            Graph: Grafo construido
+        """
+        self._reset()
+        for chunk in pd.read_csv(path, sep=r'\s+', header=None, names=['source', 'target', 'weight'],
+                                 dtype={'source': str, 'target': str}, comment=comment,
+                                 chunksize=self.chunk_size):
+            self._add_chunk(chunk['source'], chunk['target'], chunk['weight'])
+        return self._build()
+
+    def load_graphml(self, path, weight='weight', role='role'):
+        """
+        Carga un archivo GraphML recorriéndolo en streaming (los elementos
+        procesados se liberan de inmediato). Un grafo con
+        edgedefault="undirected" se carga en ambos sentidos.
+
+        Args:
+            path: Archivo GraphML
+            weight: Nombre del atributo de peso de las aristas
+            role: Nombre del atributo de rol de los nodos
+
+        Returns:
+            Graph: Grafo construido
+        """
+        self._reset()
+        keys = {}  # ID de <key> -> nombre del atributo
+        starts, ends, weights = [], [], []
+        node_ids, node_roles = [], []
+        undirected = False
+        for event, element in ET.iterparse(path, events=('start', 'end')):
+            tag = element.tag.rsplit('}', 1)[-1]
+            if event == 'start':
+                if tag == 'graph':
+                    undirected = element.get('edgedefault') == 'undirected'
+                continue
+            if tag == 'key':
+                keys[element.get('id')] = element.get('attr.name', element.get('id'))
+            elif tag == 'node':
+                data = self._graphml_data(element, keys)
+                node_ids.append(element.get('id'))
+                node_roles.append(data.get(role))
+                element.clear()
+                if len(node_ids) >= self.chunk_size:
+                    self._add_roles(node_ids, node_roles)
+                    node_ids, node_roles = [], []
+            elif tag == 'edge':
+                data = self._graphml_data(element, keys)
+                starts.append(element.get('source'))
+                ends.append(element.get('target'))
+                weights.append(data.get(weight, 1))
+                element.clear()
+                if len(starts) >= self.chunk_size:
+                    self._add_chunk(starts, ends, weights)
+                    starts, ends, weights = [], [], []
+        if node_ids:
+            self._add_roles(node_ids, node_roles)
+        if starts:
+            self._add_chunk(starts, ends, weights)
+        bidirectional = self.bidirectional
+        self.bidirectional = bidirectional or undirected
+        try:
+            return self._build()
+        finally:
+            self.bidirectional = bidirectional
+
+    @staticmethod
+    def _graphml_data(element, keys):
+        return {keys.get(data.get('key'), data.get('key')): data.text
+                for data in element if data.tag.rsplit('}', 1)[-1] == 'data'}
+
+    def _build(self):
+        """Arma el grafo con los bloques acumulados, asigna roles y valida la conectividad."""
+        n = len(self._ids)
+        starts = np.concatenate(self._starts) if self._starts else np.zeros(0, dtype=np.int64)
+        ends = np.concatenate(self._ends) if self._ends else np.zeros(0, dtype=np.int64)
+        weights = np.concatenate(self._weights) if self._weights else np.zeros(0)
+        self._starts, self._ends, self._weights = [], [], []
+
+        # IDs finales: se antepone la letra del rol declarado si el prefijo no coincide
+        ids = list(self._ids)
+        roles = np.empty(n, dtype=np.uint8)
+        for code, node_id in enumerate(ids):
+            declared = self._roles.get(node_id)
+            if declared is not None and role_of(node_id) != declared:
+                new_id = ROLE_PREFIXES[declared] + node_id
+                self.renamed[node_id] = new_id
+                ids[code] = new_id
+            roles[code] = declared if declared is not None else role_of(ids[code])
+        if len(set(ids)) != n:
+            raise ValueError("Renombrar los nodos según su rol produjo IDs repetidos")
+
+        if self.bidirectional:
+            starts, ends = np.concatenate((starts, ends)), np.concatenate((ends, starts))
+            weights = np.concatenate((weights, weights))
+        labels = np.array(ids, dtype=object)
+        values = weights.astype(np.int64).tolist() if np.all(weights == np.round(weights)) else weights.tolist()
+        graph = Graph()
+        for node_id in ids:
+            graph.add_vertex(node_id)
+        graph.add_edges(labels[starts].tolist(), labels[ends].tolist(), values)
+        self.num_edges = len(graph.edge_weights)
+
+        for role_code, target in ((ROLE_STORAGE, self.storage_nodes), (ROLE_CHARGING, self.charging_nodes),
+                                  (ROLE_CLIENT, self.client_nodes)):
+            target.extend(labels[roles == role_code].tolist())
+        self.unknown_nodes = int(np.count_nonzero(roles == ROLE_UNKNOWN))
+
+        if self.validate:
+            self.components = count_components(n, starts.tolist(), ends.tolist())
+            if self.components > 1 and self.validate == 'raise':
+                raise ValueError(f"La red importada no es conexa ({self.components} componentes)")
+        return graph
@@ -0,0 +1,127 @@
+"""Registro compartido de IDs de nodo internados como enteros pequeños."""
+from array import array
+import numpy as np
+
+ROLE_STORAGE = 0
+ROLE_CHARGING = 1
+ROLE_CLIENT = 2
+ROLE_UNKNOWN = 3
+
+_ROLE_BY_PREFIX = {'S': ROLE_STORAGE, 'C': ROLE_CHARGING, 'T': ROLE_CLIENT}
+
+
+def role_of(node_id):
+    """
+    Determina el rol de un nodo a partir del prefijo de su ID.
+
+    Args:
+        node_id: ID del nodo (e.g., 'S1', 'C2', 'T3')
+
+    Returns:
+        int: ROLE_STORAGE, ROLE_CHARGING, ROLE_CLIENT o ROLE_UNKNOWN
+    """
+    return _ROLE_BY_PREFIX.get(node_id[:1], ROLE_UNKNOWN)
+
+
+class NodeRegistry:
+    """
+    Interna IDs de nodo a códigos enteros consecutivos.
+
+    Cada ID se guarda una sola vez; rutas y órdenes referencian los nodos por
+    su código, y el rol de cada nodo se calcula una única vez al registrarlo.
+    """
+    __slots__ = ('_codes', '_ids', '_roles')
+
+    _shared = None
+
+    def __init__(self):
+        self._codes = {}
+        self._ids = []
+        self._roles = bytearray()
+
+    @classmethod
+    def shared(cls):
+        """
+        Registro compartido por todo el proceso.
+
+        Returns:
+            NodeRegistry: Instancia única compartida
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def intern(self, node_id):
+        """
+        Obtiene el código de un nodo, registrándolo si es nuevo.
+
+        Args:
+            node_id: ID del nodo
+
+        Returns:
+            int: Código del nodo
+        """
+        code = self._codes.get(node_id)
+        if code is None:
+            code = len(self._ids)
+            self._codes[node_id] = code
+            self._ids.append(node_id)
+            self._roles.append(role_of(node_id))
+        return code
+
+    def find(self, node_id):
+        """Retorna el código de un nodo o None si no está registrado."""
+        return self._codes.get(node_id)
+
+    def node_id(self, code):
+        """Retorna el ID de nodo asociado a un código."""
+        return self._ids[code]
+
+    def role(self, code):
+        """Retorna el rol de un nodo por su código."""
+        return self._roles[code]
+
+    def encode(self, nodes):
+        """
+        Convierte una secuencia de IDs a un arreglo compacto de códigos.
+
+        Args:
+            nodes: Secuencia de IDs de nodo
+
+        Returns:
+            array: Arreglo array('I') con los códigos
+        """
+        intern = self.intern
+        return array('I', [intern(node) for node in nodes])
+
+    def decode(self, codes):
+        """
+        Convierte una secuencia de códigos a una tupla de IDs.
+
+        Args:
+            codes: Secuencia de códigos
+
+        Returns:
+            tuple: IDs de nodo
+        """
+        ids = self._ids
+        return tuple(ids[code] for code in codes)
+
+    def ids(self):
+        """Retorna la lista de IDs en orden de código."""
+        return self._ids
+
+    def roles(self):
+        """
+        Retorna los roles de todos los nodos registrados.
+
+        Returns:
+            numpy.ndarray: Arreglo uint8 con el rol de cada código
+        """
+        return np.frombuffer(bytes(self._roles), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, node_id):
+        return node_id in self._codes
@@ -1,5 +1,6 @@
 """Model package initialization."""
 from .Edge import Edge
 from .Graph import Graph
+from .GraphChange import GraphChange
 
-__all__ = ['Edge', 'Graph'] 
\ No newline at end of file
+__all__ = ['Edge', 'Graph', 'GraphChange'] 
\ No newline at end of file
@@ -0,0 +1,184 @@
+import heapq
+from src.sim.routing import advance_battery, completed_result, failed_result, invalid_nodes_result
+
+
+class BidirectionalRouter:
+    """
+    Búsqueda bidireccional con restricción de batería.
+
+    La búsqueda hacia adelante usa etiquetas (nodo, batería) desde el origen.
+    La búsqueda hacia atrás recorre la adyacencia inversa desde el destino con
+    etiquetas (nodo, batería necesaria): la carga mínima con la que hay que
+    llegar al nodo para completar el resto de la ruta. Un par de etiquetas
+    del mismo nodo forma una ruta válida si la batería cubre la necesaria.
+    Ambas búsquedas avanzan en orden (recargas, costo), por lo que la ruta
+    encontrada minimiza las recargas y luego el costo.
+    """
+
+    def __init__(self, compact_graph, drone_autonomy):
+        """
+        Inicializa el router sobre una instantánea del grafo.
+
+        Args:
+            compact_graph: CompactGraph del grafo a rutear
+            drone_autonomy: Autonomía máxima del dron
+        """
+        self.graph = compact_graph
+        self.autonomy = drone_autonomy
+
+    def find_path(self, start, end, stats=None):
+        """
+        Encuentra la ruta con menos recargas (y luego menor costo).
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            stats: Dict donde informar estados generados, pico de las colas y
+                recargas consideradas (opcional, ver Instrumentation)
+
+        Returns:
+            dict: Mismo formato que SimulationInitializer.find_path_with_charging
+        """
+        g = self.graph
+        if start not in g.index or end not in g.index:
+            return invalid_nodes_result()
+        source = g.index[start]
+        target = g.index[end]
+        autonomy = self.autonomy
+        charging = g.is_charging.tolist()
+        out_lists = g.out_lists()
+        in_lists = g.in_lists()
+
+        # Etiquetas: (nodo, batería o necesidad, recargas, costo, padre, profundidad)
+        forward = [(source, autonomy, 0, 0, -1, 1)]
+        backward = [(target, 0, 0, 0, -1, 1)]
+        forward_at = {source: [0]}  # Nodo -> etiquetas no dominadas
+        backward_at = {target: [0]}
+        forward_heap = [(0, 0, 0)]
+        backward_heap = [(0, 0, 0)]
+        best = None  # (recargas, costo, etiqueta adelante, etiqueta atrás)
+        longest = 0
+
+        def meet(forward_label, backward_label):
+            nonlocal best
+            _, battery, recharges, cost, _, _ = forward[forward_label]
+            _, need, back_recharges, back_cost, _, _ = backward[backward_label]
+            if battery >= need:
+                candidate = (recharges + back_recharges, cost + back_cost, forward_label, backward_label)
+                if best is None or candidate[:2] < best[:2]:
+                    best = candidate
+
+        def dominated(labels, at, node, value, recharges, cost, better):
+            for other in at.get(node, ()):
+                _, other_value, other_recharges, other_cost, _, _ = labels[other]
+                if better(other_value, value) and other_recharges <= recharges and other_cost <= cost:
+                    return True
+            return False
+
+        if source == target:
+            meet(0, 0)  # Las etiquetas iniciales ya forman la ruta de un solo nodo
+
+        track_queue = stats is not None
+        queue_peak = 2
+
+        while forward_heap and backward_heap:
+            if track_queue and len(forward_heap) + len(backward_heap) > queue_peak:
+                queue_peak = len(forward_heap) + len(backward_heap)
+            top_forward = forward_heap[0][:2]
+            top_backward = backward_heap[0][:2]
+            bound = (top_forward[0] + top_backward[0], top_forward[1] + top_backward[1])
+            if best is not None and bound >= best[:2]:
+                break
+
+            if len(forward_heap) <= len(backward_heap):
+                recharges, cost, label = heapq.heappop(forward_heap)
+                node, battery, _, _, _, depth = forward[label]
+                if label not in forward_at.get(node, ()):
+                    continue  # Etiqueta dominada después de insertarse
+                if depth > forward[longest][5]:
+                    longest = label
+                from_charging = charging[node]
+                for neighbor, weight in out_lists[node]:
+                    new_battery, new_recharges = advance_battery(
+                        battery, recharges, from_charging, charging[neighbor], weight, autonomy)
+                    if new_battery < 0:
+                        continue
+                    new_cost = cost + weight
+                    if dominated(forward, forward_at, neighbor, new_battery, new_recharges, new_cost,
+                                 lambda other, value: other >= value):
+                        continue
+                    forward.append((neighbor, new_battery, new_recharges, new_cost, label, depth + 1))
+                    new_label = len(forward) - 1
+                    self._insert(forward, forward_at, neighbor, new_label, lambda a, b: a >= b)
+                    heapq.heappush(forward_heap, (new_recharges, new_cost, new_label))
+                    for other in backward_at.get(neighbor, ()):
+                        meet(new_label, other)
+            else:
+                recharges, cost, label = heapq.heappop(backward_heap)
+                node, need, _, _, _, depth = backward[label]
+                if label not in backward_at.get(node, ()):
+                    continue
+                to_charging = charging[node]
+                for previous, weight in in_lists[node]:
+                    if charging[previous] or to_charging:
+                        # El tramo restablece la batería: basta con llegar a previous
+                        new_need = 0
+                        new_recharges = recharges + (0 if charging[previous] else 1)
+                    else:
+                        new_need = need + weight
+                        new_recharges = recharges
+                        if new_need > autonomy:
+                            continue
+                    new_cost = cost + weight
+                    if dominated(backward, backward_at, previous, new_need, new_recharges, new_cost,
+                                 lambda other, value: other <= value):
+                        continue
+                    backward.append((previous, new_need, new_recharges, new_cost, label, depth + 1))
+                    new_label = len(backward) - 1
+                    self._insert(backward, backward_at, previous, new_label, lambda a, b: a <= b)
+                    heapq.heappush(backward_heap, (new_recharges, new_cost, new_label))
+                    for other in forward_at.get(previous, ()):
+                        meet(other, new_label)
+
+        if stats is not None:
+            stats['states'] = len(forward) + len(backward)
+            stats['queue_peak'] = queue_peak
+            stats['recharges_considered'] = sum(
+                1 for labels in (forward, backward) for label in labels[1:] if label[2] > labels[label[4]][2])
+
+        if best is None:
+            # Devolver el camino parcial más largo de la búsqueda hacia adelante
+            return failed_result(self._path(forward, longest)[::-1], forward[longest][1])
+        path = self._path(forward, best[2])[::-1] + self._path(backward, best[3])[1:]
+        return completed_result(path, self._battery_left(path))
+
+    @staticmethod
+    def _insert(labels, at, node, label, better):
+        """Agrega la etiqueta al nodo y descarta las que quedan dominadas por ella."""
+        _, value, recharges, cost, _, _ = labels[label]
+        kept = [other for other in at.get(node, ())
+                if not (better(value, labels[other][1]) and recharges <= labels[other][2]
+                        and cost <= labels[other][3])]
+        kept.append(label)
+        at[node] = kept
+
+    def _path(self, labels, label):
+        ids = self.graph.ids
+        path = []
+        while label != -1:
+            node, _, _, _, label, _ = labels[label]
+            path.append(ids[node])
+        return path
+
+    def _battery_left(self, path):
+        """Batería al final de la ruta según la regla de recarga del simulador."""
+        g = self.graph
+        charging = g.is_charging.tolist()
+        out_lists = g.out_lists()
+        battery, recharges = self.autonomy, 0
+        for current, following in zip(path, path[1:]):
+            i, j = g.index[current], g.index[following]
+            weight = dict(out_lists[i])[j]
+            battery, recharges = advance_battery(battery, recharges, charging[i], charging[j],
+                                                 weight, self.autonomy)
+        return battery
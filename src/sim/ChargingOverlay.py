@@ -0,0 +1,317 @@
+import heapq
+import math
+from src.model.GraphChange import EDGE_ADDED, EDGE_REMOVED
+from src.sim.routing import completed_result, failed_result, invalid_nodes_result
+
+
+class _LegSearch:
+    """
+    Resultado de una búsqueda local acotada por la autonomía desde un nodo:
+    etiquetas (nodo, costo, energía, padre), primera etiqueta expandida por
+    nodo y estaciones de carga alcanzadas (donde la búsqueda se detiene).
+    """
+    __slots__ = ('origin', 'labels', 'first', 'reached', 'region')
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.labels = []
+        self.first = {}  # Nodo -> índice de su etiqueta de menor costo
+        self.reached = {}  # Estación de carga -> índice de su etiqueta de menor costo
+        self.region = set()  # Nodos explorados (para la invalidación)
+
+    def path(self, index, reverse=False):
+        nodes = []
+        while index != -1:
+            node, _, _, index = self.labels[index]
+            nodes.append(node)
+        if not reverse:
+            nodes.reverse()
+        return nodes
+
+    def cost(self, index):
+        return self.labels[index][1]
+
+    def energy(self, index):
+        return self.labels[index][2]
+
+
+class ChargingOverlay:
+    """
+    Grafo superpuesto entre estaciones de carga.
+
+    Como la batería se restablece en cada estación, la factibilidad de una
+    ruta depende solo de los tramos entre recargas. El overlay precalcula los
+    tramos C→C factibles dentro de la autonomía (con su costo y recargas) y
+    calcula bajo demanda los tramos de acceso S→C y C→T. Las consultas se
+    resuelven sobre el overlay y luego se expanden los tramos a nodos.
+
+    Un índice nodo -> búsquedas que lo exploraron permite reconstruir solo los
+    tramos afectados cuando cambia una arista o una estación de carga.
+    """
+
+    def __init__(self, graph, charging_nodes, drone_autonomy):
+        """
+        Inicializa el overlay (se construye con build()).
+
+        Args:
+            graph: Grafo de la red
+            charging_nodes: Lista de estaciones de carga
+            drone_autonomy: Autonomía máxima del dron
+        """
+        self.graph = graph
+        self.autonomy = drone_autonomy
+        self.charging = set(charging_nodes)
+        self.legs = {}  # Estación -> {estación: (recargas, costo, camino)}
+        self._predecessors = {}  # Nodo -> predecesores (el grafo solo guarda sucesores)
+        self._sources = {}  # Origen -> _LegSearch hacia adelante
+        self._targets = {}  # Destino -> _LegSearch hacia atrás
+        self._forward_region = {}  # Nodo -> claves de búsquedas hacia adelante que lo exploraron
+        self._backward_region = {}  # Nodo -> destinos cuyas búsquedas hacia atrás lo exploraron
+        self._searched = {}  # Clave de búsqueda -> región registrada en el índice
+
+    def build(self):
+        """
+        Calcula todos los tramos entre estaciones de carga y se suscribe a los
+        cambios del grafo.
+
+        Returns:
+            ChargingOverlay: El propio overlay
+        """
+        self._predecessors = {vertex: [] for vertex in self.graph.vertices()}
+        for start, end in self.graph.edge_weights:
+            self._predecessors[end].append(start)
+        self._sources.clear()
+        self._targets.clear()
+        self._forward_region.clear()
+        self._backward_region.clear()
+        self._searched.clear()
+        for station in self.charging:
+            self._build_legs(station)
+        self.graph.unsubscribe(self._on_graph_change)
+        self.graph.subscribe(self._on_graph_change)
+        return self
+
+    def num_legs(self):
+        """Cantidad total de tramos entre estaciones de carga."""
+        return sum(len(legs) for legs in self.legs.values())
+
+    def _neighbors(self, node, reverse):
+        graph = self.graph
+        if reverse:
+            for previous in self._predecessors.get(node, ()):
+                if not graph.is_disabled(previous):
+                    yield previous, graph.edge_weights[(previous, node)]
+        else:
+            for following in graph.get_neighbors(node):
+                yield following, graph.edge_weights[(node, following)]
+
+    def _search(self, origin, reverse=False):
+        """
+        Búsqueda de costo mínimo desde un nodo hasta las estaciones de carga
+        alcanzables sin recargar (el consumo acumulado no supera la autonomía).
+        Las etiquetas se podan por dominancia (costo, energía) en cada nodo.
+
+        Args:
+            origin: Nodo de inicio
+            reverse: Recorrer las aristas en sentido inverso
+
+        Returns:
+            _LegSearch: Resultado de la búsqueda
+        """
+        charging = self.charging
+        autonomy = self.autonomy
+        result = _LegSearch(origin)
+        if self.graph.is_disabled(origin):
+            return result
+        labels = result.labels
+        labels.append((origin, 0, 0, -1))
+        heap = [(0, 0, 0)]
+        min_energy = {}
+        while heap:
+            cost, energy, index = heapq.heappop(heap)
+            node = labels[index][0]
+            result.region.add(node)
+            if node in charging and node != origin:
+                result.reached.setdefault(node, index)
+                continue
+            if energy >= min_energy.get(node, math.inf):
+                continue
+            min_energy[node] = energy
+            result.first.setdefault(node, index)
+            node_charging = node in charging
+            for neighbor, weight in self._neighbors(node, reverse):
+                # Las aristas que tocan una estación de carga no consumen batería
+                new_energy = energy if node_charging or neighbor in charging else energy + weight
+                if new_energy > autonomy or new_energy >= min_energy.get(neighbor, math.inf):
+                    continue
+                labels.append((neighbor, cost + weight, new_energy, index))
+                heapq.heappush(heap, (cost + weight, new_energy, len(labels) - 1))
+        return result
+
+    def _index(self, key, region, backward=False):
+        index = self._backward_region if backward else self._forward_region
+        self._forget(key, backward)
+        self._searched[(backward, key)] = region
+        for node in region:
+            index.setdefault(node, set()).add(key)
+
+    def _forget(self, key, backward=False):
+        index = self._backward_region if backward else self._forward_region
+        for node in self._searched.pop((backward, key), ()):
+            keys = index.get(node)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[node]
+
+    def _build_legs(self, station):
+        """Recalcula los tramos que salen de una estación de carga."""
+        search = self._search(station)
+        legs = {}
+        for other, index in search.reached.items():
+            if self.graph.has_edge(station, other) and not self.graph.is_disabled(other):
+                # Arista directa entre estaciones: no cuenta una recarga
+                legs[other] = (0, self.graph.edge_weights[(station, other)], (station, other))
+            else:
+                legs[other] = (1, search.cost(index), tuple(search.path(index)))
+        self.legs[station] = legs
+        self._index(('leg', station), search.region)
+
+    def _source(self, start):
+        search = self._sources.get(start)
+        if search is None:
+            search = self._search(start)
+            self._sources[start] = search
+            self._index(('source', start), search.region)
+        return search
+
+    def _target(self, end):
+        search = self._targets.get(end)
+        if search is None:
+            search = self._search(end, reverse=True)
+            self._targets[end] = search
+            self._index(end, search.region, backward=True)
+        return search
+
+    def _on_graph_change(self, change):
+        """
+        Reconstruye los tramos afectados por un cambio del grafo y descarta
+        los tramos de acceso que exploraron la zona modificada.
+
+        Args:
+            change: GraphChange publicado por el grafo
+        """
+        if change.kind == EDGE_ADDED:
+            self._predecessors.setdefault(change.end, []).append(change.start)
+        elif change.kind == EDGE_REMOVED:
+            self._predecessors[change.end].remove(change.start)
+
+        if change.is_edge_change():
+            forward = set(self._forward_region.get(change.start, ()))
+            backward = set(self._backward_region.get(change.end, ()))
+        else:
+            # Un vértice (re)habilitado no figura en ninguna región: se usan sus vecinos
+            vertex = change.start
+            forward = set(self._forward_region.get(vertex, ()))
+            backward = set(self._backward_region.get(vertex, ()))
+            for previous in self._predecessors.get(vertex, ()):
+                forward |= self._forward_region.get(previous, set())
+            for following in self.graph.adjacency_list.get(vertex, ()):
+                backward |= self._backward_region.get(following, set())
+            if vertex in self.charging:
+                forward.add(('leg', vertex))
+
+        for kind, node in forward:
+            if kind == 'leg':
+                self._build_legs(node)
+            else:
+                self._sources.pop(node, None)
+                self._forget((kind, node))
+        for end in backward:
+            self._targets.pop(end, None)
+            self._forget(end, backward=True)
+
+    def find_path(self, start, end):
+        """
+        Encuentra la ruta con menos recargas (y luego menor costo) usando el overlay.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+
+        Returns:
+            dict: Mismo formato que SimulationInitializer.find_path_with_charging.
+                Si no hay ruta completa, el camino parcial es solo el origen.
+        """
+        graph = self.graph
+        if not (graph.has_vertex(start) and graph.has_vertex(end)):
+            return invalid_nodes_result()
+        if start == end:
+            return completed_result([start], self.autonomy)
+
+        # Tramos de acceso: origen -> estaciones y estaciones -> destino
+        source = self._source(start)
+        if start in self.charging:
+            dist = {start: (0, 0)}
+        else:
+            dist = {station: (1, source.cost(index)) for station, index in source.reached.items()}
+        if end in self.charging:
+            exits = {end: (0, 0)} if not graph.is_disabled(end) else {}
+            target = None
+        else:
+            target = self._target(end)
+            exits = {station: (0, target.cost(index)) for station, index in target.reached.items()}
+
+        best = None  # (recargas, costo, estación de salida o None si es directa)
+        if start not in self.charging and end not in self.charging and end in source.first:
+            best = (0, source.cost(source.first[end]), None)
+
+        # Dijkstra lexicográfico (recargas, costo) sobre las estaciones
+        previous = {}
+        heap = [(recharges, cost, station) for station, (recharges, cost) in dist.items()]
+        heapq.heapify(heap)
+        settled = set()
+        while heap:
+            recharges, cost, station = heapq.heappop(heap)
+            if station in settled or dist[station] != (recharges, cost):
+                continue
+            if best is not None and (recharges, cost) >= best[:2]:
+                break
+            settled.add(station)
+            if station in exits:
+                exit_recharges, exit_cost = exits[station]
+                candidate = (recharges + exit_recharges, cost + exit_cost, station)
+                if best is None or candidate < best:
+                    best = candidate
+            for other, (leg_recharges, leg_cost, _) in self.legs.get(station, {}).items():
+                new = (recharges + leg_recharges, cost + leg_cost)
+                if other not in dist or new < dist[other]:
+                    dist[other] = new
+                    previous[other] = station
+                    heapq.heappush(heap, (new[0], new[1], other))
+
+        if best is None:
+            return failed_result([start], self.autonomy)
+        if best[2] is None:
+            index = source.first[end]
+            return completed_result(source.path(index), self.autonomy - source.energy(index))
+        return self._expand(start, end, best[2], previous, source, target)
+
+    def _expand(self, start, end, exit_station, previous, source, target):
+        """Expande la secuencia de estaciones elegida a la ruta completa de nodos."""
+        stations = [exit_station]
+        while stations[-1] in previous:
+            stations.append(previous[stations[-1]])
+        stations.reverse()
+
+        if start in self.charging:
+            path = [start]
+        else:
+            path = source.path(source.reached[stations[0]])
+        for station, other in zip(stations, stations[1:]):
+            path.extend(self.legs[station][other][2][1:])
+        if target is None:
+            return completed_result(path, self.autonomy)
+        index = target.reached[exit_station]
+        path.extend(target.path(index, reverse=True)[1:])
+        return completed_result(path, self.autonomy - target.energy(index))
@@ -0,0 +1,181 @@
+import os
+import numpy as np
+import pandas as pd
+from src.model.NodeRegistry import NodeRegistry, ROLE_CHARGING
+from src.domain.OrderTable import NODE_TYPE_LABELS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class ColumnarExporter:
+    """
+    Exportación por lotes de órdenes, rutas y visitas por nodo a archivos
+    columnares.
+
+    Con pyarrow disponible se escribe Parquet, un grupo de filas por lote;
+    sin pyarrow se escribe CSV agregando un bloque por lote. En ambos casos
+    cada lote se arma directamente desde las columnas (p. ej. del
+    OrderTable), sin construir un diccionario por objeto, y se libera antes
+    del siguiente.
+    """
+
+    def __init__(self, file_format=None, row_group_size=100_000):
+        """
+        Inicializa el exportador.
+
+        Args:
+            file_format: 'parquet' o 'csv' (None = Parquet si hay pyarrow)
+            row_group_size: Filas por lote / grupo de filas
+
+        Raises:
+            ValueError: Si el formato no es válido o falta pyarrow para Parquet
+        """
+        file_format = file_format or ('parquet' if HAS_PYARROW else 'csv')
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError(f"Formato de exportación no válido: {file_format}")
+        if file_format == 'parquet' and not HAS_PYARROW:
+            raise ValueError("La exportación a Parquet requiere pyarrow")
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+
+    @property
+    def extension(self):
+        """Extensión de archivo del formato elegido."""
+        return '.parquet' if self.file_format == 'parquet' else '.csv'
+
+    def _write(self, batches, target):
+        """
+        Escribe una secuencia de DataFrames con las mismas columnas.
+
+        Args:
+            batches: Iterable de DataFrames (uno por lote)
+            target: Ruta o archivo binario abierto
+
+        Returns:
+            int: Filas escritas
+        """
+        rows = 0
+        if self.file_format == 'parquet':
+            writer = None
+            try:
+                for frame in batches:
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(target, table.schema)
+                    writer.write_table(table)
+                    rows += len(frame)
+            finally:
+                if writer is not None:
+                    writer.close()
+            return rows
+
+        handle = open(target, 'wb') if isinstance(target, (str, os.PathLike)) else target
+        try:
+            for frame in batches:
+                frame.to_csv(handle, index=False, header=rows == 0)
+                rows += len(frame)
+        finally:
+            if handle is not target:
+                handle.close()
+        return rows
+
+    def export_orders(self, order_table, target):
+        """
+        Exporta todas las órdenes (mismas columnas que OrderTable.to_frame).
+
+        Args:
+            order_table: OrderTable con las órdenes
+            target: Ruta o archivo binario abierto
+
+        Returns:
+            int: Órdenes exportadas
+        """
+        size = len(order_table)
+        step = self.row_group_size
+        starts = range(0, size, step) if size else [0]
+        return self._write((order_table.to_frame(start, start + step) for start in starts), target)
+
+    def export_routes(self, routes, graph, target):
+        """
+        Exporta las rutas con su secuencia de nodos, frecuencia, costo y recargas.
+
+        Args:
+            routes: Lista de objetos Route
+            graph: Grafo para calcular los costos
+            target: Ruta o archivo binario abierto
+
+        Returns:
+            int: Rutas exportadas
+        """
+        roles = NodeRegistry.shared().roles
+        step = self.row_group_size
+
+        def batches():
+            role_of_code = roles()
+            for start in range(0, max(len(routes), 1), step):
+                chunk = routes[start:start + step]
+                recharges = []
+                for route in chunk:
+                    codes = np.frombuffer(route.codes, dtype=np.uint32)
+                    charging = role_of_code[codes] == ROLE_CHARGING
+                    recharges.append(int(np.count_nonzero(charging[1:] & ~charging[:-1])))
+                nodes = [route.nodes for route in chunk]
+                frame = pd.DataFrame({
+                    'ID_Ruta': [route.route_id for route in chunk],
+                    'Origen': [n[0] for n in nodes],
+                    'Destino': [n[-1] for n in nodes],
+                    'Nodos': [list(n) for n in nodes] if self.file_format == 'parquet'
+                    else [' → '.join(n) for n in nodes],
+                    'Saltos': np.array([len(n) - 1 for n in nodes], dtype=np.int32),
+                    'Frecuencia': np.array([route.frequency for route in chunk], dtype=np.int64),
+                    'Costo': np.array([route.calculate_total_cost(graph) for route in chunk], dtype=np.float64),
+                    'Recargas': np.array(recharges, dtype=np.int32),
+                })
+                yield frame
+
+        return self._write(batches(), target)
+
+    def export_visits(self, node_visits, target):
+        """
+        Exporta las visitas acumuladas por nodo.
+
+        Args:
+            node_visits: Dict {nodo: visitas} (p. ej. RouteRegistry.node_visits())
+            target: Ruta o archivo binario abierto
+
+        Returns:
+            int: Nodos exportados
+        """
+        registry = NodeRegistry.shared()
+        nodes = list(node_visits)
+        types = np.array(NODE_TYPE_LABELS, dtype=object)[
+            [registry.role(registry.intern(node)) for node in nodes]] if nodes else []
+        frame = pd.DataFrame({
+            'Nodo': nodes,
+            'Tipo': types,
+            'Visitas': np.array([node_visits[node] for node in nodes], dtype=np.int64),
+        })
+        return self._write([frame], target)
+
+    def export_simulation(self, simulation, directory):
+        """
+        Exporta órdenes, rutas y visitas de una simulación a un directorio.
+
+        Args:
+            simulation: SimulationInitializer a exportar
+            directory: Directorio de destino (se crea si no existe)
+
+        Returns:
+            dict: {'orders', 'routes', 'visits'} -> ruta del archivo escrito
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {name: os.path.join(directory, name + self.extension) for name in ('orders', 'routes', 'visits')}
+        self.export_orders(simulation.order_table, paths['orders'])
+        self.export_routes(simulation.route_registry.routes(), simulation.graph, paths['routes'])
+        self.export_visits(simulation.route_registry.node_visits(), paths['visits'])
+        return paths
@@ -0,0 +1,379 @@
+import heapq
+import math
+import numpy as np
+from src.model.NodeRegistry import role_of, ROLE_CHARGING
+from src.sim.routing import advance_battery, completed_result, failed_result, invalid_nodes_result
+
+FORMAT_VERSION = 1
+
+
+class ContractionHierarchy:
+    """
+    Jerarquía de contracción sobre los pesos (costos) de las aristas del grafo.
+
+    Los vértices se contraen en orden de importancia agregando atajos que
+    preservan las distancias mínimas. Una consulta es una búsqueda
+    bidireccional que solo sube en la jerarquía, por lo que explora unos
+    pocos vértices. Pensada para redes estáticas con muchas consultas; el
+    índice se puede guardar en disco y validar contra la huella del grafo.
+    """
+
+    def __init__(self, ids, ranks, up_out, up_in, middles, fingerprint=None, autonomy=None):
+        """
+        Inicializa la jerarquía a partir de sus estructuras (usar build() o load()).
+
+        Args:
+            ids: Lista de vértices (índice -> ID)
+            ranks: Orden de contracción de cada vértice
+            up_out: Aristas de salida hacia vértices de mayor rango [(j, peso), ...]
+            up_in: Aristas de entrada desde vértices de mayor rango [(j, peso), ...]
+            middles: {(i, j): vértice intermedio} de cada atajo
+            fingerprint: Huella del grafo de origen
+            autonomy: Autonomía del dron para las consultas con batería
+        """
+        self.ids = ids
+        self.index = {vertex: i for i, vertex in enumerate(ids)}
+        self.ranks = ranks
+        self.up_out = up_out
+        self.up_in = up_in
+        self.middles = middles
+        self.fingerprint = fingerprint
+        self.autonomy = autonomy
+        self.charging = [role_of(vertex) == ROLE_CHARGING for vertex in ids]
+        self.weights = {}  # (i, j) -> peso de aristas y atajos ascendentes
+        for i, edges in enumerate(up_out):
+            for j, weight in edges:
+                self.weights[(i, j)] = weight
+        for i, edges in enumerate(up_in):
+            for j, weight in edges:
+                self.weights[(j, i)] = weight
+
+    @classmethod
+    def build(cls, graph, drone_autonomy=None, witness_limit=200):
+        """
+        Construye la jerarquía contrayendo los vértices del grafo.
+
+        Args:
+            graph: Grafo de la red (se usa su instantánea compacta)
+            drone_autonomy: Autonomía del dron para las consultas con batería
+            witness_limit: Máximo de vértices a asentar en cada búsqueda de testigos
+
+        Returns:
+            ContractionHierarchy: Jerarquía construida
+        """
+        compact = graph.compact()
+        n = compact.num_vertices
+        out_edges = [dict() for _ in range(n)]
+        in_edges = [dict() for _ in range(n)]
+        for i, edges in enumerate(compact.out_lists()):
+            for j, weight in edges:
+                if i != j:
+                    out_edges[i][j] = weight
+                    in_edges[j][i] = weight
+        middles = {}
+        contracted = [False] * n
+        level = [0] * n  # Profundidad de la jerarquía bajo cada vértice
+        ranks = [0] * n
+
+        def shortcuts_for(v):
+            """Atajos necesarios al contraer v."""
+            needed = []
+            targets = {w: weight for w, weight in out_edges[v].items() if not contracted[w]}
+            if not targets:
+                return needed
+            max_out = max(targets.values())
+            for u, in_weight in in_edges[v].items():
+                if contracted[u]:
+                    continue
+                limit = in_weight + max_out
+                dist = cls._witness(out_edges, contracted, u, v, limit, witness_limit)
+                for w, out_weight in targets.items():
+                    if w != u and dist.get(w, math.inf) > in_weight + out_weight:
+                        needed.append((u, w, in_weight + out_weight))
+            return needed
+
+        def priority(v):
+            degree = (sum(1 for u in in_edges[v] if not contracted[u])
+                      + sum(1 for w in out_edges[v] if not contracted[w]))
+            return len(shortcuts_for(v)) - degree + level[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+            # Actualización perezosa: si la prioridad empeoró, se reinserta
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+            for u, w, weight in shortcuts_for(v):
+                if weight < out_edges[u].get(w, math.inf):
+                    out_edges[u][w] = weight
+                    in_edges[w][u] = weight
+                    middles[(u, w)] = v
+            contracted[v] = True
+            ranks[v] = rank
+            rank += 1
+            for neighbor in list(in_edges[v]) + list(out_edges[v]):
+                level[neighbor] = max(level[neighbor], level[v] + 1)
+
+        up_out = [sorted((w, weight) for w, weight in out_edges[v].items() if ranks[w] > ranks[v])
+                  for v in range(n)]
+        up_in = [sorted((u, weight) for u, weight in in_edges[v].items() if ranks[u] > ranks[v])
+                 for v in range(n)]
+        return cls(compact.ids, ranks, up_out, up_in, middles, graph.fingerprint(), drone_autonomy)
+
+    @staticmethod
+    def _witness(out_edges, contracted, source, excluded, limit, max_settled):
+        """Dijkstra acotado desde source que evita el vértice excluded."""
+        dist = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        while heap and settled < max_settled:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            for w, weight in out_edges[u].items():
+                if w == excluded or contracted[w]:
+                    continue
+                nd = d + weight
+                if nd < dist.get(w, math.inf):
+                    dist[w] = nd
+                    heapq.heappush(heap, (nd, w))
+        return dist
+
+    def _search(self, source, target):
+        """
+        Búsqueda bidireccional ascendente.
+
+        Returns:
+            tuple: (costo, vértice de encuentro, padres hacia adelante, padres hacia atrás)
+        """
+        forward = {source: 0}
+        backward = {target: 0}
+        forward_parent = {source: -1}
+        backward_parent = {target: -1}
+        forward_heap = [(0, source)]
+        backward_heap = [(0, target)]
+        best = math.inf
+        meeting = -1
+        if source == target:
+            return 0, source, forward_parent, backward_parent
+        while forward_heap or backward_heap:
+            if forward_heap and (not backward_heap or forward_heap[0][0] <= backward_heap[0][0]):
+                heap, dist, other, parent, edges = forward_heap, forward, backward, forward_parent, self.up_out
+            else:
+                heap, dist, other, parent, edges = backward_heap, backward, forward, backward_parent, self.up_in
+            d, u = heapq.heappop(heap)
+            if d >= best:
+                # Ninguna de las dos búsquedas puede mejorar el mejor costo
+                if (not forward_heap or forward_heap[0][0] >= best) and \
+                        (not backward_heap or backward_heap[0][0] >= best):
+                    break
+                continue
+            if d > dist[u]:
+                continue
+            if u in other and d + other[u] < best:
+                best = d + other[u]
+                meeting = u
+            for w, weight in edges[u]:
+                nd = d + weight
+                if nd < dist.get(w, math.inf):
+                    dist[w] = nd
+                    parent[w] = u
+                    heapq.heappush(heap, (nd, w))
+        return best, meeting, forward_parent, backward_parent
+
+    def _unpack(self, start, end, out):
+        """Expande recursivamente el atajo start -> end a aristas originales."""
+        stack = [(start, end)]
+        while stack:
+            u, w = stack.pop()
+            middle = self.middles.get((u, w))
+            if middle is None:
+                out.append(w)
+            else:
+                stack.append((middle, w))
+                stack.append((u, middle))
+
+    def query_cost(self, start, end):
+        """
+        Costo mínimo entre dos vértices (sin restricción de batería).
+
+        Args:
+            start: Vértice de origen
+            end: Vértice de destino
+
+        Returns:
+            float: Costo mínimo (inf si no hay camino)
+        """
+        if start not in self.index or end not in self.index:
+            return math.inf
+        return self._search(self.index[start], self.index[end])[0]
+
+    def batch_costs(self, pairs):
+        """
+        Costos mínimos para una lista de pares (origen, destino).
+
+        Args:
+            pairs: Iterable de tuplas (origen, destino)
+
+        Returns:
+            list: Costo mínimo de cada par
+        """
+        return [self.query_cost(start, end) for start, end in pairs]
+
+    def shortest_path(self, start, end):
+        """
+        Camino de costo mínimo con los atajos expandidos.
+
+        Args:
+            start: Vértice de origen
+            end: Vértice de destino
+
+        Returns:
+            list: Vértices del camino (vacía si no hay camino)
+        """
+        if start not in self.index or end not in self.index:
+            return []
+        source, target = self.index[start], self.index[end]
+        cost, meeting, forward_parent, backward_parent = self._search(source, target)
+        if math.isinf(cost):
+            return []
+        up = [meeting]
+        while forward_parent[up[-1]] != -1:
+            up.append(forward_parent[up[-1]])
+        up.reverse()
+        down = [meeting]
+        while backward_parent[down[-1]] != -1:
+            down.append(backward_parent[down[-1]])
+        nodes = [source]
+        hops = up + down[1:]
+        for u, w in zip(hops, hops[1:]):
+            self._unpack(u, w, nodes)
+        return [self.ids[i] for i in nodes]
+
+    def find_path(self, start, end, fallback=None):
+        """
+        Consulta con batería: expande el camino de costo mínimo y valida la
+        autonomía tramo a tramo con la regla de recarga del simulador.
+        Si el camino no es factible se repara con la búsqueda fallback (que
+        reconoce las estaciones de carga); sin ella se devuelve el tramo
+        factible como camino parcial.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            fallback: Función (start, end) -> dict con el formato de
+                find_path_with_charging
+
+        Returns:
+            dict: Mismo formato que SimulationInitializer.find_path_with_charging
+        """
+        if start not in self.index or end not in self.index:
+            return invalid_nodes_result()
+        path = self.shortest_path(start, end)
+        battery, recharges = self.autonomy, 0
+        feasible = bool(path)
+        reached = 1
+        for current, following in zip(path, path[1:]):
+            i, j = self.index[current], self.index[following]
+            new_battery, new_recharges = advance_battery(
+                battery, recharges, self.charging[i], self.charging[j],
+                self._edge_weight(i, j), self.autonomy)
+            if new_battery < 0:
+                feasible = False
+                break
+            battery, recharges = new_battery, new_recharges
+            reached += 1
+        if feasible:
+            return completed_result(path, battery)
+        if fallback is not None:
+            return fallback(start, end)
+        return failed_result(path[:reached] or [start], battery)
+
+    def _edge_weight(self, i, j):
+        weight = self.weights.get((i, j))
+        if weight is None:
+            raise KeyError(f"Arista desconocida en la jerarquía: {self.ids[i]} -> {self.ids[j]}")
+        return weight
+
+    def save(self, path):
+        """
+        Guarda la jerarquía en un archivo .npz.
+
+        Args:
+            path: Ruta del archivo
+        """
+        n = len(self.ids)
+        up_src, up_dst, up_w = self._flatten(self.up_out)
+        in_dst, in_src, in_w = self._flatten(self.up_in)
+        keys = np.array(list(self.middles.keys()), dtype=np.int64).reshape(-1, 2)
+        values = np.array(list(self.middles.values()), dtype=np.int64)
+        np.savez_compressed(
+            path,
+            format_version=np.array(FORMAT_VERSION),
+            fingerprint=np.array(self.fingerprint or ''),
+            autonomy=np.array(np.nan if self.autonomy is None else self.autonomy),
+            ids=np.array(self.ids, dtype=str).reshape(n),
+            ranks=np.array(self.ranks, dtype=np.int64),
+            up_src=up_src, up_dst=up_dst, up_w=up_w,
+            in_src=in_src, in_dst=in_dst, in_w=in_w,
+            middle_keys=keys, middle_values=values)
+
+    @staticmethod
+    def _flatten(lists):
+        src = [i for i, edges in enumerate(lists) for _ in edges]
+        dst = [j for edges in lists for j, _ in edges]
+        weights = [weight for edges in lists for _, weight in edges]
+        return np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64), np.array(weights, dtype=np.float64)
+
+    @classmethod
+    def load(cls, path, graph=None):
+        """
+        Carga una jerarquía guardada con save().
+
+        Args:
+            path: Ruta del archivo .npz
+            graph: Grafo contra el cual validar la huella (opcional)
+
+        Returns:
+            ContractionHierarchy: Jerarquía cargada
+
+        Raises:
+            ValueError: Si el formato no es compatible o el grafo cambió
+        """
+        with np.load(path) as data:
+            if int(data['format_version']) != FORMAT_VERSION:
+                raise ValueError(f"Versión de índice no soportada: {int(data['format_version'])}")
+            fingerprint = str(data['fingerprint'])
+            if graph is not None and fingerprint != graph.fingerprint():
+                raise ValueError("El índice no corresponde al grafo actual")
+            autonomy = float(data['autonomy'])
+            ids = data['ids'].tolist()
+            n = len(ids)
+            integral = bool(np.all(data['up_w'] == np.round(data['up_w']))) and \
+                bool(np.all(data['in_w'] == np.round(data['in_w'])))
+            up_out = cls._unflatten(data['up_src'], data['up_dst'], data['up_w'], n, integral)
+            up_in = cls._unflatten(data['in_dst'], data['in_src'], data['in_w'], n, integral)
+            middles = dict(zip(map(tuple, data['middle_keys'].tolist()), data['middle_values'].tolist()))
+            ranks = data['ranks'].tolist()
+        if math.isnan(autonomy):
+            autonomy = None
+        elif autonomy == int(autonomy):
+            autonomy = int(autonomy)
+        return cls(ids, ranks, up_out, up_in, middles, fingerprint, autonomy)
+
+    @staticmethod
+    def _unflatten(src, dst, weights, n, integral):
+        lists = [[] for _ in range(n)]
+        values = weights.astype(np.int64).tolist() if integral else weights.tolist()
+        for i, j, weight in zip(src.tolist(), dst.tolist(), values):
+            lists[i].append((j, weight))
+        return lists
@@ -0,0 +1,206 @@
+import heapq
+from src.sim.routing import advance_battery
+
+
+class DepotAssignment:
+    """
+    Asigna cada cliente al depósito (nodo de almacenamiento) factible más
+    cercano, en orden (recargas, costo).
+
+    Una sola búsqueda multiorigen parte de todos los depósitos a la vez con
+    etiquetas (nodo, batería, recargas, costo, depósito). Como las etiquetas
+    se extraen en orden lexicográfico, la primera que llega a un cliente
+    viene de su mejor depósito.
+
+    La tabla se mantiene de forma incremental: un cambio que empeora el grafo
+    (arista eliminada, peso mayor, vértice deshabilitado) solo obliga a
+    recalcular los clientes cuya ruta asignada lo usa; un cambio que puede
+    mejorar rutas obliga a recalcular todo. En ambos casos el recálculo se
+    hace al consultar la tabla.
+    """
+
+    def __init__(self, graph, depots, clients, charging_nodes, drone_autonomy):
+        """
+        Inicializa la asignación (se calcula con build()).
+
+        Args:
+            graph: Grafo de la red
+            depots: Nodos de almacenamiento
+            clients: Nodos cliente
+            charging_nodes: Estaciones de carga
+            drone_autonomy: Autonomía máxima del dron
+        """
+        self.graph = graph
+        self.depots = list(depots)
+        self.clients = list(clients)
+        self.charging = set(charging_nodes)
+        self.autonomy = drone_autonomy
+        self._assignments = {}  # Cliente -> {'depot', 'cost', 'recharges', 'path'} (None si no hay ruta)
+        self._users = {}  # Nodo -> clientes cuya ruta asignada pasa por él
+        self._stale = set()  # Clientes pendientes de recalcular
+        self._rebuild = False  # Recalcular todos los clientes
+
+    def build(self):
+        """
+        Calcula la asignación de todos los clientes y se suscribe a los
+        cambios del grafo.
+
+        Returns:
+            DepotAssignment: La propia asignación
+        """
+        self._assignments.clear()
+        self._users.clear()
+        self._stale.clear()
+        self._rebuild = False
+        self._assign(self.clients)
+        self.graph.unsubscribe(self._on_graph_change)
+        self.graph.subscribe(self._on_graph_change)
+        return self
+
+    def depot_for(self, client):
+        """
+        Depósito asignado a un cliente (consulta O(1)).
+
+        Args:
+            client: Nodo cliente
+
+        Returns:
+            str: Depósito más cercano factible, o None si ninguno alcanza al cliente
+        """
+        assignment = self.assignment(client)
+        return assignment['depot'] if assignment else None
+
+    def assignment(self, client):
+        """
+        Asignación completa de un cliente.
+
+        Args:
+            client: Nodo cliente
+
+        Returns:
+            dict: {'depot', 'cost', 'recharges', 'path'} o None si no hay ruta factible
+        """
+        self._refresh()
+        return self._assignments.get(client)
+
+    def clients_of(self, depot):
+        """Clientes asignados a un depósito (su región de la partición)."""
+        self._refresh()
+        return [client for client, assignment in self._assignments.items()
+                if assignment and assignment['depot'] == depot]
+
+    def table(self):
+        """
+        Tabla de asignación para todos los clientes.
+
+        Returns:
+            list: Dicts con 'client', 'depot', 'cost' y 'recharges' (None si no hay ruta)
+        """
+        self._refresh()
+        rows = []
+        for client in self.clients:
+            assignment = self._assignments.get(client)
+            rows.append({'client': client,
+                         'depot': assignment['depot'] if assignment else None,
+                         'cost': assignment['cost'] if assignment else None,
+                         'recharges': assignment['recharges'] if assignment else None})
+        return rows
+
+    def _refresh(self):
+        if self._rebuild:
+            self._rebuild = False
+            self._stale.clear()
+            self._users.clear()
+            self._assign(self.clients)
+        elif self._stale:
+            stale, self._stale = self._stale, set()
+            for client in stale:
+                self._forget(client)
+            self._assign(stale)
+
+    def _forget(self, client):
+        assignment = self._assignments.pop(client, None)
+        if assignment:
+            for node in assignment['path']:
+                users = self._users.get(node)
+                if users:
+                    users.discard(client)
+
+    def _assign(self, clients):
+        """
+        Búsqueda multiorigen desde todos los depósitos hasta asignar los
+        clientes indicados (o agotar la búsqueda).
+
+        Args:
+            clients: Clientes a asignar
+        """
+        graph = self.graph
+        charging = self.charging
+        autonomy = self.autonomy
+        pending = {client for client in clients if graph.has_vertex(client) and not graph.is_disabled(client)}
+        for client in clients:
+            self._assignments[client] = None
+
+        # Etiquetas: (nodo, batería, recargas, costo, padre)
+        labels = []
+        heap = []
+        for depot in self.depots:
+            if graph.has_vertex(depot) and not graph.is_disabled(depot):
+                labels.append((depot, autonomy, 0, 0, -1))
+                heap.append((0, 0, len(labels) - 1))
+        heapq.heapify(heap)
+        settled = {}  # Nodo -> [(batería, recargas, costo)] extraídas de la cola
+
+        while heap and pending:
+            recharges, cost, label = heapq.heappop(heap)
+            node, battery, _, _, _ = labels[label]
+            known = settled.setdefault(node, [])
+            if any(b >= battery and r <= recharges and c <= cost for b, r, c in known):
+                continue
+            known.append((battery, recharges, cost))
+            if node in pending:
+                pending.discard(node)
+                self._record(node, labels, label)
+
+            from_charging = node in charging
+            for neighbor in graph.adjacency_list.get(node, ()):
+                if graph.is_disabled(neighbor):
+                    continue
+                weight = graph.edge_weights[(node, neighbor)]
+                new_battery, new_recharges = advance_battery(
+                    battery, recharges, from_charging, neighbor in charging, weight, autonomy)
+                if new_battery < 0:
+                    continue
+                labels.append((neighbor, new_battery, new_recharges, cost + weight, label))
+                heapq.heappush(heap, (new_recharges, cost + weight, len(labels) - 1))
+
+    def _record(self, client, labels, label):
+        _, _, recharges, cost, _ = labels[label]
+        path = []
+        while label != -1:
+            node, _, _, _, label = labels[label]
+            path.append(node)
+        path.reverse()
+        self._assignments[client] = {'depot': path[0], 'cost': cost, 'recharges': recharges, 'path': path}
+        for node in path:
+            self._users.setdefault(node, set()).add(client)
+
+    def _on_graph_change(self, change):
+        """
+        Marca para recálculo los clientes afectados por un cambio del grafo.
+
+        Args:
+            change: GraphChange publicado por el grafo
+        """
+        if change.improves():
+            self._rebuild = True
+            return
+        users = self._users.get(change.start, ())
+        if change.is_edge_change():
+            users = [client for client in users
+                     if self._uses_edge(self._assignments[client]['path'], change.start, change.end)]
+        self._stale.update(users)
+
+    @staticmethod
+    def _uses_edge(path, start, end):
+        return any(a == start and b == end for a, b in zip(path, path[1:]))
@@ -0,0 +1,332 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+
+# Tipos de evento
+EVENT_RESET = 0  # Nueva generación de órdenes: se descartan rutas y órdenes anteriores
+EVENT_ORDER_CREATED = 1
+EVENT_ROUTE_USED = 2  # Incremento de frecuencia (el primer uso crea la ruta)
+EVENT_ROUTE_ASSIGNED = 3
+EVENT_DELIVERY_COMPLETED = 4
+
+EVENT_NAMES = {
+    EVENT_RESET: 'reset',
+    EVENT_ORDER_CREATED: 'order_created',
+    EVENT_ROUTE_USED: 'route_used',
+    EVENT_ROUTE_ASSIGNED: 'route_assigned',
+    EVENT_DELIVERY_COMPLETED: 'delivery_completed',
+}
+
+MAGIC = b'SDEVLOG1'
+
+# Encabezado: firma, tamaño de registro y paso del índice
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('record_size', '<u4'), ('index_stride', '<u4')])
+
+# Registro de tamaño fijo (48 bytes). Los textos van como números de símbolo (-1 = vacío)
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('kind', 'u1'),
+    ('reserved', 'u1', (3,)),
+    ('order', '<i4'),
+    ('route', '<i4'),
+    ('origin', '<i4'),
+    ('destination', '<i4'),
+    ('client', '<i4'),
+    ('name', '<i4'),
+    ('priority', '<i4'),
+    ('value', '<f8'),
+])
+
+# Entrada del índice: número de registro y su marca de tiempo
+INDEX_DTYPE = np.dtype([('record', '<u8'), ('time', '<f8')])
+
+# Registros entre dos entradas del índice
+INDEX_STRIDE = 4096
+
+# Campos de texto de un registro (se guardan como símbolos)
+SYMBOL_FIELDS = ('order', 'route', 'origin', 'destination', 'client', 'name', 'priority')
+
+# Separador de nodos en el símbolo de una ruta
+ROUTE_SEPARATOR = '\t'
+
+
+class EventLog:
+    """
+    Bitácora binaria de solo agregado con los eventos de la simulación:
+    creación de órdenes, usos de rutas (frecuencias), asignación de rutas y
+    entregas completadas.
+
+    Se compone de tres archivos:
+        - <ruta>: encabezado y registros de tamaño fijo (RECORD_DTYPE), de
+          modo que el registro n está en un offset calculable y un rango se
+          lee de una sola vez con NumPy.
+        - <ruta>.sym: tabla de símbolos, un texto JSON por línea (IDs de
+          órdenes, nodos, clientes y secuencias de nodos de las rutas). Cada
+          texto se escribe una sola vez y los registros lo referencian por
+          número de línea.
+        - <ruta>.idx: índice disperso (número de registro, marca de tiempo)
+          cada index_stride registros, para ubicar el offset de un instante.
+
+    Los registros se acumulan en memoria y se escriben en lotes; los símbolos
+    de un lote se escriben antes que sus registros, así que tras una caída
+    todo registro completo en disco tiene sus símbolos. Al reabrir se
+    descartan el registro o la línea de símbolo truncados.
+    """
+
+    def __init__(self, path, index_stride=INDEX_STRIDE, buffer_size=1024, sync=False):
+        """
+        Abre (o crea) una bitácora para agregar eventos.
+
+        Args:
+            path: Archivo de registros (los auxiliares usan el mismo nombre con .sym e .idx)
+            index_stride: Registros entre entradas del índice (solo al crear la bitácora)
+            buffer_size: Eventos acumulados antes de escribir un lote
+            sync: Forzar os.fsync en cada escritura de lote
+
+        Raises:
+            ValueError: Si el archivo existe y no es una bitácora compatible
+        """
+        self.path = path
+        self.symbols_path = path + '.sym'
+        self.index_path = path + '.idx'
+        self.sync = sync
+        self._lock = threading.Lock()  # Streamlit ejecuta cada sesión en su propio hilo
+        self.buffer_size = buffer_size
+        self._buffer = []  # Registros pendientes como tuplas (mismo orden que RECORD_DTYPE)
+        self._pending_symbols = []
+        self._symbols = []  # Número de símbolo -> texto
+        self._symbol_codes = {}  # Texto -> número de símbolo
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_DTYPE.itemsize
+        self._records = open(path, 'r+b' if exists else 'w+b')
+        if exists:
+            header = np.frombuffer(self._records.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)[0]
+            if header['magic'] != MAGIC or header['record_size'] != RECORD_DTYPE.itemsize:
+                self._records.close()
+                raise ValueError(f"{path} no es una bitácora de eventos compatible")
+            self.index_stride = int(header['index_stride'])
+        else:
+            self.index_stride = index_stride
+            header = np.array([(MAGIC, RECORD_DTYPE.itemsize, index_stride)], dtype=HEADER_DTYPE)
+            self._records.write(header.tobytes())
+
+        # Descartar un registro incompleto al final (escritura interrumpida)
+        size = os.path.getsize(path) if exists else HEADER_DTYPE.itemsize
+        self._count = (size - HEADER_DTYPE.itemsize) // RECORD_DTYPE.itemsize
+        self._records.truncate(self._offset(self._count))
+        self._records.seek(0, os.SEEK_END)
+
+        self._load_symbols()
+        index = np.fromfile(self.index_path, dtype=INDEX_DTYPE) if os.path.exists(self.index_path) else None
+        self._index = index[index['record'] < self._count] if index is not None else np.zeros(0, INDEX_DTYPE)
+        with open(self.index_path, 'wb') as handle:
+            self._index.tofile(handle)
+
+    @staticmethod
+    def _offset(record):
+        return HEADER_DTYPE.itemsize + record * RECORD_DTYPE.itemsize
+
+    def _load_symbols(self):
+        """Lee la tabla de símbolos descartando una última línea incompleta."""
+        if os.path.exists(self.symbols_path):
+            with open(self.symbols_path, 'rb') as handle:
+                data = handle.read()
+            complete = data.rfind(b'\n') + 1
+            for line in data[:complete].splitlines():
+                value = json.loads(line)
+                self._symbol_codes[value] = len(self._symbols)
+                self._symbols.append(value)
+            if complete != len(data):
+                with open(self.symbols_path, 'r+b') as handle:
+                    handle.truncate(complete)
+        self._symbol_file = open(self.symbols_path, 'ab')
+
+    def _symbol(self, value):
+        """Número de símbolo de un texto (lo registra si es nuevo); -1 para None."""
+        if value is None:
+            return -1
+        value = str(value)
+        code = self._symbol_codes.get(value)
+        if code is None:
+            code = len(self._symbols)
+            self._symbols.append(value)
+            self._symbol_codes[value] = code
+            self._pending_symbols.append(value)
+        return code
+
+    def symbol(self, code):
+        """
+        Texto de un número de símbolo.
+
+        Args:
+            code: Número de símbolo
+
+        Returns:
+            str: Texto o None si el código es -1
+        """
+        return self._symbols[code] if code >= 0 else None
+
+    def append(self, kind, timestamp=None, value=np.nan, **fields):
+        """
+        Agrega un evento.
+
+        Args:
+            kind: Tipo de evento (EVENT_*)
+            timestamp: Segundos epoch (None = ahora)
+            value: Valor numérico asociado (p. ej. el costo de la ruta)
+            **fields: Campos de texto (ver SYMBOL_FIELDS)
+
+        Returns:
+            int: Número de registro del evento
+        """
+        symbol = self._symbol
+        with self._lock:
+            self._buffer.append((time.time() if timestamp is None else timestamp, kind, (0, 0, 0),
+                                 *[symbol(fields.get(name)) for name in SYMBOL_FIELDS], value))
+            number = self._count + len(self._buffer) - 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+        return number
+
+    @staticmethod
+    def route_symbol(nodes):
+        """Texto con el que se guarda una secuencia de nodos."""
+        return ROUTE_SEPARATOR.join(nodes)
+
+    def reset(self):
+        """Registra el inicio de una nueva generación de órdenes."""
+        return self.append(EVENT_RESET)
+
+    def order_created(self, order):
+        """
+        Registra la creación de una orden.
+
+        Args:
+            order: Orden creada
+        """
+        return self.append(EVENT_ORDER_CREATED, order=order.order_id, origin=order.origin,
+                           destination=order.destination, client=order.client_id,
+                           name=order.client_name, priority=order.priority)
+
+    def route_used(self, route):
+        """
+        Registra un uso (incremento de frecuencia) de una ruta.
+
+        Args:
+            route: Ruta usada
+        """
+        return self.append(EVENT_ROUTE_USED, route=self.route_symbol(route.nodes))
+
+    def route_assigned(self, order, route, cost=np.nan):
+        """
+        Registra la asignación de una ruta a una orden.
+
+        Args:
+            order: Orden
+            route: Ruta asignada
+            cost: Costo de la ruta
+        """
+        return self.append(EVENT_ROUTE_ASSIGNED, value=cost, order=order.order_id,
+                           route=self.route_symbol(route.nodes))
+
+    def delivery_completed(self, order):
+        """
+        Registra una entrega completada.
+
+        Args:
+            order: Orden entregada
+        """
+        return self.append(EVENT_DELIVERY_COMPLETED, order=order.order_id, destination=order.destination)
+
+    def flush(self):
+        """Escribe en disco los símbolos, registros y entradas de índice pendientes."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending_symbols:
+            self._symbol_file.write(''.join(json.dumps(value) + '\n' for value in self._pending_symbols)
+                                    .encode('utf-8'))
+            self._symbol_file.flush()
+            if self.sync:
+                os.fsync(self._symbol_file.fileno())
+            self._pending_symbols.clear()
+        if not self._buffer:
+            return
+        batch = np.array(self._buffer, dtype=RECORD_DTYPE)
+        self._records.write(batch.tobytes())
+        self._records.flush()
+        if self.sync:
+            os.fsync(self._records.fileno())
+
+        first, last = self._count, self._count + len(batch)
+        stride = self.index_stride
+        marks = np.arange(-(-first // stride) * stride, last, stride)
+        if len(marks):
+            entries = np.zeros(len(marks), dtype=INDEX_DTYPE)
+            entries['record'] = marks
+            entries['time'] = batch['time'][marks - first]
+            with open(self.index_path, 'ab') as handle:
+                entries.tofile(handle)
+            self._index = np.concatenate((self._index, entries))
+        self._count = last
+        self._buffer.clear()
+
+    def __len__(self):
+        return self._count + len(self._buffer)
+
+    def read(self, start=0, stop=None):
+        """
+        Lee un rango de registros como arreglo estructurado (RECORD_DTYPE).
+
+        Args:
+            start: Primer registro
+            stop: Registro final exclusivo (None = hasta el último)
+
+        Returns:
+            numpy.ndarray: Registros del rango
+        """
+        self.flush()
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        with open(self.path, 'rb') as handle:
+            handle.seek(self._offset(start))
+            return np.fromfile(handle, dtype=RECORD_DTYPE, count=stop - start)
+
+    def offset_at(self, timestamp):
+        """
+        Primer registro con marca de tiempo mayor o igual a un instante,
+        usando el índice para leer un solo tramo de la bitácora.
+
+        Args:
+            timestamp: Segundos epoch
+
+        Returns:
+            int: Número de registro (len(self) si no hay eventos posteriores)
+        """
+        self.flush()
+        position = int(np.searchsorted(self._index['time'], timestamp, side='left'))
+        start = int(self._index['record'][position - 1]) if position > 0 else 0
+        stop = (int(self._index['record'][position]) if position < len(self._index) else self._count)
+        times = self.read(start, stop)['time']
+        return start + int(np.searchsorted(times, timestamp, side='left'))
+
+    def close(self):
+        """Escribe lo pendiente y cierra los archivos."""
+        with self._lock:
+            if self._records.closed:
+                return
+            self._flush_locked()
+            self._records.close()
+            self._symbol_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,129 @@
+import datetime
+from src.domain.Client import Client
+from src.domain.Order import Order
+from src.domain.OrderTable import OrderTable
+from src.sim.EventLog import (EVENT_RESET, EVENT_ORDER_CREATED, EVENT_ROUTE_USED, EVENT_ROUTE_ASSIGNED,
+                              EVENT_DELIVERY_COMPLETED, ROUTE_SEPARATOR)
+from src.tda.AVL import AVL
+
+
+class EventReplay:
+    """
+    Reconstruye el estado de una simulación a partir de un EventLog: rutas y
+    frecuencias del RouteRegistry (y el índice de rutas), la tabla de
+    órdenes, las listas de órdenes de cada cliente y el AVL de rutas.
+
+    La reproducción puede empezar en cualquier registro y se aplica sobre el
+    estado que ya tenga la simulación, p. ej. un snapshot guardado en ese
+    punto de la bitácora (ver SimulationInitializer.replay_events). Los
+    registros se leen por bloques con NumPy y cada texto (ruta, orden,
+    cliente) se decodifica una sola vez.
+    """
+
+    def __init__(self, log, chunk_size=65_536):
+        """
+        Inicializa el reproductor.
+
+        Args:
+            log: EventLog a reproducir
+            chunk_size: Registros leídos por bloque
+        """
+        self.log = log
+        self.chunk_size = chunk_size
+
+    def replay(self, simulation, start=0, stop=None):
+        """
+        Aplica los eventos de un rango de la bitácora sobre una simulación.
+
+        Args:
+            simulation: SimulationInitializer destino
+            start: Primer registro a aplicar
+            stop: Registro final exclusivo (None = hasta el último)
+
+        Returns:
+            dict: 'records' (eventos aplicados), 'offset' (registro siguiente,
+                para continuar desde ahí), 'skipped' (eventos sobre órdenes o
+                rutas ausentes) y 'avl' (AVL con las rutas registradas)
+        """
+        log = self.log
+        symbol = log.symbol
+        registry = simulation.route_registry
+        clients = {client.client_id: client for client in simulation.clients}
+        nodes_of = {}  # Símbolo de ruta -> tupla de nodos
+        orders = None  # ID de orden -> Order (se arma al primer uso)
+        applied = skipped = 0
+        stop = len(log) if stop is None else min(stop, len(log))
+
+        def route_nodes(code):
+            nodes = nodes_of.get(code)
+            if nodes is None:
+                nodes = nodes_of[code] = tuple(symbol(code).split(ROUTE_SEPARATOR))
+            return nodes
+
+        def existing_orders():
+            table = simulation.order_table
+            return {table.get_order_id(row): Order.from_row(table, row) for row in range(len(table))}
+
+        for first in range(start, stop, self.chunk_size):
+            chunk = log.read(first, min(first + self.chunk_size, stop))
+            for kind, timestamp, order_code, route_code, origin, destination, client_id, name, priority, value in zip(
+                    chunk['kind'].tolist(), chunk['time'].tolist(), chunk['order'].tolist(),
+                    chunk['route'].tolist(), chunk['origin'].tolist(), chunk['destination'].tolist(),
+                    chunk['client'].tolist(), chunk['name'].tolist(), chunk['priority'].tolist(),
+                    chunk['value'].tolist()):
+                applied += 1
+                if kind == EVENT_ROUTE_USED:
+                    route = registry.record_use(route_nodes(route_code))
+                    if simulation.graph is not None and route not in simulation.route_index:
+                        simulation.route_index.add(route, simulation.graph)
+                    continue
+
+                if orders is None:
+                    orders = existing_orders()
+
+                if kind == EVENT_ORDER_CREATED:
+                    order_id, destination = symbol(order_code), symbol(destination)
+                    client = clients.get(symbol(client_id))
+                    if client is None:
+                        client = Client(symbol(client_id), symbol(name), symbol(priority))
+                        client.node_id = destination
+                        clients[client.client_id] = client
+                        simulation.clients.append(client)
+                    order = Order(order_id=order_id, origin=symbol(origin), destination=destination,
+                                  client_id=client.client_id, client_name=symbol(name),
+                                  priority=symbol(priority), table=simulation.order_table)
+                    simulation.order_table.set_date('created', order.row, datetime.datetime.fromtimestamp(timestamp))
+                    orders[order_id] = order
+                    simulation.orders.append(order)
+                    client.add_order(order)
+                elif kind == EVENT_ROUTE_ASSIGNED:
+                    order = orders.get(symbol(order_code))
+                    route = registry.get(route_nodes(route_code))
+                    if order is None or route is None:
+                        skipped += 1
+                        continue
+                    order.assign_route(route)
+                    if value == value:  # NaN = costo no registrado
+                        order.route_cost = value
+                elif kind == EVENT_DELIVERY_COMPLETED:
+                    order = orders.get(symbol(order_code))
+                    if order is None:
+                        skipped += 1
+                        continue
+                    table = order.table
+                    order.status = "Completada"
+                    table.set_date('delivered', order.row, datetime.datetime.fromtimestamp(timestamp))
+                    table.set_delivered_to(order.row, symbol(destination))
+                elif kind == EVENT_RESET:
+                    registry.clear()
+                    simulation.route_index.clear()
+                    simulation.order_table = OrderTable()
+                    simulation.orders = []
+                    for client in simulation.clients:
+                        client.orders = []
+                    orders = {}
+
+        avl = AVL()
+        for route in registry.routes():
+            avl.insert(route)
+        return {'records': applied, 'offset': max(start, stop), 'skipped': skipped, 'avl': avl}
@@ -0,0 +1,230 @@
+import json
+import os
+import numpy as np
+
+UNREACHABLE_RECHARGES = np.iinfo(np.uint16).max
+FORMAT_VERSION = 1
+
+
+def min_plus(left, right, chunk_elements=1 << 24, with_argmin=False):
+    """
+    Producto min-plus de dos matrices: out[i, j] = min_k left[i, k] + right[k, j].
+    Se procesa por bloques de filas para acotar la memoria intermedia.
+
+    Args:
+        left: Matriz (n, k)
+        right: Matriz (k, m)
+        chunk_elements: Máximo de elementos del arreglo intermedio por bloque
+        with_argmin: Retornar también el k que alcanza el mínimo
+
+    Returns:
+        numpy.ndarray o tuple: Matriz (n, m) y, si se pide, los índices k
+    """
+    n, k = left.shape
+    m = right.shape[1]
+    out = np.full((n, m), np.inf)
+    arg = np.zeros((n, m), dtype=np.int64) if with_argmin else None
+    if k == 0:
+        return (out, arg) if with_argmin else out
+    rows = max(1, chunk_elements // max(1, k * m))
+    for i in range(0, n, rows):
+        block = left[i:i + rows, :, None] + right[None, :, :]
+        if with_argmin:
+            arg[i:i + rows] = block.argmin(axis=1)
+            out[i:i + rows] = np.take_along_axis(block, arg[i:i + rows, None, :], axis=1)[:, 0, :]
+        else:
+            out[i:i + rows] = block.min(axis=1)
+    return (out, arg) if with_argmin else out
+
+
+def floyd_warshall(dist):
+    """Floyd–Warshall vectorizado en el lugar (una pasada NumPy por vértice intermedio)."""
+    for k in range(dist.shape[0]):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
+
+
+class FeasibilityMatrix:
+    """
+    Matrices de todos los pares con el costo, las recargas y la batería final
+    de la mejor ruta factible (menos recargas y luego menor costo).
+
+    Como la batería se restablece en cada estación de carga, una ruta es una
+    secuencia de tramos entre estaciones. Dentro de un tramo los nodos
+    intermedios no son de carga y todo su costo es consumo de batería, así
+    que el tramo de menor costo es también el de menor consumo: basta un
+    Floyd–Warshall sobre los nodos que no son de carga, filtrado por la
+    autonomía. Los tramos se combinan con productos min-plus y un segundo
+    Floyd–Warshall sobre las estaciones con la clave lexicográfica
+    recargas * BIG + costo.
+
+    Las matrices (float32 para costo y batería, uint16 para recargas) se
+    guardan como .npy y se pueden abrir con memoria mapeada, de modo que
+    varios procesos las compartan sin copiarlas.
+    """
+
+    def __init__(self, ids, cost, recharges, battery, fingerprint=None, autonomy=None):
+        """
+        Inicializa la matriz a partir de sus arreglos (usar build() o load()).
+
+        Args:
+            ids: Lista de vértices (índice -> ID)
+            cost: Matriz float32 de costos (inf si no hay ruta)
+            recharges: Matriz uint16 de recargas (UNREACHABLE_RECHARGES si no hay ruta)
+            battery: Matriz float32 de batería al llegar (nan si no hay ruta)
+            fingerprint: Huella del grafo de origen
+            autonomy: Autonomía del dron usada en el cálculo
+        """
+        self.ids = list(ids)
+        self.index = {vertex: i for i, vertex in enumerate(self.ids)}
+        self.cost = cost
+        self.recharges = recharges
+        self.battery = battery
+        self.fingerprint = fingerprint
+        self.autonomy = autonomy
+
+    @classmethod
+    def build(cls, graph, drone_autonomy):
+        """
+        Calcula las matrices para todos los pares del grafo.
+
+        Args:
+            graph: Grafo de la red (se usa su instantánea compacta)
+            drone_autonomy: Autonomía máxima del dron
+
+        Returns:
+            FeasibilityMatrix: Matrices calculadas
+        """
+        compact = graph.compact()
+        n = compact.num_vertices
+        autonomy = float(drone_autonomy)
+        weights = np.full((n, n), np.inf)
+        tails = np.repeat(np.arange(n), np.diff(compact.indptr))
+        np.minimum.at(weights, (tails, compact.indices), compact.weights)
+
+        is_charging = compact.is_charging
+        stations = np.flatnonzero(is_charging)
+        others = np.flatnonzero(~is_charging)
+
+        # Tramos interiores: menor costo (= consumo) entre nodos que no son de carga
+        interior = weights[np.ix_(others, others)].copy()
+        np.fill_diagonal(interior, 0.0)
+        floyd_warshall(interior)
+        interior[interior > autonomy] = np.inf
+
+        # Clave lexicográfica: una recarga pesa más que cualquier costo posible
+        finite = compact.weights[np.isfinite(compact.weights)]
+        big = (len(stations) + 2) * (float(finite.sum()) + 1.0)
+
+        station_to_other = weights[np.ix_(stations, others)]
+        other_to_station = weights[np.ix_(others, stations)]
+        # Estación -> nodo sin carga: la arista de salida no consume batería
+        exit_cost, exit_via = min_plus(station_to_other, interior, with_argmin=True)
+        # Nodo sin carga -> estación: llegar desde un nodo sin carga cuenta una recarga
+        entry_cost = min_plus(interior, other_to_station)
+        # Estación -> estación: arista directa (sin recarga) o tramo interior (una recarga)
+        hop = np.minimum(weights[np.ix_(stations, stations)], big + min_plus(exit_cost, other_to_station))
+        np.fill_diagonal(hop, 0.0)
+        floyd_warshall(hop)
+
+        # Matrices de inicio (n x estaciones) y fin (estaciones x n) por posición
+        start = np.full((n, len(stations)), np.inf)
+        start[others] = big + entry_cost
+        start[stations, np.arange(len(stations))] = 0.0
+        end = np.full((len(stations), n), np.inf)
+        end[:, others] = exit_cost
+        end[np.arange(len(stations)), stations] = 0.0
+        end_battery = np.full((len(stations), n), autonomy)
+        if len(others):
+            spent = interior[exit_via, np.arange(len(others))[None, :]]
+            end_battery[:, others] = autonomy - spent
+
+        through, last = min_plus(min_plus(start, hop), end, with_argmin=True)
+        battery = end_battery[last, np.arange(n)[None, :]] if len(stations) else np.full((n, n), np.nan)
+
+        # Rutas directas sin pasar por estaciones
+        direct = np.full((n, n), np.inf)
+        direct[np.ix_(others, others)] = interior
+        use_direct = direct <= through
+        keys = np.where(use_direct, direct, through)
+        battery = np.where(use_direct, autonomy - direct, battery)
+        np.fill_diagonal(keys, 0.0)
+        np.fill_diagonal(battery, autonomy)
+
+        reachable = np.isfinite(keys)
+        recharges = np.where(reachable, np.floor(keys / big), UNREACHABLE_RECHARGES)
+        cost = np.where(reachable, keys - recharges * big, np.inf)
+        battery = np.where(reachable, battery, np.nan)
+        return cls(compact.ids, cost.astype(np.float32), recharges.astype(np.uint16),
+                   battery.astype(np.float32), graph.fingerprint(), drone_autonomy)
+
+    def lookup(self, origin, destination):
+        """
+        Consulta O(1) de la mejor ruta factible entre dos nodos.
+
+        Args:
+            origin: Nodo de origen
+            destination: Nodo de destino
+
+        Returns:
+            dict: {'feasible', 'cost', 'recharges', 'battery_left'}; sin ruta
+                factible cost es inf y recharges/battery_left son None
+        """
+        i = self.index.get(origin)
+        j = self.index.get(destination)
+        if i is None or j is None or self.recharges[i, j] == UNREACHABLE_RECHARGES:
+            return {'feasible': False, 'cost': float('inf'), 'recharges': None, 'battery_left': None}
+        return {'feasible': True, 'cost': float(self.cost[i, j]), 'recharges': int(self.recharges[i, j]),
+                'battery_left': float(self.battery[i, j])}
+
+    def is_feasible(self, origin, destination):
+        """Indica si existe una ruta factible entre dos nodos."""
+        i = self.index.get(origin)
+        j = self.index.get(destination)
+        return i is not None and j is not None and self.recharges[i, j] != UNREACHABLE_RECHARGES
+
+    def is_stale(self, graph):
+        """Indica si la matriz se calculó para otra versión del grafo."""
+        return self.fingerprint != graph.fingerprint()
+
+    def save(self, directory):
+        """
+        Guarda las matrices como archivos .npy en un directorio.
+
+        Args:
+            directory: Directorio de destino (se crea si no existe)
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'cost.npy'), self.cost)
+        np.save(os.path.join(directory, 'recharges.npy'), self.recharges)
+        np.save(os.path.join(directory, 'battery.npy'), self.battery)
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'format_version': FORMAT_VERSION, 'ids': self.ids,
+                       'fingerprint': self.fingerprint, 'autonomy': self.autonomy}, f)
+
+    @classmethod
+    def load(cls, directory, graph=None, mmap=True):
+        """
+        Carga matrices guardadas con save().
+
+        Args:
+            directory: Directorio con los archivos
+            graph: Grafo contra el cual validar la huella (opcional)
+            mmap: Abrir las matrices con memoria mapeada de solo lectura
+
+        Returns:
+            FeasibilityMatrix: Matrices cargadas
+
+        Raises:
+            ValueError: Si el formato no es compatible o el grafo cambió
+        """
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Versión de matriz no soportada: {meta.get('format_version')}")
+        if graph is not None and meta['fingerprint'] != graph.fingerprint():
+            raise ValueError("La matriz no corresponde al grafo actual")
+        mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(directory, name), mmap_mode=mode)
+                  for name in ('cost.npy', 'recharges.npy', 'battery.npy')]
+        return cls(meta['ids'], *arrays, fingerprint=meta['fingerprint'], autonomy=meta['autonomy'])
@@ -0,0 +1,182 @@
+import bisect
+import heapq
+import itertools
+from collections import deque
+from src.model.NodeRegistry import role_of, ROLE_CHARGING
+
+# Límites superiores (ms) de los intervalos del histograma de latencias; el último es abierto
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Origen del resultado de una consulta
+CACHE_MEMORY = 'memory'  # path_cache en memoria
+CACHE_STORE = 'store'  # Caché persistente (RouteCacheStore)
+CACHE_MISS = 'miss'  # Búsqueda ejecutada
+
+# Contadores agregados por método
+_COUNTERS = ('calls', 'memory_hits', 'store_hits', 'misses', 'completed', 'failed', 'states',
+             'recharges_considered', 'path_recharges', 'seconds', 'search_seconds')
+
+
+def path_recharges(path):
+    """Recargas de una ruta: llegadas a una estación de carga desde otro tipo de nodo."""
+    charging = [role_of(node) == ROLE_CHARGING for node in path]
+    return sum(1 for i in range(1, len(charging)) if charging[i] and not charging[i - 1])
+
+
+class Instrumentation:
+    """
+    Contadores e histogramas de las consultas de find_path_with_charging.
+
+    Se activa y desactiva en tiempo de ejecución; desactivada, el simulador
+    solo consulta el atributo enabled. Por cada consulta guarda un registro
+    (origen, destino, método, acierto de caché, tiempo, estados generados,
+    pico de la cola, recargas consideradas y recargas de la ruta) en una
+    ventana de las últimas consultas, acumula contadores e histogramas de
+    latencia por método y conserva las consultas más lentas para detectar
+    pares origen-destino patológicos. Los contadores de la búsqueda
+    (estados, cola, recargas consideradas) los informan los métodos 'bfs' y
+    'bidirectional'; el resto informa tiempo y caché.
+    """
+
+    def __init__(self, enabled=False, window=1000, slowest=20, buckets_ms=LATENCY_BUCKETS_MS):
+        """
+        Inicializa la instrumentación.
+
+        Args:
+            enabled: Si empieza activada
+            window: Cantidad de consultas recientes que se conservan
+            slowest: Cantidad de consultas más lentas que se conservan
+            buckets_ms: Límites superiores de los intervalos del histograma (ms)
+        """
+        self.enabled = enabled
+        self.buckets_ms = tuple(buckets_ms)
+        self._window = window
+        self._slowest_size = slowest
+        self.reset()
+
+    def enable(self):
+        """Activa la instrumentación."""
+        self.enabled = True
+
+    def disable(self):
+        """Desactiva la instrumentación (los datos acumulados se conservan)."""
+        self.enabled = False
+
+    def reset(self):
+        """Descarta todas las consultas y contadores acumulados."""
+        self._calls = deque(maxlen=self._window)
+        self._slowest = []  # Min-heap (segundos, secuencia, registro)
+        self._sequence = itertools.count()
+        self._methods = {}  # Método -> contadores
+        self._histograms = {}  # Método -> conteos por intervalo
+        self._queue_peak = {}  # Método -> mayor pico de cola observado
+
+    def record(self, method, start, end, seconds, result, stats):
+        """
+        Registra una consulta.
+
+        Args:
+            method: Método de búsqueda
+            start: Nodo de origen
+            end: Nodo de destino
+            seconds: Duración total de la consulta
+            result: Resultado de find_path_with_charging
+            stats: Dict con 'cache' y, si hubo búsqueda, 'search_seconds' y
+                los contadores que informe el método ('states', 'queue_peak',
+                'recharges_considered')
+        """
+        cache = stats.get('cache', CACHE_MISS)
+        path = result.get('path') or []
+        call = {
+            'start': start,
+            'end': end,
+            'method': method,
+            'cache': cache,
+            'ms': seconds * 1000,
+            'search_ms': stats.get('search_seconds', 0.0) * 1000,
+            'completed': bool(result.get('completed')),
+            'hops': max(len(path) - 1, 0),
+            'path_recharges': path_recharges(path),
+            'states': stats.get('states'),
+            'queue_peak': stats.get('queue_peak'),
+            'recharges_considered': stats.get('recharges_considered'),
+        }
+        self._calls.append(call)
+
+        counters = self._methods.get(method)
+        if counters is None:
+            counters = self._methods[method] = dict.fromkeys(_COUNTERS, 0)
+            self._histograms[method] = [0] * (len(self.buckets_ms) + 1)
+            self._queue_peak[method] = 0
+        counters['calls'] += 1
+        counters['memory_hits' if cache == CACHE_MEMORY else 'store_hits' if cache == CACHE_STORE else 'misses'] += 1
+        counters['completed' if call['completed'] else 'failed'] += 1
+        counters['states'] += call['states'] or 0
+        counters['recharges_considered'] += call['recharges_considered'] or 0
+        counters['path_recharges'] += call['path_recharges']
+        counters['seconds'] += seconds
+        counters['search_seconds'] += stats.get('search_seconds', 0.0)
+        self._queue_peak[method] = max(self._queue_peak[method], call['queue_peak'] or 0)
+        self._histograms[method][bisect.bisect_left(self.buckets_ms, call['ms'])] += 1
+
+        entry = (seconds, next(self._sequence), call)
+        if len(self._slowest) < self._slowest_size:
+            heapq.heappush(self._slowest, entry)
+        elif entry[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def calls(self):
+        """
+        Consultas recientes, de la más antigua a la más nueva.
+
+        Returns:
+            list: Registros por consulta (dicts)
+        """
+        return list(self._calls)
+
+    def slowest(self):
+        """
+        Consultas más lentas observadas desde el último reset.
+
+        Returns:
+            list: Registros por consulta, de la más lenta a la más rápida
+        """
+        return [call for _, _, call in sorted(self._slowest, key=lambda entry: (-entry[0], entry[1]))]
+
+    def summary(self):
+        """
+        Contadores agregados por método.
+
+        Returns:
+            dict: Método -> contadores, con 'hit_ratio', 'avg_ms',
+                'avg_states' (por búsqueda ejecutada) y 'queue_peak'
+        """
+        summary = {}
+        for method, counters in self._methods.items():
+            calls, misses = counters['calls'], counters['misses']
+            summary[method] = {
+                **counters,
+                'hit_ratio': (calls - misses) / calls if calls else 0.0,
+                'avg_ms': counters['seconds'] * 1000 / calls if calls else 0.0,
+                'avg_search_ms': counters['search_seconds'] * 1000 / misses if misses else 0.0,
+                'avg_states': counters['states'] / misses if misses else 0.0,
+                'queue_peak': self._queue_peak[method],
+            }
+        return summary
+
+    def histogram(self, method=None):
+        """
+        Histograma de latencias.
+
+        Args:
+            method: Método a consultar (None = todos sumados)
+
+        Returns:
+            list: Pares (etiqueta del intervalo, consultas)
+        """
+        if method is not None:
+            counts = self._histograms.get(method, [0] * (len(self.buckets_ms) + 1))
+        else:
+            counts = [sum(values) for values in zip(*self._histograms.values())] or [0] * (len(self.buckets_ms) + 1)
+        labels = [f"≤{bound:g} ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]:g} ms"]
+        return list(zip(labels, counts))
@@ -0,0 +1,258 @@
+import heapq
+from src.sim.routing import advance_battery
+
+
+class KShortestRouter:
+    """
+    Rutas alternativas factibles entre un par de nodos, en orden de
+    (recargas, costo), con el algoritmo de Yen y la mejora de Lawler.
+
+    El estado se conserva entre llamadas: las rutas ya aceptadas, los
+    candidatos pendientes y el árbol inverso al destino, que guarda para
+    cada nodo las etiquetas (batería necesaria, recargas, costo) no
+    dominadas. Ese árbol da el costo exacto hasta el destino desde cualquier
+    estado (nodo, batería) y todas las búsquedas de desvío lo usan como
+    cota A*, por lo que solo exploran lo que los desvíos cambian. Pedir más
+    alternativas continúa desde ese estado en lugar de empezar de cero.
+    Excluir un nodo/arista que falló conserva el árbol inverso (sigue siendo
+    una cota válida) pero reinicia las rutas y candidatos, porque desvíos
+    descartados antes pueden ser los únicos que evitan el elemento excluido.
+    """
+
+    def __init__(self, compact_graph, drone_autonomy, start, end):
+        """
+        Inicializa el router para un par origen-destino.
+
+        Args:
+            compact_graph: CompactGraph del grafo a rutear
+            drone_autonomy: Autonomía máxima del dron
+            start: Nodo de origen
+            end: Nodo de destino
+
+        Raises:
+            ValueError: Si el origen o el destino no existen
+        """
+        if start not in compact_graph.index or end not in compact_graph.index:
+            raise ValueError(f"Nodos no válidos: {start}, {end}")
+        self.graph = compact_graph
+        self.autonomy = drone_autonomy
+        self.start = start
+        self.end = end
+        self._source = compact_graph.index[start]
+        self._target = compact_graph.index[end]
+        self._charging = compact_graph.is_charging.tolist()
+        self._out_lists = compact_graph.out_lists()
+        self._tree = self._backward_tree()  # Nodo -> [(necesidad, recargas, costo)]
+        self._excluded_nodes = set()
+        self._excluded_edges = set()
+        self._restart()
+
+    def _restart(self):
+        """Descarta las rutas aceptadas y candidatas (el árbol inverso se conserva)."""
+        self._accepted = []  # Rutas aceptadas: (recargas, costo, camino, batería, índice de desvío)
+        self._pending = []  # Rutas aceptadas cuyos desvíos aún no se calcularon
+        self._candidates = []  # Heap de (recargas, costo, contador, camino, batería, índice de desvío)
+        self._seen = set()  # Caminos ya aceptados o en candidatos
+        self._counter = 0
+        self._started = False
+        self._exhausted = False
+
+    def nodes(self):
+        """Vértices usados por alguna ruta aceptada o candidata (para invalidar cachés)."""
+        return {node for path in self._seen for node in path}
+
+    def exclude(self, node=None, edge=None):
+        """
+        Excluye un nodo o una arista (e.g., por una falla) de las rutas siguientes.
+        Si el elemento es nuevo, las rutas se vuelven a generar desde el
+        principio: los desvíos que antes se descartaron (por repetidos o
+        bloqueados) pueden ser ahora los únicos que lo evitan.
+
+        Args:
+            node: Nodo a excluir
+            edge: Tupla (inicio, fin) a excluir
+        """
+        excluded = len(self._excluded_nodes), len(self._excluded_edges)
+        if node is not None and node in self.graph.index:
+            self._excluded_nodes.add(self.graph.index[node])
+        if edge is not None and edge[0] in self.graph.index and edge[1] in self.graph.index:
+            self._excluded_edges.add((self.graph.index[edge[0]], self.graph.index[edge[1]]))
+        if excluded != (len(self._excluded_nodes), len(self._excluded_edges)):
+            self._restart()
+
+    def alternatives(self, k):
+        """
+        Las k mejores rutas factibles que evitan los elementos excluidos.
+
+        Args:
+            k: Cantidad de rutas
+
+        Returns:
+            list: Dicts con 'path', 'cost', 'recharges' y 'battery_left',
+                ordenados por (recargas, costo)
+        """
+        routes = [route for route in self._accepted if self._usable(route[2])]
+        while len(routes) < k and self._advance():
+            if self._usable(self._accepted[-1][2]):
+                routes.append(self._accepted[-1])
+        ids = self.graph.ids
+        return [{'path': [ids[i] for i in path], 'cost': cost, 'recharges': recharges,
+                 'battery_left': battery}
+                for recharges, cost, path, battery, _ in routes[:k]]
+
+    def _usable(self, path):
+        if self._excluded_nodes and not self._excluded_nodes.isdisjoint(path):
+            return False
+        if self._excluded_edges:
+            return not any(edge in self._excluded_edges for edge in zip(path, path[1:]))
+        return True
+
+    def _advance(self):
+        """Acepta la siguiente ruta en orden. Retorna False si no quedan rutas."""
+        if self._exhausted:
+            return False
+        if not self._started:
+            self._started = True
+            found = self._search(self._source, self.autonomy, set(), set())
+            if found is not None:
+                recharges, cost, path, battery = found
+                self._offer(recharges, cost, tuple(path), battery, 0)
+        while self._pending:
+            self._spur(self._pending.pop())
+        while self._candidates:
+            recharges, cost, _, path, battery, deviation = heapq.heappop(self._candidates)
+            if not self._usable(path):
+                continue
+            route = (recharges, cost, path, battery, deviation)
+            self._accepted.append(route)
+            self._pending.append(route)
+            return True
+        self._exhausted = True
+        return False
+
+    def _offer(self, recharges, cost, path, battery, deviation):
+        if path in self._seen:
+            return
+        self._seen.add(path)
+        self._counter += 1
+        heapq.heappush(self._candidates, (recharges, cost, self._counter, path, battery, deviation))
+
+    def _spur(self, route):
+        """
+        Genera los desvíos de una ruta aceptada. Por la mejora de Lawler solo
+        se desvía desde su propio punto de desvío en adelante.
+        """
+        _, _, path, _, deviation = route
+        charging = self._charging
+        battery, recharges, cost = self.autonomy, 0, 0
+        states = [(battery, recharges, cost)]
+        for current, following in zip(path, path[1:]):
+            weight = dict(self._out_lists[current])[following]
+            battery, recharges = advance_battery(battery, recharges, charging[current], charging[following],
+                                                 weight, self.autonomy)
+            cost += weight
+            states.append((battery, recharges, cost))
+
+        for i in range(deviation, len(path) - 1):
+            root = path[:i + 1]
+            if not self._usable(root):
+                break  # El resto de los desvíos pasaría por un elemento excluido
+            banned_edges = {(accepted[2][i], accepted[2][i + 1]) for accepted in self._accepted
+                            if len(accepted[2]) > i + 1 and accepted[2][:i + 1] == root}
+            found = self._search(path[i], states[i][0], set(root[:-1]), banned_edges)
+            if found is None:
+                continue
+            spur_recharges, spur_cost, spur_path, battery = found
+            _, root_recharges, root_cost = states[i]
+            self._offer(root_recharges + spur_recharges, root_cost + spur_cost,
+                        root[:-1] + tuple(spur_path), battery, i)
+
+    def _backward_tree(self):
+        """
+        Búsqueda inversa desde el destino con etiquetas (batería necesaria,
+        recargas, costo), extraídas en orden (recargas, costo) y podadas por
+        dominancia. La batería necesaria es la carga mínima con la que hay que
+        llegar al nodo para completar el resto de la ruta.
+
+        Returns:
+            dict: Nodo -> etiquetas permanentes en orden (recargas, costo)
+        """
+        charging = self._charging
+        autonomy = self.autonomy
+        in_lists = self.graph.in_lists()
+        tree = {}
+        heap = [(0, 0, 0, self._target)]
+        while heap:
+            recharges, cost, need, node = heapq.heappop(heap)
+            known = tree.setdefault(node, [])
+            if any(n <= need and r <= recharges and c <= cost for n, r, c in known):
+                continue
+            known.append((need, recharges, cost))
+            to_charging = charging[node]
+            for previous, weight in in_lists[node]:
+                if charging[previous] or to_charging:
+                    # El tramo restablece la batería: basta con llegar a previous
+                    new_need, new_recharges = 0, recharges + (0 if charging[previous] else 1)
+                else:
+                    new_need, new_recharges = need + weight, recharges
+                    if new_need > autonomy:
+                        continue
+                heapq.heappush(heap, (new_recharges, cost + weight, new_need, previous))
+        return tree
+
+    def _remaining(self, node, battery):
+        """(recargas, costo) mínimos hasta el destino desde (nodo, batería), o None."""
+        for need, recharges, cost in self._tree.get(node, ()):
+            if need <= battery:
+                return recharges, cost
+        return None
+
+    def _search(self, origin, battery, banned_nodes, banned_edges):
+        """
+        A* lexicográfico (recargas, costo) desde un estado (nodo, batería)
+        hasta el destino, evitando nodos y aristas prohibidos o excluidos.
+        La cota es el árbol inverso, exacto cuando el desvío no cambia nada.
+
+        Returns:
+            tuple: (recargas, costo, camino, batería final) o None si no hay ruta
+        """
+        charging = self._charging
+        autonomy = self.autonomy
+        remaining = self._remaining
+        bound = remaining(origin, battery)
+        if bound is None:
+            return None
+        banned_nodes = banned_nodes | self._excluded_nodes
+        banned_edges = banned_edges | self._excluded_edges
+        labels = [(origin, battery, 0, 0, -1)]  # (nodo, batería, recargas, costo, padre)
+        settled = {}
+        heap = [(bound[0], bound[1], 0)]
+        while heap:
+            _, _, label = heapq.heappop(heap)
+            node, node_battery, recharges, cost, _ = labels[label]
+            if node == self._target:
+                path = []
+                index = label
+                while index != -1:
+                    path.append(labels[index][0])
+                    index = labels[index][4]
+                path.reverse()
+                return recharges, cost, path, node_battery
+            known = settled.setdefault(node, [])
+            if any(b >= node_battery and r <= recharges and c <= cost for b, r, c in known):
+                continue
+            known.append((node_battery, recharges, cost))
+            from_charging = charging[node]
+            for neighbor, weight in self._out_lists[node]:
+                if neighbor in banned_nodes or (node, neighbor) in banned_edges:
+                    continue
+                new_battery, new_recharges = advance_battery(
+                    node_battery, recharges, from_charging, charging[neighbor], weight, autonomy)
+                if new_battery < 0:
+                    continue
+                bound = remaining(neighbor, new_battery)
+                if bound is None:
+                    continue  # Desde ese estado el destino es inalcanzable
+                labels.append((neighbor, new_battery, new_recharges, cost + weight, label))
+                heapq.heappush(heap, (new_recharges + bound[0], cost + weight + bound[1], len(labels) - 1))
+        return None
@@ -0,0 +1,233 @@
+import heapq
+import math
+import numpy as np
+from src.sim.routing import completed_result, failed_result, invalid_nodes_result
+
+
+def dijkstra(lists, source, num_vertices):
+    """
+    Distancias mínimas desde un vértice sobre listas de adyacencia.
+
+    Args:
+        lists: Adyacencia [(vecino, peso), ...] por vértice
+        source: Índice del vértice de origen
+        num_vertices: Cantidad de vértices
+
+    Returns:
+        numpy.ndarray: Distancia a cada vértice (inf si es inalcanzable)
+    """
+    dist = [math.inf] * num_vertices
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in lists[u]:
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return np.array(dist, dtype=np.float64)
+
+
+class LandmarkRouter:
+    """
+    Búsqueda A* con cotas inferiores ALT (landmarks + desigualdad triangular).
+
+    El preprocesamiento elige landmarks por máxima distancia y guarda, para
+    cada uno, tablas de distancia desde y hacia el landmark tanto en costo
+    como en consumo de batería. Con ellas se acotan el costo restante y las
+    recargas restantes de cada estado (nodo, batería) de la búsqueda.
+    """
+
+    def __init__(self, compact_graph, drone_autonomy):
+        """
+        Inicializa el router sobre una instantánea del grafo.
+
+        Args:
+            compact_graph: CompactGraph del grafo a rutear
+            drone_autonomy: Autonomía máxima del dron
+        """
+        self.graph = compact_graph
+        self.autonomy = drone_autonomy
+        self.landmarks = []
+        self._cost_from = None  # (L, n): costo desde cada landmark
+        self._cost_to = None  # (L, n): costo hacia cada landmark
+        self._energy_from = None
+        self._energy_to = None
+        self._recharges_from = None  # (L, n): recargas mínimas ignorando la batería
+        self._recharges_to = None
+
+    def preprocess(self, num_landmarks=4):
+        """
+        Elige landmarks y calcula sus tablas de distancias.
+
+        Args:
+            num_landmarks: Cantidad de landmarks a usar
+
+        Returns:
+            LandmarkRouter: El propio router
+        """
+        g = self.graph
+        n = g.num_vertices
+        out_cost = g.out_lists()
+        in_cost = g.in_lists()
+        charging = g.is_charging.tolist()
+        out_energy = [[(v, 0 if charging[u] or charging[v] else w) for v, w in edges]
+                      for u, edges in enumerate(out_cost)]
+        in_energy = [[(v, 0 if charging[u] or charging[v] else w) for v, w in edges]
+                     for u, edges in enumerate(in_cost)]
+        # Recargas: cuesta 1 llegar a una estación de carga desde un nodo que no lo es
+        out_hops = [[(v, 1 if charging[v] and not charging[u] else 0) for v, _ in edges]
+                    for u, edges in enumerate(out_cost)]
+        in_hops = [[(v, 1 if charging[u] and not charging[v] else 0) for v, _ in edges]
+                   for u, edges in enumerate(in_cost)]
+
+        tables = {name: [] for name in ('cost_from', 'cost_to', 'energy_from', 'energy_to',
+                                        'recharges_from', 'recharges_to')}
+        self.landmarks = []
+        # Selección por máxima distancia: cada landmark es el vértice más lejano
+        # (en saltos de costo) de los ya elegidos
+        closest = np.full(n, np.inf)
+        candidate = 0
+        for _ in range(min(num_landmarks, n)):
+            self.landmarks.append(candidate)
+            tables['cost_from'].append(dijkstra(out_cost, candidate, n))
+            tables['cost_to'].append(dijkstra(in_cost, candidate, n))
+            tables['energy_from'].append(dijkstra(out_energy, candidate, n))
+            tables['energy_to'].append(dijkstra(in_energy, candidate, n))
+            tables['recharges_from'].append(dijkstra(out_hops, candidate, n))
+            tables['recharges_to'].append(dijkstra(in_hops, candidate, n))
+            reach = np.fmin(tables['cost_from'][-1], tables['cost_to'][-1])
+            closest = np.fmin(closest, reach)
+            finite = np.where(np.isfinite(closest), closest, -1.0)
+            finite[self.landmarks] = -1.0
+            candidate = int(np.argmax(finite))
+            if finite[candidate] < 0:
+                break
+
+        self._cost_from = np.vstack(tables['cost_from'])
+        self._cost_to = np.vstack(tables['cost_to'])
+        self._energy_from = np.vstack(tables['energy_from'])
+        self._energy_to = np.vstack(tables['energy_to'])
+        self._recharges_from = np.vstack(tables['recharges_from'])
+        self._recharges_to = np.vstack(tables['recharges_to'])
+        return self
+
+    @staticmethod
+    def _lower_bounds(dist_from, dist_to, target):
+        """
+        Cotas ALT de la distancia de cada vértice al destino.
+        Un valor infinito indica que el destino es inalcanzable desde ese vértice.
+        """
+        with np.errstate(invalid='ignore'):
+            forward = dist_from[:, target][:, None] - dist_from  # d(L,t) - d(L,v)
+            backward = dist_to - dist_to[:, target][:, None]  # d(v,L) - d(t,L)
+        bounds = np.fmax(forward, backward)  # inf - inf (nan) se ignora
+        # Sin cota en ningún landmark (todo nan): -inf, que el máximo con 0 deja en 0
+        bounds = np.where(np.isnan(bounds), -np.inf, bounds).max(axis=0)
+        return np.maximum(bounds, 0.0)
+
+    def find_path(self, start, end):
+        """
+        Encuentra la ruta con menos recargas (y luego menor costo) con A*.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+
+        Returns:
+            dict: Mismo formato que SimulationInitializer.find_path_with_charging
+        """
+        g = self.graph
+        if start not in g.index or end not in g.index:
+            return invalid_nodes_result()
+        if self._cost_from is None:
+            self.preprocess()
+        source = g.index[start]
+        target = g.index[end]
+        autonomy = self.autonomy
+        h_cost = self._lower_bounds(self._cost_from, self._cost_to, target).tolist()
+        h_energy = self._lower_bounds(self._energy_from, self._energy_to, target).tolist()
+        h_recharges = self._lower_bounds(self._recharges_from, self._recharges_to, target).tolist()
+        charging = g.is_charging.tolist()
+        out_lists = g.out_lists()
+
+        if math.isinf(h_cost[source]):
+            return failed_result([start], autonomy)  # Ningún camino llega al destino
+
+        def recharge_bound(node, battery):
+            # Cota de recargas: la de los landmarks o la energía faltante con la batería actual
+            missing = h_energy[node] - battery
+            by_energy = math.ceil(missing / autonomy) if missing > 0 else 0
+            return max(by_energy, int(h_recharges[node]))
+
+        start_state = (source, autonomy)
+        best = {start_state: (0, 0)}
+        parent = {start_state: None}
+        settled = {}  # Nodo -> etiquetas expandidas (batería, recargas, costo)
+        longest = (1, start_state)
+        counter = 0
+        heap = [(recharge_bound(source, autonomy), h_cost[source], counter, 0, 0, 1, start_state)]
+
+        while heap:
+            _, _, _, recharges, cost, depth, state = heapq.heappop(heap)
+            if best.get(state) != (recharges, cost):
+                continue  # Entrada obsoleta
+            node, battery = state
+            if node == target:
+                return completed_result(self._path(parent, state), battery)
+            if self._dominated(settled.get(node), battery, recharges, cost):
+                continue
+            settled.setdefault(node, []).append((battery, recharges, cost))
+            if depth > longest[0]:
+                longest = (depth, state)
+
+            from_charging = charging[node]
+            for neighbor, weight in out_lists[node]:
+                if math.isinf(h_cost[neighbor]):
+                    continue  # El destino es inalcanzable desde el vecino
+                # Misma regla de recarga que routing.advance_battery
+                if from_charging or charging[neighbor]:
+                    new_battery = autonomy
+                    new_recharges = recharges + (0 if from_charging else 1)
+                else:
+                    new_battery = battery - weight
+                    new_recharges = recharges
+                    if new_battery < 0:
+                        continue
+                new_cost = cost + weight
+                new_state = (neighbor, new_battery)
+                known = best.get(new_state)
+                if known is not None and known <= (new_recharges, new_cost):
+                    continue
+                if self._dominated(settled.get(neighbor), new_battery, new_recharges, new_cost):
+                    continue
+                best[new_state] = (new_recharges, new_cost)
+                parent[new_state] = state
+                counter += 1
+                heapq.heappush(heap, (new_recharges + recharge_bound(neighbor, new_battery),
+                                      new_cost + h_cost[neighbor], counter,
+                                      new_recharges, new_cost, depth + 1, new_state))
+
+        _, state = longest
+        return failed_result(self._path(parent, state), state[1])
+
+    def _path(self, parent, state):
+        ids = self.graph.ids
+        path = []
+        while state is not None:
+            path.append(ids[state[0]])
+            state = parent[state]
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _dominated(labels, battery, recharges, cost):
+        """Indica si alguna etiqueta expandida del nodo es igual o mejor en los tres criterios."""
+        if labels:
+            for other_battery, other_recharges, other_cost in labels:
+                if other_battery >= battery and other_recharges <= recharges and other_cost <= cost:
+                    return True
+        return False
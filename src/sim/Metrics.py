@@ -0,0 +1,453 @@
+import bisect
+import math
+import re
+import threading
+import urllib.request
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Límites superiores (segundos) de los intervalos por defecto de un histograma
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Tipo de contenido del formato de texto de Prometheus
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_NAME_PATTERN = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+_SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)')
+_LABEL_PATTERN = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def _format_value(value):
+    """Valor numérico en el formato de texto (+Inf, -Inf, NaN)."""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{_escape(value)}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """Base de las métricas: nombre, ayuda, etiquetas e hijos por valor de etiqueta."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Nombre de métrica no válido: {name}")
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._children = {}  # Valores de etiqueta -> métrica hija
+
+    def labels(self, *values, **named):
+        """
+        Métrica hija para unos valores de etiqueta (se crea la primera vez).
+
+        Args:
+            *values: Valores en el orden de las etiquetas
+            **named: Valores por nombre de etiqueta
+
+        Returns:
+            Métrica hija del mismo tipo
+
+        Raises:
+            ValueError: Si los valores no corresponden a las etiquetas
+        """
+        if named:
+            values = tuple(named.get(name) for name in self.label_names)
+        if len(values) != len(self.label_names) or None in values:
+            raise ValueError(f"{self.name} espera las etiquetas {self.label_names}")
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        return type(self)(self.name, self.documentation)
+
+    def _samples(self):
+        """Pares (valores de etiqueta, métrica sin etiquetas) a exponer."""
+        if self.label_names:
+            return sorted(self._children.items())
+        return [((), self)]
+
+    def exposition(self):
+        """
+        Líneas de la métrica en el formato de texto de Prometheus.
+
+        Returns:
+            list: Líneas HELP, TYPE y muestras
+        """
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, metric in self._samples():
+            lines += metric._sample_lines(self.name, self.label_names, values)
+        return lines
+
+
+class Counter(_Metric):
+    """Contador monótono."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._value = 0.0
+
+    def inc(self, amount=1):
+        """
+        Incrementa el contador.
+
+        Args:
+            amount: Incremento (no negativo)
+
+        Raises:
+            ValueError: Si el incremento es negativo
+        """
+        if amount < 0:
+            raise ValueError("Un contador solo puede incrementarse")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def _sample_lines(self, name, label_names, values):
+        return [f'{name}{_format_labels(label_names, values)} {_format_value(self._value)}']
+
+
+class Gauge(_Metric):
+    """Valor que sube y baja; puede leerse de una función al exponerse."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._value = 0.0
+        self._function = None
+
+    def set(self, value):
+        """Fija el valor."""
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount=1):
+        """Incrementa el valor."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        """Decrementa el valor."""
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function):
+        """
+        Lee el valor de una función en cada exposición.
+
+        Args:
+            function: Función sin argumentos que retorna el valor (None = usar set)
+        """
+        self._function = function
+
+    @property
+    def value(self):
+        return float(self._function()) if self._function is not None else self._value
+
+    def _sample_lines(self, name, label_names, values):
+        return [f'{name}{_format_labels(label_names, values)} {_format_value(self.value)}']
+
+
+class Histogram(_Metric):
+    """Histograma acumulativo con intervalos fijos, suma y conteo."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+
+    def _new_child(self):
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value):
+        """
+        Registra una observación.
+
+        Args:
+            value: Valor observado
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self):
+        return sum(self._counts)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def _sample_lines(self, name, label_names, values):
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            labels = _format_labels(label_names, values, [('le', _format_value(bound))])
+            lines.append(f'{name}_bucket{labels} {cumulative}')
+        labels = _format_labels(label_names, values)
+        lines.append(f'{name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso (contadores, medidores e histogramas)
+    expuestas en el formato de texto de Prometheus.
+
+    Los componentes piden sus métricas por nombre (la misma métrica si ya
+    existe) y pueden registrar colectores: funciones que se llaman antes de
+    cada exposición para volcar contadores propios. Así el camino caliente
+    solo incrementa enteros y el costo de las métricas se paga al leerlas.
+    """
+
+    _shared = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}  # Nombre -> métrica (en orden de registro)
+        self._collectors = []  # Funciones (o WeakMethod) llamadas antes de exponer
+
+    @classmethod
+    def shared(cls):
+        """
+        Registro compartido por todo el proceso.
+
+        Returns:
+            MetricsRegistry: Instancia única compartida
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _get_or_create(self, metric_class, name, documentation, labels, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labels, **options)
+            elif not isinstance(metric, metric_class) or metric.label_names != tuple(labels):
+                raise ValueError(f"La métrica {name} ya existe con otro tipo o etiquetas")
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        """
+        Obtiene (o crea) un contador.
+
+        Args:
+            name: Nombre de la métrica
+            documentation: Texto de ayuda
+            labels: Nombres de las etiquetas
+
+        Returns:
+            Counter: Contador registrado
+
+        Raises:
+            ValueError: Si el nombre ya está registrado con otro tipo o etiquetas
+        """
+        return self._get_or_create(Counter, name, documentation, labels)
+
+    def gauge(self, name, documentation, labels=()):
+        """Obtiene (o crea) un medidor; ver counter."""
+        return self._get_or_create(Gauge, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        """
+        Obtiene (o crea) un histograma; ver counter.
+
+        Args:
+            buckets: Límites superiores de los intervalos
+        """
+        return self._get_or_create(Histogram, name, documentation, labels, buckets=buckets)
+
+    def get(self, name):
+        """Retorna la métrica registrada con un nombre o None."""
+        return self._metrics.get(name)
+
+    def add_collector(self, collector):
+        """
+        Registra una función a llamar antes de cada exposición. Los métodos
+        de instancia se guardan con referencia débil: el colector desaparece
+        al liberarse su objeto.
+
+        Args:
+            collector: Función sin argumentos
+        """
+        reference = weakref.WeakMethod(collector) if hasattr(collector, '__self__') else None
+        with self._lock:
+            self._collectors.append(reference if reference is not None else collector)
+
+    def collect(self):
+        """Ejecuta los colectores registrados (descarta los de objetos liberados)."""
+        with self._lock:
+            collectors = list(self._collectors)
+        alive = []
+        for entry in collectors:
+            collector = entry() if isinstance(entry, weakref.WeakMethod) else entry
+            if collector is None:
+                continue
+            collector()
+            alive.append(entry)
+        with self._lock:
+            self._collectors = alive + [entry for entry in self._collectors if entry not in collectors]
+
+    def exposition(self):
+        """
+        Todas las métricas en el formato de texto de Prometheus.
+
+        Returns:
+            str: Texto de la exposición
+        """
+        self.collect()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.exposition()
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, host='127.0.0.1', port=0):
+        """
+        Expone las métricas por HTTP en /metrics desde un hilo en segundo plano.
+
+        Args:
+            host: Dirección de escucha (por defecto solo local)
+            port: Puerto (0 = uno libre)
+
+        Returns:
+            MetricsServer: Servidor iniciado
+
+        Raises:
+            OSError: Si el puerto no está disponible
+        """
+        return MetricsServer(self, host, port)
+
+
+class MetricsServer:
+    """Servidor HTTP local que atiende GET /metrics con la exposición de un registro."""
+
+    def __init__(self, registry, host='127.0.0.1', port=0):
+        """
+        Inicia el servidor.
+
+        Args:
+            registry: MetricsRegistry a exponer
+            host: Dirección de escucha
+            port: Puerto (0 = uno libre)
+        """
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split('?', 1)[0] != '/metrics':
+                    handler.send_error(404)
+                    return
+                body = registry.exposition().encode('utf-8')
+                handler.send_response(200)
+                handler.send_header('Content-Type', CONTENT_TYPE)
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass  # Sin registro por petición en la consola
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/metrics'
+
+    def close(self):
+        """Detiene el servidor."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def parse_exposition(text):
+    """
+    Interpreta una exposición en formato de texto (lo que leería un scraper).
+
+    Args:
+        text: Texto de la exposición
+
+    Returns:
+        dict: (nombre de muestra, tupla ordenada de (etiqueta, valor)) -> valor
+    """
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        match = _SAMPLE_PATTERN.match(line)
+        if match is None:
+            continue
+        name, labels, value = match.groups()
+        pairs = tuple(sorted((key, re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), raw))
+                             for key, raw in _LABEL_PATTERN.findall(labels or '')))
+        samples[(name, pairs)] = float(value)
+    return samples
+
+
+def scrape(url, timeout=5):
+    """
+    Lee y interpreta el endpoint de métricas.
+
+    Args:
+        url: URL del endpoint (p. ej. MetricsServer.url)
+        timeout: Segundos de espera
+
+    Returns:
+        dict: Muestras (ver parse_exposition)
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return parse_exposition(response.read().decode('utf-8'))
+
+
+def rates(before, after, seconds):
+    """
+    Tasas por segundo de los contadores entre dos lecturas.
+
+    Args:
+        before: Muestras de la primera lectura
+        after: Muestras de la segunda lectura
+        seconds: Segundos entre ambas lecturas
+
+    Returns:
+        dict: Muestra -> incremento por segundo (solo muestras '_total')
+    """
+    return {key: (value - before.get(key, 0.0)) / seconds
+            for key, value in after.items() if key[0].endswith('_total') and seconds > 0}
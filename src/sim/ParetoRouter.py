@@ -0,0 +1,185 @@
+import heapq
+from src.sim.routing import advance_battery
+
+
+class ParetoRouter:
+    """
+    Router multiobjetivo por etiquetas: calcula la frontera de Pareto de
+    (costo total, recargas, saltos) entre un origen y sus destinos.
+
+    Cada etiqueta guarda además la batería restante, que actúa como recurso:
+    una etiqueta domina a otra del mismo nodo si no es peor en costo,
+    recargas ni saltos y tiene al menos la misma batería. Las etiquetas se
+    procesan en orden lexicográfico, de modo que una etiqueta extraída de la
+    cola ya no puede ser dominada.
+    """
+
+    def __init__(self, compact_graph, drone_autonomy, max_labels=12):
+        """
+        Inicializa el router.
+
+        Args:
+            compact_graph: CompactGraph del grafo a rutear
+            drone_autonomy: Autonomía máxima del dron
+            max_labels: Máximo de etiquetas permanentes por nodo (None = sin límite).
+                Acota el trabajo en redes grandes a costa de poder omitir alternativas.
+        """
+        self.graph = compact_graph
+        self.autonomy = drone_autonomy
+        self.max_labels = max_labels
+
+    def find_frontier(self, start, end, max_results=None):
+        """
+        Frontera de Pareto entre dos nodos.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            max_results: Máximo de alternativas a devolver (las de menor costo)
+
+        Returns:
+            list: Alternativas ordenadas por costo, cada una un dict con
+                'path', 'cost', 'recharges', 'hops' y 'battery_left'
+        """
+        frontiers = self.find_frontiers(start, [end])
+        options = frontiers.get(end, [])
+        return options[:max_results] if max_results else options
+
+    def find_frontiers(self, start, ends=None):
+        """
+        Fronteras de Pareto desde un origen hacia varios destinos en una sola búsqueda.
+
+        Args:
+            start: Nodo de origen
+            ends: Destinos de interés (None = todos los nodos)
+
+        Returns:
+            dict: {destino: alternativas ordenadas por costo}
+        """
+        g = self.graph
+        if start not in g.index:
+            return {}
+        targets = None if ends is None else {g.index[end] for end in ends if end in g.index}
+        if targets is not None and not targets:
+            return {}
+        source = g.index[start]
+        autonomy = self.autonomy
+        max_labels = self.max_labels
+        charging = g.is_charging.tolist()
+        out_lists = g.out_lists()
+        single_target = next(iter(targets)) if targets is not None and len(targets) == 1 else None
+
+        # Cotas inferiores hacia un destino único (cero si hay varios destinos)
+        if single_target is not None:
+            cost_bound, recharge_bound, hop_bound = self._bounds(single_target)
+            if cost_bound[source] is None:
+                return {}
+        else:
+            cost_bound = recharge_bound = hop_bound = [0] * g.num_vertices
+
+        # Etiquetas: (nodo, costo, recargas, saltos, batería, padre)
+        labels = [(source, 0, 0, 0, autonomy, -1)]
+        permanent = {}  # Nodo -> [(costo, recargas, saltos, batería, etiqueta)] extraídas de la cola
+        heap = [(cost_bound[source], recharge_bound[source], hop_bound[source], -autonomy, 0)]
+
+        while heap:
+            _, _, _, negative_battery, label = heapq.heappop(heap)
+            node, cost, recharges, hops, battery, _ = labels[label]
+            settled = permanent.setdefault(node, [])
+            if self._dominated(settled, cost, recharges, hops, battery):
+                continue
+            if max_labels is not None and len(settled) >= max_labels:
+                continue
+            settled.append((cost, recharges, hops, battery, label))
+            if node == single_target:
+                continue  # No se extiende más allá del destino
+
+            from_charging = charging[node]
+            for neighbor, weight in out_lists[node]:
+                if cost_bound[neighbor] is None:
+                    continue  # El destino es inalcanzable desde el vecino
+                new_battery, new_recharges = advance_battery(
+                    battery, recharges, from_charging, charging[neighbor], weight, autonomy)
+                if new_battery < 0:
+                    continue
+                new_cost = cost + weight
+                new_hops = hops + 1
+                if self._dominated(permanent.get(neighbor), new_cost, new_recharges, new_hops, new_battery):
+                    continue
+                estimate = (new_cost + cost_bound[neighbor], new_recharges + recharge_bound[neighbor],
+                            new_hops + hop_bound[neighbor])
+                # Terminación temprana: si la frontera del destino ya domina las cotas
+                # inferiores de la etiqueta, ninguna extensión puede mejorarla
+                if single_target is not None and self._dominated(permanent.get(single_target), *estimate, 0):
+                    continue
+                labels.append((neighbor, new_cost, new_recharges, new_hops, new_battery, label))
+                heapq.heappush(heap, (*estimate, -new_battery, len(labels) - 1))
+
+        nodes = targets if targets is not None else range(g.num_vertices)
+        frontiers = {}
+        for node in nodes:
+            options = self._frontier(permanent.get(node, ()), labels)
+            if options:
+                frontiers[g.ids[node]] = options
+        return frontiers
+
+    def _bounds(self, target):
+        """
+        Cotas inferiores exactas (ignorando la batería) de costo, recargas y
+        saltos desde cada vértice hasta el destino, con búsquedas inversas.
+        Los vértices que no alcanzan el destino quedan con None.
+        """
+        g = self.graph
+        n = g.num_vertices
+        charging = g.is_charging.tolist()
+        in_lists = g.in_lists()
+
+        def reverse_dijkstra(step):
+            dist = [None] * n
+            dist[target] = 0
+            heap = [(0, target)]
+            while heap:
+                d, v = heapq.heappop(heap)
+                if d > dist[v]:
+                    continue
+                for u, weight in in_lists[v]:
+                    nd = d + step(u, v, weight)
+                    if dist[u] is None or nd < dist[u]:
+                        dist[u] = nd
+                        heapq.heappush(heap, (nd, u))
+            return dist
+
+        costs = reverse_dijkstra(lambda u, v, weight: weight)
+        recharges = reverse_dijkstra(lambda u, v, weight: 1 if charging[v] and not charging[u] else 0)
+        hops = reverse_dijkstra(lambda u, v, weight: 1)
+        return costs, recharges, hops
+
+    @staticmethod
+    def _dominated(settled, cost, recharges, hops, battery):
+        """Indica si alguna etiqueta permanente es igual o mejor en todos los criterios."""
+        if settled:
+            for other_cost, other_recharges, other_hops, other_battery, _ in settled:
+                if (other_cost <= cost and other_recharges <= recharges and other_hops <= hops
+                        and other_battery >= battery):
+                    return True
+        return False
+
+    def _frontier(self, settled, labels):
+        """Filtra las etiquetas del destino a (costo, recargas, saltos) no dominados."""
+        options = []
+        for cost, recharges, hops, battery, label in settled:
+            if any(o['cost'] <= cost and o['recharges'] <= recharges and o['hops'] <= hops
+                   for o in options):
+                continue  # Igual en los tres criterios pero con menos batería
+            options.append({'path': self._path(labels, label), 'cost': cost, 'recharges': recharges,
+                            'hops': hops, 'battery_left': battery})
+        return options
+
+    def _path(self, labels, label):
+        ids = self.graph.ids
+        path = []
+        while label != -1:
+            node, _, _, _, _, label = labels[label]
+            path.append(ids[node])
+        path.reverse()
+        return path
@@ -0,0 +1,165 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Fases que SimulationInitializer.initialize_simulation informa (en orden de ejecución)
+PHASES = ('network', 'client_assignment', 'connectivity', 'orders', 'depot_assignment', 'route_registration',
+          'route_costs')
+
+
+class PhaseProfiler:
+    """
+    Perfilador por fases: tiempo de reloj, tiempo de CPU y pico de memoria
+    (tracemalloc) de cada bloque marcado con phase(nombre).
+
+    Las fases se pueden anidar (la memoria de una fase interna cuenta también
+    para la externa) y repetir: una fase que se entra varias veces acumula
+    tiempos y llamadas.
+    Opcionalmente adjunta cProfile a fases nombradas y guarda los resultados
+    en archivos. tracemalloc hace más lento el código medido, por lo que los
+    tiempos con trace_memory=True son comparables entre sí pero no con una
+    ejecución sin perfilar.
+    """
+
+    def __init__(self, trace_memory=True, profile_phases=(), output_dir=None):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            trace_memory: Medir el pico de memoria de cada fase con tracemalloc
+            profile_phases: Nombres de las fases a perfilar con cProfile
+            output_dir: Directorio donde guardar los resultados al terminar la
+                fase más externa (None = no guardar)
+        """
+        self.trace_memory = trace_memory
+        self.profile_phases = set(profile_phases)
+        self.output_dir = output_dir
+        self._phases = {}  # Nombre -> resultados acumulados (en orden de primera entrada)
+        self._stack = []  # Fases abiertas: [nombre, pico de memoria observado]
+        self._profiles = {}  # Nombre -> cProfile.Profile
+        self._profiling = None  # Fase con cProfile activo (solo uno a la vez)
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Mide un bloque como fase.
+
+        Args:
+            name: Nombre de la fase
+        """
+        if not self._stack and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            if self._stack:
+                # El pico desde el último reinicio pertenece a la fase externa
+                outer = self._stack[-1]
+                outer[1] = max(outer[1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        result = self._phases.get(name)
+        if result is None:
+            result = self._phases[name] = {'phase': name, 'depth': len(self._stack), 'calls': 0,
+                                           'wall_s': 0.0, 'cpu_s': 0.0, 'peak_mb': 0.0, 'profiled': False}
+        frame = [name, 0]
+        self._stack.append(frame)
+
+        profile = None
+        if name in self.profile_phases and self._profiling is None:
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+            self._profiling = name
+            profile.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            if profile is not None:
+                profile.disable()
+                self._profiling = None
+            self._stack.pop()
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1]) if tracing else 0
+            if tracing and self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+            result['calls'] += 1
+            result['wall_s'] += wall
+            result['cpu_s'] += cpu
+            result['peak_mb'] = max(result['peak_mb'], peak / 2 ** 20)
+            result['profiled'] = result['profiled'] or profile is not None
+
+            if not self._stack:
+                if self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+                if self.output_dir is not None:
+                    self.dump(self.output_dir)
+
+    def results(self):
+        """
+        Resultados por fase, en orden de primera entrada.
+
+        Returns:
+            list: Dicts con 'phase', 'depth' (nivel de anidamiento), 'calls',
+                'wall_s', 'cpu_s', 'peak_mb' y 'profiled'
+        """
+        return [dict(result) for result in self._phases.values()]
+
+    def profile_stats(self, name, limit=30, sort='cumulative'):
+        """
+        Resumen en texto del perfil cProfile de una fase.
+
+        Args:
+            name: Nombre de la fase
+            limit: Cantidad de funciones a listar
+            sort: Criterio de orden de pstats
+
+        Returns:
+            str: Resumen o None si la fase no se perfiló
+        """
+        profile = self._profiles.get(name)
+        if profile is None:
+            return None
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def report(self):
+        """Tabla en texto de los resultados por fase."""
+        lines = [f"{'fase':<28} {'llamadas':>9} {'reloj s':>9} {'CPU s':>9} {'pico MB':>9}"]
+        for result in self._phases.values():
+            name = '  ' * result['depth'] + result['phase']
+            lines.append(f"{name:<28} {result['calls']:>9} {result['wall_s']:>9.3f} {result['cpu_s']:>9.3f} "
+                         f"{result['peak_mb']:>9.1f}")
+        return '\n'.join(lines)
+
+    def dump(self, directory):
+        """
+        Guarda los resultados en un directorio: phases.json con los tiempos y,
+        por cada fase perfilada, <fase>.prof (para pstats/snakeviz) y
+        <fase>.txt con las funciones de mayor tiempo acumulado.
+
+        Args:
+            directory: Directorio de destino (se crea si no existe)
+
+        Returns:
+            list: Rutas de los archivos escritos
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = [os.path.join(directory, 'phases.json')]
+        with open(paths[0], 'w', encoding='utf-8') as handle:
+            json.dump(self.results(), handle, indent=2)
+        for name, profile in self._profiles.items():
+            base = os.path.join(directory, re.sub(r'[^\w.-]', '_', name))
+            profile.dump_stats(base + '.prof')
+            with open(base + '.txt', 'w', encoding='utf-8') as handle:
+                handle.write(self.profile_stats(name))
+            paths += [base + '.prof', base + '.txt']
+        return paths
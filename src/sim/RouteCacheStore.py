@@ -0,0 +1,189 @@
+import json
+import sqlite3
+import threading
+import time
+
+# Archivo por defecto de la caché persistente de rutas
+DEFAULT_PATH = 'route_cache.sqlite'
+
+# Redes cuyos resultados se conservan por defecto (las usadas más recientemente)
+MAX_NETWORKS = 16
+
+
+class RouteCacheStore:
+    """
+    Caché persistente en disco (SQLite) de resultados de find_path_with_charging.
+
+    Cada resultado se guarda bajo la huella de la red que lo produjo (ver
+    SimulationInitializer.route_store_key), de modo que una ejecución nueva
+    sobre la misma red empieza con la caché caliente y un cambio de la red
+    nunca reutiliza resultados de otra. Las escrituras se acumulan en memoria
+    y se confirman en lotes dentro de una sola transacción.
+
+    Cada red generada al azar tiene una huella distinta, así que la base se
+    limita a las max_networks redes usadas más recientemente: al empezar a
+    usar una red se eliminan los resultados de las más antiguas.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=64, max_networks=MAX_NETWORKS):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            path: Archivo SQLite (':memory:' para una caché temporal)
+            batch_size: Escrituras acumuladas antes de confirmar un lote
+            max_networks: Redes cuyos resultados se conservan (None = sin límite)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.max_networks = max_networks
+        self._pending = {}  # (huella, clave) -> resultado serializado aún sin confirmar
+        self._lock = threading.Lock()  # Streamlit ejecuta cada sesión en su propio hilo
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS routes ('
+            ' fingerprint TEXT NOT NULL,'
+            ' cache_key TEXT NOT NULL,'
+            ' result TEXT NOT NULL,'
+            ' PRIMARY KEY (fingerprint, cache_key)'
+            ') WITHOUT ROWID')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS networks ('
+            ' fingerprint TEXT PRIMARY KEY,'
+            ' last_used REAL NOT NULL'
+            ') WITHOUT ROWID')
+        self._connection.commit()
+
+    def get(self, fingerprint, cache_key):
+        """
+        Busca un resultado guardado.
+
+        Args:
+            fingerprint: Huella de la red
+            cache_key: Clave de la consulta (igual que en path_cache)
+
+        Returns:
+            dict: Resultado guardado o None si no existe
+        """
+        with self._lock:
+            encoded = self._pending.get((fingerprint, cache_key))
+            if encoded is None:
+                row = self._connection.execute(
+                    'SELECT result FROM routes WHERE fingerprint = ? AND cache_key = ?',
+                    (fingerprint, cache_key)).fetchone()
+                encoded = row[0] if row else None
+        return json.loads(encoded) if encoded is not None else None
+
+    def load(self, fingerprint):
+        """
+        Todos los resultados guardados para una red (para calentar la caché).
+        Marca la red como usada y, si se supera max_networks, elimina los
+        resultados de las redes usadas hace más tiempo.
+
+        Args:
+            fingerprint: Huella de la red
+
+        Returns:
+            dict: {clave: resultado}
+        """
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO networks (fingerprint, last_used) VALUES (?, ?)',
+                                     (fingerprint, time.time()))
+        if self.max_networks is not None:
+            self.prune(self.max_networks)
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT cache_key, result FROM routes WHERE fingerprint = ?', (fingerprint,)).fetchall()
+            entries = {key: encoded for key, encoded in rows}
+            entries.update({key: encoded for (owner, key), encoded in self._pending.items()
+                            if owner == fingerprint})
+        return {key: json.loads(encoded) for key, encoded in entries.items()}
+
+    def put(self, fingerprint, cache_key, result):
+        """
+        Guarda un resultado. Se escribe en disco al completar un lote o con flush().
+
+        Args:
+            fingerprint: Huella de la red
+            cache_key: Clave de la consulta
+            result: Resultado serializable a JSON
+        """
+        with self._lock:
+            self._pending[(fingerprint, cache_key)] = json.dumps(result)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Confirma en disco todas las escrituras pendientes en una sola transacción."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(fingerprint, key, encoded) for (fingerprint, key), encoded in self._pending.items()]
+            now = time.time()
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO routes (fingerprint, cache_key, result) VALUES (?, ?, ?)', rows)
+                self._connection.executemany(
+                    'INSERT OR IGNORE INTO networks (fingerprint, last_used) VALUES (?, ?)',
+                    [(fingerprint, now) for fingerprint in {row[0] for row in rows}])
+            self._pending.clear()
+
+    def prune(self, max_networks):
+        """
+        Conserva solo los resultados de las redes usadas más recientemente.
+        Las redes guardadas sin registro de uso se consideran las más antiguas.
+
+        Args:
+            max_networks: Cantidad de redes a conservar
+
+        Returns:
+            int: Cantidad de resultados eliminados
+        """
+        self.flush()
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM networks WHERE fingerprint NOT IN '
+                '(SELECT fingerprint FROM networks ORDER BY last_used DESC LIMIT ?)', (max_networks,))
+            cursor = self._connection.execute(
+                'DELETE FROM routes WHERE fingerprint NOT IN (SELECT fingerprint FROM networks)')
+            return cursor.rowcount
+
+    def discard(self, keep=None):
+        """
+        Elimina los resultados guardados de otras redes.
+
+        Args:
+            keep: Huella cuyos resultados se conservan (None = borrar todo)
+
+        Returns:
+            int: Cantidad de resultados eliminados
+        """
+        self.flush()
+        with self._lock, self._connection:
+            if keep is None:
+                self._connection.execute('DELETE FROM networks')
+                cursor = self._connection.execute('DELETE FROM routes')
+            else:
+                self._connection.execute('DELETE FROM networks WHERE fingerprint != ?', (keep,))
+                cursor = self._connection.execute('DELETE FROM routes WHERE fingerprint != ?', (keep,))
+            return cursor.rowcount
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM routes').fetchone()[0]
+
+    def close(self):
+        """Confirma las escrituras pendientes y cierra la base de datos."""
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
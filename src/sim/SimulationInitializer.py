@@ -1,11 +1,41 @@
+import hashlib
+import os
 import random
 import string
+import time
 from src.model.Graph import Graph
+from src.model.GraphLoader import GraphLoader
+from src.model.GraphChange import EDGE_REMOVED, VERTEX_DISABLED
+from src.model.NodeRegistry import role_of
 from src.domain.Client import Client
 from src.domain.Order import Order
-from src.domain.Route import Route
+from src.domain.OrderTable import OrderTable
+from src.domain.RouteRegistry import RouteRegistry
+from src.domain.RouteIndex import RouteIndex
+from src.sim.LandmarkRouter import LandmarkRouter
+from src.sim.BidirectionalRouter import BidirectionalRouter
+from src.sim.ParetoRouter import ParetoRouter
+from src.sim.KShortestRouter import KShortestRouter
+from src.sim.ChargingOverlay import ChargingOverlay
+from src.sim.ContractionHierarchy import ContractionHierarchy
+from src.sim.FeasibilityMatrix import FeasibilityMatrix
+from src.sim.DepotAssignment import DepotAssignment
+from src.sim.RouteCacheStore import RouteCacheStore
+from src.sim.EventLog import EventLog
+from src.sim.EventReplay import EventReplay
+from src.sim.Instrumentation import Instrumentation, path_recharges, CACHE_MEMORY, CACHE_STORE, CACHE_MISS
+from src.sim.Metrics import MetricsRegistry
+from src.sim.SimulationSnapshot import SimulationSnapshot, SECTIONS as SNAPSHOT_SECTIONS
+from src.sim.routing import advance_battery, completed_result, failed_result, invalid_nodes_result
 import streamlit as st
 from collections import deque
+from contextlib import nullcontext
+
+# Métodos de búsqueda disponibles en find_path_with_charging
+SEARCH_METHODS = ('bfs', 'bidirectional', 'alt', 'overlay', 'ch')
+
+# Etiqueta de rol de las métricas, indexada por el rol de NodeRegistry
+METRIC_ROLES = ('storage', 'charging', 'client', 'unknown')
 
 class SimulationInitializer:
     def __init__(self):
@@ -14,16 +44,110 @@ class SimulationInitializer:
         """
         self.graph = None
         self.orders = []
+        self.order_table = OrderTable()  # Almacén columnar de las órdenes
         self.clients = []
-        self.routes = []
-        self.route_frequencies = {}
+        self.route_registry = RouteRegistry()  # Rutas canónicas y sus frecuencias
+        self.route_index = RouteIndex()  # Trie de prefijos e índice nodo -> rutas
         self.node_types = {}
         self.DRONE_AUTONOMY = 50
         self.path_cache = {}  # Cache para rutas ya calculadas
+        self.landmark_router = None  # A* con cotas ALT (preprocesado bajo demanda)
+        self.charging_overlay = None  # Overlay entre estaciones de carga (bajo demanda)
+        self.contraction_hierarchy = None  # Jerarquía de contracción para consultas masivas
+        self.feasibility_matrix = None  # Costos/recargas de todos los pares (bajo demanda)
+        self.depot_assignment = None  # Cliente -> depósito factible más cercano (bajo demanda)
+        self.route_store = None  # Caché persistente de rutas en disco (opcional)
+        self._warm_store_key = None  # Huella cuya caché persistente ya se cargó en path_cache
+        self.event_log = None  # Bitácora binaria de eventos (opcional)
+        self.event_log_offset = 0  # Registro de la bitácora en que se guardó el snapshot cargado
+        self.instrumentation = Instrumentation()  # Contadores de find_path_with_charging (desactivados)
+        self.profiler = None  # PhaseProfiler de initialize_simulation (opcional)
+        self.metrics = None  # MetricsRegistry conectado (opcional)
+        self._metric = {}  # Nombre corto -> métrica del registro conectado
+        self._route_lookups = 0  # Consultas válidas a find_path_with_charging
+        self._route_store_hits = 0  # Consultas resueltas por la caché persistente
+        self._route_searches = 0  # Consultas que ejecutaron una búsqueda
+        self._reported = (0, 0, 0)  # Contadores ya volcados al registro de métricas
+        self._reported_routes = []  # (ruta, frecuencia) ya volcadas al registro de métricas
+        self._cache_keys_by_node = {}  # Nodo -> claves de path_cache cuyas rutas lo usan
+        self._failed_cache_keys = set()  # Claves de path_cache sin ruta completa
+        self._alternative_routers = {}  # (origen, destino) -> KShortestRouter con sus alternativas
         self._storage_nodes = []  # Cache para nodos de almacenamiento
         self._charging_nodes = []  # Cache para nodos de carga
         self._client_nodes = []  # Cache para nodos de cliente
 
+    @property
+    def routes(self):
+        """Rutas registradas (vista de solo lectura del RouteRegistry)."""
+        return self.route_registry.routes()
+
+    @property
+    def route_frequencies(self):
+        """Frecuencias por ruta en formato {'A → B': frecuencia}."""
+        return self.route_registry.frequencies()
+
+    def _phase(self, name):
+        """Bloque medido por el perfilador activo (sin perfilador no mide nada)."""
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+
+    def register_route(self, path):
+        """
+        Registra un uso de la ruta dada en el registro canónico.
+        Las rutas nuevas (o retiradas por un cambio del grafo) se agregan al
+        índice de rutas para reutilizar sus prefijos.
+        
+        Args:
+            path: Lista de nodos de la ruta (debe ser factible)
+            
+        Returns:
+            Route: Ruta compartida para esa secuencia de nodos
+        """
+        route = self.route_registry.record_use(path)
+        if route not in self.route_index:
+            self.route_index.add(route, self.graph)
+        if self.event_log is not None:
+            self.event_log.route_used(route)
+        return route
+
+    def record_order(self, order):
+        """
+        Registra en la bitácora de eventos la creación de una orden y, si ya
+        tiene una, la asignación de su ruta. Sin bitácora no hace nada.
+
+        Args:
+            order: Orden creada
+        """
+        if self.event_log is None:
+            return
+        self.event_log.order_created(order)
+        route = order.route
+        if route is not None:
+            cost = route.calculate_total_cost(self.graph) if self.graph is not None else order.route_cost
+            self.event_log.route_assigned(order, route, cost)
+
+    def complete_delivery(self, order):
+        """
+        Marca una orden como entregada y lo registra en la bitácora de eventos.
+
+        Args:
+            order: Orden entregada
+        """
+        order.complete_delivery()
+        if self.event_log is not None:
+            self.event_log.delivery_completed(order)
+
+    def routes_through(self, node_id):
+        """
+        Rutas registradas que pasan por un nodo (e.g., una estación de carga).
+        
+        Args:
+            node_id: ID del nodo
+            
+        Returns:
+            list: Objetos Route
+        """
+        return self.route_index.routes_through(node_id)
+
     def get_node_letters(self, count):
         """
         Genera identificadores de nodos usando letras.
@@ -71,12 +195,7 @@ class SimulationInitializer:
             raise ValueError("El número de nodos debe estar entre 10 y 150")
             
         # Reiniciar todas las estructuras
-        self.graph = Graph()
-        self.node_types.clear()
-        self.path_cache.clear()
-        self._storage_nodes.clear()
-        self._charging_nodes.clear()
-        self._client_nodes.clear()
+        self._reset_network(Graph())
         
         if num_edges is None:
             num_edges = max(num_nodes - 1, int(num_nodes * 1.5))
@@ -111,15 +230,16 @@ class SimulationInitializer:
 
         # Crear clientes
         client_types = ["Regular", "Premium", "VIP"]
-        for i in range(client_nodes):
-            node_id = f"T{i+1}"
-            self.graph.add_vertex(node_id)
-            self._client_nodes.append(node_id)
-            self.node_types[node_id] = "client"
-            
-            client = Client(f"CLI{i+1}", f"Cliente {i+1}", random.choice(client_types))
-            client.node_id = node_id
-            self.clients.append(client)
+        with self._phase('client_assignment'):
+            for i in range(client_nodes):
+                node_id = f"T{i+1}"
+                self.graph.add_vertex(node_id)
+                self._client_nodes.append(node_id)
+                self.node_types[node_id] = "client"
+                
+                client = Client(f"CLI{i+1}", f"Cliente {i+1}", random.choice(client_types))
+                client.node_id = node_id
+                self.clients.append(client)
 
         # Crear árbol de expansión mínimo inicial para garantizar conectividad
         all_nodes = self._storage_nodes + self._charging_nodes + self._client_nodes
@@ -147,11 +267,365 @@ class SimulationInitializer:
                 self.graph.add_edge(u, v, weight)
 
         # Verificar conectividad final
-        if not self.is_connected():
+        with self._phase('connectivity'):
+            connected = self.is_connected()
+        if not connected:
             raise ValueError("La red generada no está conectada. Por favor, intente nuevamente.")
 
+        # Reparar cachés e índices ante cambios posteriores del grafo
+        self.graph.subscribe(self._on_graph_change)
+
         return self.graph
 
+    def _reset_network(self, graph):
+        """Reemplaza el grafo y descarta los índices, cachés y routers de la red anterior."""
+        self.graph = graph
+        self.node_types.clear()
+        self._clear_path_cache()
+        self._warm_store_key = None
+        self._alternative_routers.clear()
+        self.landmark_router = None
+        self.charging_overlay = None
+        self.contraction_hierarchy = None
+        self.feasibility_matrix = None
+        self.depot_assignment = None
+        self._storage_nodes.clear()
+        self._charging_nodes.clear()
+        self._client_nodes.clear()
+
+    def restore_network(self, graph, storage_nodes, charging_nodes, client_nodes, drone_autonomy=None):
+        """
+        Usa una red ya construida (p. ej. restaurada de un snapshot) en lugar de generarla.
+        Reinicia las rutas, las órdenes y las cachés de la red anterior.
+
+        Args:
+            graph: Grafo de la red
+            storage_nodes: Nodos de almacenamiento
+            charging_nodes: Estaciones de carga
+            client_nodes: Nodos cliente
+            drone_autonomy: Autonomía del dron (None = mantener la actual)
+        """
+        if drone_autonomy is not None:
+            self.DRONE_AUTONOMY = drone_autonomy
+        self._reset_network(graph)
+        self.orders = []
+        self.order_table = OrderTable()
+        self._collect_metrics()  # Volcar los usos de las rutas que se descartan
+        self.route_registry.clear()
+        self.route_index.clear()
+        for nodes, target, node_type in ((storage_nodes, self._storage_nodes, "storage"),
+                                         (charging_nodes, self._charging_nodes, "charging"),
+                                         (client_nodes, self._client_nodes, "client")):
+            target.extend(nodes)
+            for node_id in nodes:
+                self.node_types[node_id] = node_type
+        self.graph.subscribe(self._on_graph_change)
+
+    def load_network(self, path, file_format='csv', loader=None, **options):
+        """
+        Importa una red real desde archivo en lugar de generarla al azar.
+        Cada nodo cliente recibe un Client, igual que en initialize_network.
+
+        Args:
+            path: Archivo de la red
+            file_format: 'csv', 'edgelist' o 'graphml'
+            loader: GraphLoader configurado (por defecto uno nuevo)
+            **options: Opciones del método de carga (columnas, archivo de nodos, etc.)
+
+        Returns:
+            Graph: Grafo cargado
+
+        Raises:
+            ValueError: Si el formato no es válido o la red no es conexa
+        """
+        loader = loader or GraphLoader()
+        readers = {'csv': loader.load_csv, 'edgelist': loader.load_edge_list, 'graphml': loader.load_graphml}
+        if file_format not in readers:
+            raise ValueError(f"Formato de red no válido: {file_format}")
+        graph = readers[file_format](path, **options)
+        self.restore_network(graph, loader.storage_nodes, loader.charging_nodes, loader.client_nodes)
+        client_types = ["Regular", "Premium", "VIP"]
+        self.clients = []
+        for i, node_id in enumerate(loader.client_nodes):
+            client = Client(f"CLI{i+1}", f"Cliente {i+1}", random.choice(client_types))
+            client.node_id = node_id
+            self.clients.append(client)
+        return graph
+
+    def save_snapshot(self, target):
+        """
+        Guarda el estado completo de la simulación en un snapshot binario (.npz).
+
+        Args:
+            target: Ruta o archivo abierto de destino
+        """
+        SimulationSnapshot.save(self, target)
+
+    def load_snapshot(self, source, sections=SNAPSHOT_SECTIONS):
+        """
+        Restaura la simulación desde un snapshot guardado con save_snapshot.
+
+        Args:
+            source: Ruta o archivo abierto del snapshot
+            sections: Secciones a restaurar ('graph', 'routes', 'orders', 'path_cache')
+
+        Returns:
+            tuple: (grafo, órdenes, clientes), igual que initialize_simulation
+        """
+        SimulationSnapshot.open(source).restore(self, sections)
+        return self.graph, self.orders, self.clients
+
+    def use_route_store(self, store=None):
+        """
+        Conecta una caché persistente de rutas. Los resultados de
+        find_path_with_charging se guardan en disco bajo la huella de la red y
+        se leen de ahí cuando la misma red vuelve a usarse.
+
+        Args:
+            store: RouteCacheStore o ruta del archivo SQLite (None = archivo por defecto)
+
+        Returns:
+            RouteCacheStore: Caché conectada
+        """
+        if not isinstance(store, RouteCacheStore):
+            store = RouteCacheStore(store) if store else RouteCacheStore()
+        self.route_store = store
+        self._warm_store_key = None
+        return self.route_store
+
+    def use_event_log(self, log):
+        """
+        Conecta una bitácora binaria de eventos. Desde ese momento se
+        registran la creación de órdenes, los usos de rutas, la asignación de
+        rutas y las entregas completadas.
+
+        Args:
+            log: EventLog o ruta del archivo de la bitácora
+
+        Returns:
+            EventLog: Bitácora conectada
+        """
+        self.event_log = log if isinstance(log, EventLog) else EventLog(log)
+        return self.event_log
+
+    def use_metrics(self, registry=None):
+        """
+        Conecta un registro de métricas. Las consultas de rutas solo
+        incrementan contadores enteros propios, que se vuelcan al registro en
+        cada exposición; el tiempo de búsqueda se mide únicamente cuando la
+        consulta no está en caché.
+
+        Args:
+            registry: MetricsRegistry (None = el registro compartido)
+
+        Returns:
+            MetricsRegistry: Registro conectado
+        """
+        registry = registry if registry is not None else MetricsRegistry.shared()
+        self._metric = {
+            'lookups': registry.counter('sisdrones_route_lookups_total',
+                                        'Consultas de rutas a find_path_with_charging'),
+            'cache_hits': registry.counter('sisdrones_route_cache_hits_total',
+                                           'Consultas de rutas resueltas desde caché', ('cache',)),
+            'searches': registry.counter('sisdrones_route_searches_total',
+                                         'Consultas de rutas que ejecutaron una búsqueda'),
+            'hit_ratio': registry.gauge('sisdrones_route_cache_hit_ratio',
+                                        'Fracción de consultas de rutas resueltas desde caché'),
+            'search_seconds': registry.histogram('sisdrones_route_search_seconds',
+                                                 'Duración de las búsquedas de rutas no cacheadas', ('method',)),
+            'orders_routed': registry.counter('sisdrones_orders_routed_total',
+                                              'Órdenes a las que se registró una ruta'),
+            'route_recharges': registry.histogram('sisdrones_route_recharges',
+                                                  'Recargas por ruta registrada', buckets=(0, 1, 2, 3, 5, 8)),
+            'node_visits': registry.counter('sisdrones_node_visits_total',
+                                            'Visitas a nodos de las rutas registradas, por rol', ('role',)),
+        }
+        self._reported = (0, 0, 0)
+        self._reported_routes = [(route, route.frequency) for route in self.route_registry.routes()]
+        self.metrics = registry
+        registry.add_collector(self._collect_metrics)
+        return registry
+
+    def _collect_metrics(self):
+        """
+        Vuelca al registro de métricas los contadores de consultas y los usos
+        de rutas acumulados (órdenes enrutadas, visitas por rol y recargas de
+        las rutas nuevas).
+        """
+        if self.metrics is None:
+            return
+        lookups, store_hits, searches = self._route_lookups, self._route_store_hits, self._route_searches
+        last_lookups, last_store_hits, last_searches = self._reported
+        self._reported = (lookups, store_hits, searches)
+        metric = self._metric
+        metric['lookups'].inc(lookups - last_lookups)
+        metric['cache_hits'].labels('store').inc(store_hits - last_store_hits)
+        metric['cache_hits'].labels('memory').inc(
+            (lookups - store_hits - searches) - (last_lookups - last_store_hits - last_searches))
+        metric['searches'].inc(searches - last_searches)
+        total = metric['lookups'].value
+        metric['hit_ratio'].set((total - metric['searches'].value) / total if total else 0.0)
+
+        # Usos de rutas desde el último volcado, a partir de sus frecuencias:
+        # register_route no paga nada por las métricas
+        reported = self._reported_routes
+        visits = [0] * len(METRIC_ROLES)
+        routed = 0
+        current = []
+        for i, route in enumerate(self.route_registry.routes()):
+            frequency = route.frequency
+            if i < len(reported) and reported[i][0] is route:
+                uses = frequency - reported[i][1]
+            else:
+                uses = frequency
+                metric['route_recharges'].observe(path_recharges(route.nodes))
+            if uses > 0:
+                routed += uses
+                for node in route.nodes:
+                    visits[role_of(node)] += uses
+            current.append((route, frequency))
+        self._reported_routes = current
+        metric['orders_routed'].inc(routed)
+        for role, count in enumerate(visits):
+            if count:
+                metric['node_visits'].labels(METRIC_ROLES[role]).inc(count)
+
+    def replay_events(self, log=None, start=None, stop=None):
+        """
+        Reconstruye rutas, frecuencias, órdenes y listas de órdenes de los
+        clientes reproduciendo una bitácora sobre el estado actual (p. ej.
+        tras una caída: cargar el último snapshot y reproducir desde el
+        registro en que se guardó).
+
+        Args:
+            log: EventLog a reproducir (None = la bitácora conectada)
+            start: Primer registro (None = el del snapshot cargado, o 0)
+            stop: Registro final exclusivo (None = hasta el último)
+
+        Returns:
+            dict: Resultado de EventReplay.replay (incluye el AVL de rutas)
+
+        Raises:
+            ValueError: Si no hay bitácora para reproducir
+        """
+        log = log if log is not None else self.event_log
+        if log is None:
+            raise ValueError("No hay una bitácora de eventos para reproducir")
+        start = self.event_log_offset if start is None else start
+        return EventReplay(log).replay(self, start, stop)
+
+    def route_store_key(self):
+        """
+        Huella de la red para la caché persistente: contenido del grafo (los
+        roles van en el prefijo de cada ID) y autonomía del dron.
+
+        Returns:
+            str: Hash SHA-1 en hexadecimal
+        """
+        return hashlib.sha1(f"{self.graph.fingerprint()}:{self.DRONE_AUTONOMY}".encode()).hexdigest()
+
+    def _cached_from_store(self, cache_key):
+        """
+        Lectura a través de la caché persistente. La primera consulta sobre una
+        red carga en path_cache todos sus resultados guardados de una sola vez.
+        """
+        store_key = self.route_store_key()
+        if store_key != self._warm_store_key:
+            self._warm_store_key = store_key
+            for key, result in self.route_store.load(store_key).items():
+                if key not in self.path_cache:
+                    self._cache_path(key, result)
+        return self.path_cache.get(cache_key)
+
+    def _cache_path(self, cache_key, result):
+        """Guarda un resultado en path_cache e indexa sus nodos para invalidación selectiva."""
+        self.path_cache[cache_key] = result
+        if result['completed']:
+            for node in result['path']:
+                self._cache_keys_by_node.setdefault(node, set()).add(cache_key)
+        else:
+            self._failed_cache_keys.add(cache_key)
+
+    def _clear_path_cache(self):
+        """Vacía path_cache y sus índices."""
+        self.path_cache.clear()
+        self._cache_keys_by_node.clear()
+        self._failed_cache_keys.clear()
+
+    def _drop_cached_path(self, cache_key):
+        """Elimina una entrada de path_cache y sus referencias en los índices."""
+        result = self.path_cache.pop(cache_key, None)
+        if result is None:
+            return
+        self._failed_cache_keys.discard(cache_key)
+        for node in result['path']:
+            keys = self._cache_keys_by_node.get(node)
+            if keys is not None:
+                keys.discard(cache_key)
+
+    def _on_graph_change(self, change):
+        """
+        Invalida o repara solo lo que toca el elemento cambiado del grafo:
+        entradas de path_cache que lo usan y rutas del índice que lo recorren.
+        Si el cambio puede acortar o habilitar rutas (arista nueva, peso menor,
+        vértice rehabilitado) se descarta todo path_cache: cualquier resultado,
+        completo o fallido, podría mejorar sin pasar hoy por el elemento.
+        
+        Args:
+            change: GraphChange publicado por el grafo
+        """
+        if change.is_edge_change():
+            candidates = (self._cache_keys_by_node.get(change.start, set())
+                          & self._cache_keys_by_node.get(change.end, set()))
+            stale_keys = {key for key in candidates
+                          if self._path_uses_edge(self.path_cache[key]['path'], change.start, change.end)}
+            affected_routes = self.route_index.routes_through_edge(change.start, change.end)
+        else:
+            stale_keys = set(self._cache_keys_by_node.get(change.start, ()))
+            affected_routes = self.route_index.routes_through(change.start)
+        if change.improves():
+            self._clear_path_cache()
+        else:
+            for cache_key in stale_keys:
+                self._drop_cached_path(cache_key)
+        self._repair_routes(affected_routes)
+
+        # Si solo se quitó un elemento, el árbol inverso de cada router sigue
+        # siendo una cota válida: se excluye el elemento (el router regenera sus
+        # rutas) y se conserva; cualquier otro cambio los descarta
+        if change.kind == EDGE_REMOVED:
+            for router in self._alternative_routers.values():
+                router.exclude(edge=(change.start, change.end))
+        elif change.kind == VERTEX_DISABLED:
+            for router in self._alternative_routers.values():
+                router.exclude(node=change.start)
+        else:
+            self._alternative_routers.clear()
+
+    @staticmethod
+    def _path_uses_edge(path, start, end):
+        return any(path[i] == start and path[i + 1] == end for i in range(len(path) - 1))
+
+    def _repair_routes(self, routes):
+        """
+        Recalcula el perfil de las rutas afectadas por un cambio del grafo.
+        Las que siguen siendo factibles se reindexan con sus costos nuevos; las
+        demás se retiran del índice y del registro para que no se reutilicen.
+        Se quitan todas del índice antes de reindexar cualquiera, para que
+        ningún prefijo compartido conserve el costo anterior.
+        """
+        for route in routes:
+            self.route_index.remove(route)
+        for route in routes:
+            route.invalidate_profile()
+            nodes = route.nodes
+            usable = (all(self.graph.has_edge(nodes[i], nodes[i + 1]) for i in range(len(nodes) - 1))
+                      and not any(self.graph.is_disabled(node) for node in nodes))
+            if usable and route.energy_profile(self.graph, self.DRONE_AUTONOMY).is_viable(self.DRONE_AUTONOMY):
+                self.route_index.add(route, self.graph)
+            else:
+                self.route_registry.retire(route)
+
     def get_node_type(self, node_id):
         """Get the type of a node based on its ID prefix."""
         if node_id.startswith('S'):
@@ -170,10 +644,127 @@ class SimulationInitializer:
         visited = set(self.graph.bfs(start))
         return len(visited) == len(self.graph.vertices())
 
-    def find_path_with_charging(self, start, end):
+    def prepare_landmarks(self, num_landmarks=4):
+        """
+        Preprocesa los landmarks para la búsqueda A* con cotas ALT.
+        Se recalculan automáticamente si el grafo cambia.
+
+        Args:
+            num_landmarks: Cantidad de landmarks a usar
+
+        Returns:
+            LandmarkRouter: Router preprocesado
+        """
+        self.landmark_router = LandmarkRouter(self.graph.compact(), self.DRONE_AUTONOMY)
+        self.landmark_router.preprocess(num_landmarks)
+        return self.landmark_router
+
+    def prepare_overlay(self):
+        """
+        Construye el overlay de tramos entre estaciones de carga. Se mantiene
+        actualizado de forma incremental ante los cambios del grafo.
+
+        Returns:
+            ChargingOverlay: Overlay construido
+        """
+        self.charging_overlay = ChargingOverlay(self.graph, self._charging_nodes, self.DRONE_AUTONOMY).build()
+        return self.charging_overlay
+
+    def prepare_hierarchy(self, index_path=None):
+        """
+        Prepara la jerarquía de contracción. Si se indica un archivo de índice
+        y corresponde al grafo actual se carga; si no, se construye y se guarda.
+
+        Args:
+            index_path: Archivo .npz del índice (opcional)
+
+        Returns:
+            ContractionHierarchy: Jerarquía lista para consultas
+        """
+        hierarchy = None
+        if index_path and os.path.exists(index_path):
+            try:
+                hierarchy = ContractionHierarchy.load(index_path, self.graph)
+                hierarchy.autonomy = self.DRONE_AUTONOMY
+            except ValueError:
+                hierarchy = None  # Índice de otra red o formato: se reconstruye
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy.build(self.graph, self.DRONE_AUTONOMY)
+            if index_path:
+                hierarchy.save(index_path)
+        self.contraction_hierarchy = hierarchy
+        return hierarchy
+
+    def prepare_feasibility_matrix(self, directory=None):
+        """
+        Prepara la matriz de factibilidad de todos los pares. Si se indica un
+        directorio con matrices del grafo actual se abren con memoria mapeada
+        (compartibles entre procesos); si no, se calculan y se guardan.
+
+        Args:
+            directory: Directorio de las matrices .npy (opcional)
+
+        Returns:
+            FeasibilityMatrix: Matriz lista para consultas
+        """
+        matrix = None
+        if directory and os.path.exists(os.path.join(directory, 'meta.json')):
+            try:
+                matrix = FeasibilityMatrix.load(directory, self.graph)
+                if matrix.autonomy != self.DRONE_AUTONOMY:
+                    matrix = None
+            except ValueError:
+                matrix = None  # Matrices de otra red o formato: se recalculan
+        if matrix is None:
+            matrix = FeasibilityMatrix.build(self.graph, self.DRONE_AUTONOMY)
+            if directory:
+                matrix.save(directory)
+        self.feasibility_matrix = matrix
+        return matrix
+
+    def prepare_depot_assignment(self):
+        """
+        Asigna cada cliente a su depósito factible más cercano. La tabla se
+        mantiene actualizada de forma incremental ante los cambios del grafo.
+
+        Returns:
+            DepotAssignment: Asignación calculada
+        """
+        self.depot_assignment = DepotAssignment(self.graph, self._storage_nodes, self._client_nodes,
+                                                self._charging_nodes, self.DRONE_AUTONOMY).build()
+        return self.depot_assignment
+
+    def check_feasibility(self, origin, destination):
+        """
+        Consulta O(1) de si un dron puede ir de origen a destino, con el costo
+        y las recargas de la mejor ruta. La matriz se recalcula si el grafo cambió.
+
+        Args:
+            origin: Nodo de origen
+            destination: Nodo de destino
+
+        Returns:
+            dict: {'feasible', 'cost', 'recharges', 'battery_left'}
+        """
+        if self.feasibility_matrix is None or self.feasibility_matrix.is_stale(self.graph):
+            self.prepare_feasibility_matrix()
+        return self.feasibility_matrix.lookup(origin, destination)
+
+    def find_path_with_charging(self, start, end, method='bfs'):
         """
         Encuentra una ruta entre dos nodos considerando la autonomía del dron y estaciones de carga.
         Si no hay ruta completa, devuelve el camino parcial más largo posible y la batería restante.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            method: 'bfs' (búsqueda en anchura), 'bidirectional' (búsqueda desde
+                ambos extremos), 'alt' (A* con cotas de landmarks),
+                'overlay' (tramos entre estaciones de carga) o 'ch' (jerarquía de
+                contracción: camino de costo mínimo validado con la batería y
+                reparado con el overlay si no es factible); 'bidirectional', 'alt'
+                y 'overlay' minimizan recargas y luego costo
+
         Returns:
             dict: {
                 'path': [...],
@@ -185,27 +776,213 @@ class SimulationInitializer:
                 'full_path': [...],
                 'full_battery_left': int
             }
+
+        Raises:
+            ValueError: Si el método no es válido
         """
-        if not (start in self.graph.vertices() and end in self.graph.vertices()):
-            return {'path': [], 'completed': False, 'battery_left': None, 'reason': 'Nodos no válidos', 'partial_path': [], 'partial_battery_left': None, 'full_path': [], 'full_battery_left': None}
+        instrumentation = self.instrumentation
+        if not instrumentation.enabled:
+            return self._find_path_with_charging(start, end, method, None)
+        stats = {}
+        began = time.perf_counter()
+        result = self._find_path_with_charging(start, end, method, stats)
+        instrumentation.record(method, start, end, time.perf_counter() - began, result, stats)
+        return result
 
-        cache_key = f"{start}-{end}"
+    def _find_path_with_charging(self, start, end, method, stats):
+        """
+        Implementación de find_path_with_charging.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            method: Método de búsqueda
+            stats: Dict donde dejar el origen del resultado y los contadores de
+                la búsqueda (None = sin instrumentación)
+        """
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"Método de búsqueda no válido: {method}")
+        if not (self.graph.has_vertex(start) and self.graph.has_vertex(end)):
+            return invalid_nodes_result()
+
+        self._route_lookups += 1
+        cache_key = f"{start}-{end}" if method == 'bfs' else f"{start}-{end}-{method}"
         if cache_key in self.path_cache:
+            if stats is not None:
+                stats['cache'] = CACHE_MEMORY
             return self.path_cache[cache_key]
+        if self.route_store is not None:
+            cached = self._cached_from_store(cache_key)
+            if cached is not None:
+                self._route_store_hits += 1
+                if stats is not None:
+                    stats['cache'] = CACHE_STORE
+                return cached
+        self._route_searches += 1
+        if stats is not None:
+            stats['cache'] = CACHE_MISS
+        timed = stats is not None or self.metrics is not None
+        if timed:
+            began = time.perf_counter()
+
+        if method == 'bidirectional':
+            result = BidirectionalRouter(self.graph.compact(), self.DRONE_AUTONOMY).find_path(start, end, stats)
+        elif method == 'alt':
+            if self.landmark_router is None or self.landmark_router.graph.is_stale(self.graph):
+                self.prepare_landmarks()
+            result = self.landmark_router.find_path(start, end)
+        elif method == 'overlay':
+            if self.charging_overlay is None:
+                self.prepare_overlay()
+            result = self.charging_overlay.find_path(start, end)
+        elif method == 'ch':
+            if self.contraction_hierarchy is None or self.contraction_hierarchy.fingerprint != self.graph.fingerprint():
+                self.prepare_hierarchy()
+            if self.charging_overlay is None:
+                self.prepare_overlay()
+            result = self.contraction_hierarchy.find_path(start, end, fallback=self.charging_overlay.find_path)
+        else:
+            result = self._find_path_bfs(start, end, stats)
+        if timed:
+            seconds = time.perf_counter() - began
+            if stats is not None:
+                stats['search_seconds'] = seconds
+            if self.metrics is not None:
+                self._metric['search_seconds'].labels(method).observe(seconds)
+        self._cache_path(cache_key, result)
+        if self.route_store is not None:
+            self.route_store.put(self.route_store_key(), cache_key, result)
+        return result
+
+    def find_route_alternatives(self, start, end, max_results=5, max_labels=12):
+        """
+        Rutas alternativas no dominadas en (costo total, recargas, saltos).
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            max_results: Máximo de alternativas (las de menor costo)
+            max_labels: Máximo de etiquetas por nodo en la búsqueda
+
+        Returns:
+            list: Dicts con 'path', 'cost', 'recharges', 'hops' y 'battery_left'
+        """
+        router = ParetoRouter(self.graph.compact(), self.DRONE_AUTONOMY, max_labels=max_labels)
+        return router.find_frontier(start, end, max_results=max_results)
+
+    def _alternative_router(self, start, end):
+        router = self._alternative_routers.get((start, end))
+        if router is None:
+            router = KShortestRouter(self.graph.compact(), self.DRONE_AUTONOMY, start, end)
+            self._alternative_routers[(start, end)] = router
+        return router
+
+    def find_alternative_routes(self, start, end, k=3):
+        """
+        Las k mejores rutas factibles entre dos nodos, en orden de (recargas, costo).
+        Las alternativas de cada par se guardan juntas y pedir más continúa la
+        búsqueda anterior.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            k: Cantidad de alternativas
+
+        Returns:
+            list: Dicts con 'path', 'cost', 'recharges' y 'battery_left'
+        """
+        if not (self.graph.has_vertex(start) and self.graph.has_vertex(end)):
+            return []
+        return self._alternative_router(start, end).alternatives(k)
+
+    def reroute(self, start, end, failed_node=None, failed_edge=None):
+        """
+        Ruta de respaldo que evita un nodo o una arista que falló, reutilizando
+        las alternativas ya calculadas para el par.
+
+        Args:
+            start: Nodo de origen
+            end: Nodo de destino
+            failed_node: Nodo que falló (opcional)
+            failed_edge: Tupla (inicio, fin) de la arista que falló (opcional)
+
+        Returns:
+            dict: Mismo formato que find_path_with_charging
+        """
+        if not (self.graph.has_vertex(start) and self.graph.has_vertex(end)):
+            return invalid_nodes_result()
+        router = self._alternative_router(start, end)
+        router.exclude(node=failed_node, edge=failed_edge)
+        alternatives = router.alternatives(1)
+        if not alternatives:
+            return failed_result([start], self.DRONE_AUTONOMY)
+        return completed_result(alternatives[0]['path'], alternatives[0]['battery_left'])
+
+    def _find_path_bfs(self, start, end, stats=None):
+        """
+        Búsqueda en anchura sobre estados (nodo, batería) con el menor número de recargas.
+
+        Los estados se codifican como enteros nodo * (AUTONOMÍA + 1) + batería
+        sobre una tabla preasignada (bytearray) que guarda, para cada nodo y
+        nivel de batería, las menores recargas con que se alcanzó el nodo con
+        al menos esa batería. Un estado se poda si el nodo ya se alcanzó con
+        igual o más batería y no más recargas. Los roles salen del arreglo de
+        roles de la instantánea compacta del grafo.
+
+        Con stats (ver Instrumentation) se informan los estados generados, el
+        pico de la cola y las recargas consideradas; sin stats la búsqueda no
+        lleva ninguna cuenta adicional.
+        """
+        graph = self.graph.compact()
+        autonomy = self.DRONE_AUTONOMY
+        source, target = graph.index[start], graph.index[end]
+        charging = graph.is_charging.tolist()
+        out_lists = graph.out_lists()
+        low_battery = autonomy * 0.3
+
+        integral = graph.integral_weights and autonomy == int(autonomy)
+        if integral:
+            width = int(autonomy) + 1
+            unreached = 255
+            best_recharges = bytearray([unreached]) * (graph.num_vertices * width)
+        else:
+            frontier = {}  # Sin pesos enteros: etiquetas (batería, recargas) por nodo
+
+        def dominated(node, battery, recharges):
+            if integral:
+                return best_recharges[node * width + battery] <= recharges
+            return any(b >= battery and r <= recharges for b, r in frontier.get(node, ()))
+
+        def mark(node, battery, recharges):
+            if integral:
+                # Mínimo de recargas para toda batería <= battery (no creciente hacia abajo)
+                state = node * width + battery
+                base = node * width
+                value = min(recharges, unreached - 1)
+                while state >= base and best_recharges[state] > value:
+                    best_recharges[state] = value
+                    state -= 1
+            else:
+                frontier.setdefault(node, []).append((battery, recharges))
+
+        charging_first = {}  # Nodo -> vecinos con las estaciones de carga primero
 
-        queue = deque([(start, [start], self.DRONE_AUTONOMY, 0)])
-        visited = set()  # (nodo, batería_restante)
-        best_path = None
+        # Etiquetas: (nodo, batería, recargas, padre, largo del camino)
+        labels = [(source, autonomy, 0, -1, 1)]
+        mark(source, autonomy, 0)
+        queue = deque([0])
+        best_label = None
         min_recharges = float('inf')
-        longest_partial = ([], self.DRONE_AUTONOMY, 0)
+        longest_partial = None
 
         while queue:
-            current, path, battery, num_recharges = queue.popleft()
+            label = queue.popleft()
+            current, battery, num_recharges, _, length = labels[label]
 
             # Si llegamos al destino, actualizamos el mejor camino si tiene menos recargas
-            if current == end:
+            if current == target:
                 if num_recharges < min_recharges:
-                    best_path = (path, battery, num_recharges)
+                    best_label = label
                     min_recharges = num_recharges
                 continue
 
@@ -214,58 +991,50 @@ class SimulationInitializer:
                 continue
 
             # Guardar el camino parcial más largo
-            if len(path) > len(longest_partial[0]):
-                longest_partial = (path, battery, num_recharges)
-
-            neighbors = self.graph.get_neighbors(current)
-            if battery < self.DRONE_AUTONOMY * 0.3:
-                neighbors = sorted(neighbors, key=lambda x: x.startswith('C'), reverse=True)
-
-            for neighbor in neighbors:
-                edge = self.graph.get_edge(current, neighbor)
-                if edge:
-                    edge_cost = edge.element()
-                    new_battery = battery
-                    new_recharges = num_recharges
-                    if current.startswith('C') or neighbor.startswith('C'):
-                        new_battery = self.DRONE_AUTONOMY
-                        if not current.startswith('C'):
-                            new_recharges += 1
-                    else:
-                        new_battery -= edge_cost
-                    state = (neighbor, new_battery)
-                    if new_battery >= 0 and state not in visited:
-                        visited.add(state)
-                        new_path = path + [neighbor]
-                        queue.append((neighbor, new_path, new_battery, new_recharges))
-
-        if best_path:
-            result = {
-                'path': best_path[0],
-                'completed': True,
-                'battery_left': best_path[1],
-                'reason': '',
-                'partial_path': best_path[0],
-                'partial_battery_left': best_path[1],
-                'full_path': best_path[0],
-                'full_battery_left': best_path[1]
-            }
-            self.path_cache[cache_key] = result
-            return result
-        else:
-            # Devolver el camino parcial más largo
-            result = {
-                'path': longest_partial[0],
-                'completed': False,
-                'battery_left': longest_partial[1],
-                'reason': 'No se pudo completar la ruta con la autonomía disponible',
-                'partial_path': longest_partial[0],
-                'partial_battery_left': longest_partial[1],
-                'full_path': [],
-                'full_battery_left': None
-            }
-            self.path_cache[cache_key] = result
-            return result
+            if longest_partial is None or length > labels[longest_partial][4]:
+                longest_partial = label
+
+            neighbors = out_lists[current]
+            if battery < low_battery:
+                if current not in charging_first:
+                    charging_first[current] = sorted(neighbors, key=lambda item: charging[item[0]], reverse=True)
+                neighbors = charging_first[current]
+
+            from_charging = charging[current]
+            for neighbor, weight in neighbors:
+                new_battery, new_recharges = advance_battery(
+                    battery, num_recharges, from_charging, charging[neighbor], weight, autonomy)
+                if new_battery >= 0 and not dominated(neighbor, new_battery, new_recharges):
+                    mark(neighbor, new_battery, new_recharges)
+                    labels.append((neighbor, new_battery, new_recharges, label, length + 1))
+                    queue.append(len(labels) - 1)
+
+        if stats is not None:
+            # La cola es FIFO y cada etiqueta se encola al expandir su padre: tras
+            # expandir el padre p de la etiqueta i quedan en cola al menos i - p etiquetas
+            queue_peak = recharges_considered = 0
+            for index in range(1, len(labels)):
+                _, _, recharges, parent, _ = labels[index]
+                queue_peak = max(queue_peak, index - parent)
+                recharges_considered += recharges > labels[parent][2]
+            stats['states'] = len(labels)
+            stats['queue_peak'] = max(queue_peak, 1)
+            stats['recharges_considered'] = recharges_considered
+
+        if best_label is not None:
+            return completed_result(self._label_path(graph, labels, best_label), labels[best_label][1])
+        # Devolver el camino parcial más largo
+        return failed_result(self._label_path(graph, labels, longest_partial), labels[longest_partial][1])
+
+    @staticmethod
+    def _label_path(graph, labels, label):
+        """Reconstruye el camino de una etiqueta siguiendo los punteros al padre."""
+        path = []
+        while label != -1:
+            node, _, _, label, _ = labels[label]
+            path.append(graph.ids[node])
+        path.reverse()
+        return path
 
     def generate_orders(self, num_orders):
         """
@@ -276,54 +1045,54 @@ class SimulationInitializer:
             raise ValueError("El grafo no está inicializado")
             
         orders = []
+        self.order_table = OrderTable(capacity=num_orders)
         client_dict = {client.node_id: client for client in self.clients}
+        if self.depot_assignment is None:
+            with self._phase('depot_assignment'):
+                self.prepare_depot_assignment()
         
         # Reiniciar contadores de frecuencia
-        self.route_frequencies = {}
-        self.routes = []
+        self._collect_metrics()  # Volcar los usos de las rutas que se descartan
+        self.route_registry.clear()
+        self.route_index.clear()
+        if self.event_log is not None:
+            self.event_log.reset()
+        
+        # Paso 1: elegir y registrar la ruta de cada orden (una sola fase medida;
+        # cada registro influye en las rutas que reutilizan las órdenes siguientes)
+        routed = []  # (número de orden, origen, destino, ruta)
+        with self._phase('route_registration'):
+            for i in range(num_orders):
+                try:
+                    # Seleccionar el destino y despachar desde su depósito más cercano
+                    destination = random.choice(self._client_nodes)
+                    assignment = self.depot_assignment.assignment(destination)
+                    if assignment is None:
+                        continue  # Ningún depósito alcanza al cliente
+                    origin = assignment['depot']
+                    
+                    # Reutilizar la ruta registrada entre este origen y destino, si existe,
+                    # o un prefijo de otra ruta que ya pase por el destino
+                    ruta_existente = self.route_registry.find_by_endpoints(origin, destination)
+                    
+                    if ruta_existente:
+                        path = ruta_existente.nodes
+                    else:
+                        path = self.route_index.find_prefix(origin, destination)
+                    if path is None:
+                        # La búsqueda multiorigen ya dejó la mejor ruta desde el depósito
+                        path = assignment['path']
+                    
+                    # Registrar el uso de la ruta (actualiza su frecuencia)
+                    routed.append((i, origin, destination, self.register_route(path)))
+                    
+                except Exception as e:
+                    st.error(f"Error generando orden {i+1}: {str(e)}")
+                    continue
         
-        for i in range(num_orders):
+        # Paso 2: crear las órdenes con sus rutas
+        for i, origin, destination, route in routed:
             try:
-                # Seleccionar origen y destino
-                origin = random.choice(self._storage_nodes)
-                destination = random.choice(self._client_nodes)
-                
-                # Buscar si ya existe una ruta frecuente entre este origen y destino
-                ruta_existente = None
-                for route in self.routes:
-                    if route.nodes[0] == origin and route.nodes[-1] == destination:
-                        ruta_existente = route
-                        break
-                
-                if ruta_existente:
-                    path = ruta_existente.nodes
-                    route_key = ' → '.join(path)
-                    ruta_existente.increment_frequency()
-                    route = ruta_existente
-                    completed = True
-                else:
-                    # Encontrar una ruta viable nueva
-                    result = self.find_path_with_charging(origin, destination)
-                    path = result['path']
-                    completed = result['completed']
-                    if not path or not completed:
-                        continue
-                    route_key = ' → '.join(path)
-                    route = Route(f"Route_{len(self.routes)+1}", path)
-                    self.routes.append(route)
-                
-                # Actualizar frecuencia de la ruta
-                if route_key in self.route_frequencies:
-                    self.route_frequencies[route_key] += 1
-                    route.frequency = self.route_frequencies[route_key]
-                else:
-                    self.route_frequencies[route_key] = 1
-                    route.frequency = 1
-                
-                # Calcular el costo total
-                total_cost = sum(self.graph.get_edge(path[j], path[j+1]).element() 
-                               for j in range(len(path)-1))
-                
                 # Obtener cliente
                 client = client_dict.get(destination)
                 if not client:
@@ -336,16 +1105,17 @@ class SimulationInitializer:
                     destination=destination,
                     client_id=client.client_id,
                     client_name=client.name,
-                    priority=client.client_type
+                    priority=client.client_type,
+                    table=self.order_table
                 )
                 
-                # Asignar ruta y costo
+                # Asignar ruta (el costo se calcula en bloque al final)
                 order.assign_route(route)
-                order.route_cost = total_cost
                 
                 # Registrar orden
                 orders.append(order)
                 client.add_order(order)
+                self.record_order(order)
                 
             except Exception as e:
                 st.error(f"Error generando orden {i+1}: {str(e)}")
@@ -354,14 +1124,18 @@ class SimulationInitializer:
         if not orders:
             raise ValueError("No se pudo generar ninguna orden válida.")
         
+        # Costo de todas las órdenes en una pasada (una evaluación por ruta distinta)
+        with self._phase('route_costs'):
+            self.order_table.fill_route_costs(self.graph)
+        
         # Verificar que la suma de frecuencias es igual al número de órdenes
-        total_freq = sum(self.route_frequencies.values())
+        total_freq = self.route_registry.total_frequency()
         if total_freq != len(orders):
             st.warning(f"Error de consistencia: Total de frecuencias ({total_freq}) ≠ Número de órdenes ({len(orders)})")
             
         return orders
 
-    def initialize_simulation(self, num_nodes, num_edges, num_orders):
+    def initialize_simulation(self, num_nodes, num_edges, num_orders, profiler=None):
         """
         Inicializa la simulación completa.
         
@@ -369,23 +1143,38 @@ class SimulationInitializer:
             num_nodes: Número total de nodos
             num_edges: Número de aristas
             num_orders: Número de órdenes a generar
+            profiler: PhaseProfiler para medir las fases de esta ejecución
+                (None = usar self.profiler, si hay uno)
         """
-        # Reiniciar todas las estructuras
-        self.graph = None
-        self.orders = []
-        self.clients = []
-        self.routes = []
-        self.route_frequencies = {}
-        self.node_types = {}  # Reiniciar tipos de nodos
-        
-        # Paso 1: Inicializar la red
-        self.initialize_network(num_nodes, num_edges)
-        
-        if not self.graph or not self.graph.vertices():
-            raise ValueError("No se pudo inicializar la red correctamente")
+        previous_profiler = self.profiler
+        if profiler is not None:
+            self.profiler = profiler
+        try:
+            # Reiniciar todas las estructuras
+            self.graph = None
+            self.orders = []
+            self.clients = []
+            self._collect_metrics()  # Volcar los usos de las rutas que se descartan
+            self.route_registry.clear()
+            self.route_index.clear()
+            self.node_types = {}  # Reiniciar tipos de nodos
+            
+            # Paso 1: Inicializar la red
+            with self._phase('network'):
+                self.initialize_network(num_nodes, num_edges)
             
-        # Paso 2: Generar órdenes
-        self.orders = self.generate_orders(num_orders)
+            if not self.graph or not self.graph.vertices():
+                raise ValueError("No se pudo inicializar la red correctamente")
+                
+            # Paso 2: Generar órdenes
+            with self._phase('orders'):
+                self.orders = self.generate_orders(num_orders)
+            if self.route_store is not None:
+                self.route_store.flush()
+            if self.event_log is not None:
+                self.event_log.flush()
+        finally:
+            self.profiler = previous_profiler
         
         return self.graph, self.orders, self.clients
 
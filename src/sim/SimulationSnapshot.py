@@ -0,0 +1,276 @@
+import json
+import numpy as np
+from src.model.Graph import Graph
+from src.model.NodeRegistry import NodeRegistry
+from src.domain.Client import Client
+from src.domain.Route import Route
+from src.domain.OrderTable import OrderTable
+from src.domain.OrderViews import OrderViews
+
+FORMAT_VERSION = 1
+
+# Secciones que se pueden restaurar por separado
+SECTIONS = ('graph', 'routes', 'orders', 'path_cache')
+
+# Columnas de OrderTable que guardan códigos de nodo del NodeRegistry
+_NODE_COLUMNS = ('origin', 'destination', 'delivered_to')
+
+
+def _strings(values):
+    """Arreglo de texto Unicode (sin pickle) a partir de una lista de strings."""
+    return np.array(list(values), dtype=str) if values else np.zeros(0, dtype='U1')
+
+
+def _json(value):
+    return np.array(json.dumps(value))
+
+
+class SimulationSnapshot:
+    """
+    Snapshot binario del estado de un SimulationInitializer.
+
+    Se guarda como un .npz sin compresión con columnas binarias: el grafo
+    (vértices, aristas y pesos por índice), los roles de los nodos, los
+    clientes, las rutas con sus frecuencias, las columnas del OrderTable y la
+    caché de rutas. NumPy lee cada miembro del .npz recién al pedirlo, así que
+    cada sección se carga solo si se restaura; las órdenes se restauran como
+    columnas y sus vistas Order se crean al recorrerlas.
+
+    Los códigos de nodo dependen del NodeRegistry del proceso, por lo que se
+    guardan junto con sus IDs y se traducen al cargar.
+    """
+
+    def __init__(self, source):
+        """
+        Abre un snapshot sin cargar sus secciones (usar open()).
+
+        Args:
+            source: Ruta o archivo abierto del .npz
+
+        Raises:
+            ValueError: Si el formato no es compatible
+        """
+        self._data = np.load(source, allow_pickle=False)
+        self.meta = json.loads(str(self._data['meta']))
+        if self.meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Versión de snapshot no soportada: {self.meta.get('format_version')}")
+        self._node_map = None
+        self._routes = None
+
+    @classmethod
+    def open(cls, source):
+        """
+        Abre un snapshot guardado con save().
+
+        Args:
+            source: Ruta o archivo abierto del .npz
+
+        Returns:
+            SimulationSnapshot: Snapshot con carga perezosa de secciones
+        """
+        return cls(source)
+
+    @staticmethod
+    def save(simulation, target):
+        """
+        Guarda el estado de la simulación.
+
+        Args:
+            simulation: SimulationInitializer a guardar
+            target: Ruta o archivo abierto de destino (.npz)
+        """
+        graph = simulation.graph
+        vertices = graph.vertices()
+        position = {vertex: i for i, vertex in enumerate(vertices)}
+        edges = list(graph.edge_weights.items())
+        weights = [weight for _, weight in edges]
+        integral = all(isinstance(weight, (int, np.integer)) for weight in weights)
+
+        # Rutas: las del registro y luego las que solo referencia la tabla de órdenes
+        state = simulation.order_table.export_state()
+        routes = simulation.route_registry.routes()
+        registered = len(routes)
+        route_position = {id(route): i for i, route in enumerate(routes)}
+        for route in state['routes']:
+            if id(route) not in route_position:
+                route_position[id(route)] = len(routes)
+                routes.append(route)
+        offsets = np.zeros(len(routes) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(route.codes) for route in routes])
+        route_codes = (np.concatenate([np.frombuffer(route.codes, dtype=np.uint32) for route in routes])
+                       if routes else np.zeros(0, dtype=np.uint32))
+
+        columns = state['columns']
+        used = [route_codes] + [columns[name][columns[name] >= 0] for name in _NODE_COLUMNS]
+        max_code = max((int(codes.max()) for codes in used if len(codes)), default=-1)
+        registry_ids = NodeRegistry.shared().ids()[:max_code + 1]
+
+        clients = simulation.clients
+        arrays = {
+            'meta': _json({'format_version': FORMAT_VERSION, 'autonomy': simulation.DRONE_AUTONOMY,
+                           'num_orders': len(columns['order_id']),
+                           'event_log_records': len(simulation.event_log) if simulation.event_log is not None else 0}),
+            'graph_vertices': _strings(vertices),
+            'graph_src': np.array([position[start] for (start, _), _ in edges], dtype=np.int32),
+            'graph_dst': np.array([position[end] for (_, end), _ in edges], dtype=np.int32),
+            'graph_weights': np.array(weights, dtype=np.int64 if integral else np.float64),
+            'graph_disabled': np.array([graph.is_disabled(vertex) for vertex in vertices], dtype=bool),
+            'storage_nodes': np.array([position[n] for n in simulation._storage_nodes], dtype=np.int32),
+            'charging_nodes': np.array([position[n] for n in simulation._charging_nodes], dtype=np.int32),
+            'client_nodes': np.array([position[n] for n in simulation._client_nodes], dtype=np.int32),
+            'client_ids': _strings(client.client_id for client in clients),
+            'client_names': _strings(client.name for client in clients),
+            'client_types': _strings(client.client_type for client in clients),
+            'client_node_ids': _strings(client.node_id or '' for client in clients),
+            'registry_ids': _strings(registry_ids),
+            'route_ids': _strings(route.route_id for route in routes),
+            'route_offsets': offsets,
+            'route_codes': route_codes,
+            'route_frequency': np.array([route.frequency for route in routes], dtype=np.int64),
+            'route_registered': np.arange(len(routes)) < registered,
+            'route_offered': np.array([i < registered and simulation.route_registry.is_offered(route)
+                                       for i, route in enumerate(routes)], dtype=bool),
+            'route_indexed': np.array([route in simulation.route_index for route in routes], dtype=bool),
+            'orders_categories': _json({'statuses': state['statuses'], 'priorities': state['priorities'],
+                                        'clients': state['clients']}),
+            'orders_routes': np.array([route_position[id(route)] for route in state['routes']], dtype=np.int64),
+            'path_cache': _json(simulation.path_cache),
+        }
+        for name, column in columns.items():
+            arrays[f'orders_{name}'] = column
+        np.savez(target, **arrays)
+
+    def _codes(self, codes):
+        """Traduce códigos de nodo del snapshot a códigos del NodeRegistry actual."""
+        if self._node_map is None:
+            intern = NodeRegistry.shared().intern
+            self._node_map = np.array([intern(node) for node in self._data['registry_ids'].tolist()] + [-1],
+                                      dtype=np.int64)
+        return self._node_map[codes]
+
+    def graph(self):
+        """
+        Reconstruye el grafo y las listas de nodos por rol.
+
+        Returns:
+            tuple: (Graph, nodos de almacenamiento, de carga, clientes)
+        """
+        data = self._data
+        vertices = data['graph_vertices'].tolist()
+        graph = Graph()
+        for vertex in vertices:
+            graph.add_vertex(vertex)
+        for start, end, weight in zip(data['graph_src'].tolist(), data['graph_dst'].tolist(),
+                                      data['graph_weights'].tolist()):
+            graph.add_edge(vertices[start], vertices[end], weight)
+        for vertex, disabled in zip(vertices, data['graph_disabled'].tolist()):
+            if disabled:
+                graph.disable_vertex(vertex)
+        roles = [[vertices[i] for i in data[name].tolist()]
+                 for name in ('storage_nodes', 'charging_nodes', 'client_nodes')]
+        return (graph, *roles)
+
+    def clients(self):
+        """Clientes del snapshot (sin órdenes asociadas)."""
+        data = self._data
+        clients = []
+        for client_id, name, client_type, node_id in zip(
+                data['client_ids'].tolist(), data['client_names'].tolist(),
+                data['client_types'].tolist(), data['client_node_ids'].tolist()):
+            client = Client(client_id, name, client_type)
+            client.node_id = node_id or None
+            clients.append(client)
+        return clients
+
+    def routes(self):
+        """
+        Rutas del snapshot con sus IDs y frecuencias.
+
+        Returns:
+            list: Objetos Route (las registradas primero)
+        """
+        if self._routes is None:
+            data = self._data
+            offsets = data['route_offsets'].tolist()
+            codes = self._codes(data['route_codes'].astype(np.int64))
+            decode = NodeRegistry.shared().decode
+            routes = []
+            for i, (route_id, frequency) in enumerate(zip(data['route_ids'].tolist(),
+                                                          data['route_frequency'].tolist())):
+                route = Route(route_id, decode(codes[offsets[i]:offsets[i + 1]].tolist()))
+                route.frequency = frequency
+                routes.append(route)
+            self._routes = routes
+        return self._routes
+
+    def order_table(self):
+        """
+        Tabla de órdenes restaurada a partir de sus columnas.
+
+        Returns:
+            OrderTable: Tabla con todas las órdenes del snapshot
+        """
+        data = self._data
+        categories = json.loads(str(data['orders_categories']))
+        columns = {}
+        for key in data.files:
+            if key.startswith('orders_') and key not in ('orders_categories', 'orders_routes'):
+                name = key[len('orders_'):]
+                column = data[key]
+                columns[name] = self._codes(column) if name in _NODE_COLUMNS else column
+        routes = self.routes()
+        table_routes = [routes[i] for i in data['orders_routes'].tolist()]
+        return OrderTable.from_state(columns, categories['statuses'], categories['priorities'],
+                                     categories['clients'], table_routes)
+
+    def path_cache(self):
+        """Caché de rutas del snapshot ({clave: resultado})."""
+        return json.loads(str(self._data['path_cache']))
+
+    def restore(self, simulation, sections=SECTIONS):
+        """
+        Restaura el snapshot en una simulación, reemplazando su estado.
+
+        Args:
+            simulation: SimulationInitializer destino
+            sections: Secciones a restaurar (el grafo siempre se restaura)
+        """
+        graph, storage, charging, clients_nodes = self.graph()
+        simulation.restore_network(graph, storage, charging, clients_nodes, self.meta['autonomy'])
+        simulation.clients = self.clients()
+        simulation.event_log_offset = self.meta.get('event_log_records', 0)
+
+        if 'routes' in sections or 'orders' in sections:
+            data = self._data
+            routes = self.routes()
+            registered = data['route_registered'].tolist()
+            offered = data['route_offered'].tolist()
+            simulation.route_registry.restore([r for r, keep in zip(routes, registered) if keep],
+                                              [o for o, keep in zip(offered, registered) if keep])
+            for route, indexed in zip(routes, data['route_indexed'].tolist()):
+                if indexed:
+                    simulation.route_index.add(route, simulation.graph)
+
+        if 'orders' in sections:
+            table = self.order_table()
+            simulation.order_table = table
+            simulation.orders = OrderViews(table)
+            self._attach_orders(table, simulation.clients)
+
+        if 'path_cache' in sections:
+            for key, result in self.path_cache().items():
+                simulation._cache_path(key, result)
+
+    @staticmethod
+    def _attach_orders(table, clients):
+        """Asigna a cada cliente sus órdenes como vistas perezosas agrupadas por fila."""
+        if not clients:
+            return
+        client_pairs = table.export_state()['clients']
+        slot = {client.client_id: i for i, client in enumerate(clients)}
+        code_slot = np.array([slot.get(client_id, -1) for client_id, _ in client_pairs] + [-1], dtype=np.int64)
+        row_slot = code_slot[table.column('client')]
+        rows = np.argsort(row_slot, kind='stable')
+        bounds = np.searchsorted(row_slot[rows], np.arange(len(clients) + 1))
+        for i, client in enumerate(clients):
+            client.orders = OrderViews(table, rows[bounds[i]:bounds[i + 1]])
@@ -0,0 +1,80 @@
+"""Helpers compartidos por los algoritmos de ruteo con restricción de batería."""
+
+NO_ROUTE_REASON = 'No se pudo completar la ruta con la autonomía disponible'
+INVALID_NODES_REASON = 'Nodos no válidos'
+
+
+def completed_result(path, battery_left):
+    """
+    Construye el resultado de una ruta completa con el formato de find_path_with_charging.
+
+    Args:
+        path: Lista de nodos de la ruta
+        battery_left: Batería restante al llegar al destino
+
+    Returns:
+        dict: Resultado de la búsqueda
+    """
+    return {
+        'path': path,
+        'completed': True,
+        'battery_left': battery_left,
+        'reason': '',
+        'partial_path': path,
+        'partial_battery_left': battery_left,
+        'full_path': path,
+        'full_battery_left': battery_left
+    }
+
+
+def failed_result(partial_path, battery_left, reason=NO_ROUTE_REASON):
+    """
+    Construye el resultado de una búsqueda sin ruta completa.
+
+    Args:
+        partial_path: Camino parcial más largo alcanzado
+        battery_left: Batería restante al final del camino parcial
+        reason: Motivo del fallo
+
+    Returns:
+        dict: Resultado de la búsqueda
+    """
+    return {
+        'path': partial_path,
+        'completed': False,
+        'battery_left': battery_left,
+        'reason': reason,
+        'partial_path': partial_path,
+        'partial_battery_left': battery_left,
+        'full_path': [],
+        'full_battery_left': None
+    }
+
+
+def invalid_nodes_result():
+    """Resultado para un origen o destino inexistente."""
+    return {'path': [], 'completed': False, 'battery_left': None, 'reason': INVALID_NODES_REASON,
+            'partial_path': [], 'partial_battery_left': None, 'full_path': [], 'full_battery_left': None}
+
+
+def advance_battery(battery, recharges, from_charging, to_charging, weight, autonomy):
+    """
+    Aplica la regla de recarga del simulador a un tramo.
+    Un tramo que sale de o llega a una estación de carga deja la batería en la
+    autonomía máxima (y cuenta una recarga al llegar desde un nodo que no es de
+    carga); cualquier otro tramo descuenta su peso.
+
+    Args:
+        battery: Batería antes del tramo
+        recharges: Recargas acumuladas antes del tramo
+        from_charging: Si el nodo de salida es estación de carga
+        to_charging: Si el nodo de llegada es estación de carga
+        weight: Peso del tramo
+        autonomy: Autonomía máxima del dron
+
+    Returns:
+        tuple: (batería, recargas) después del tramo
+    """
+    if from_charging or to_charging:
+        return autonomy, recharges + (0 if from_charging else 1)
+    return battery - weight, recharges
@@ -1,4 +1,6 @@
 class AVLNode:
+    __slots__ = ('key', 'height', 'left', 'right', 'frequency')
+
     def __init__(self, key):
         self.key = key
         self.height = 1
@@ -17,6 +19,10 @@ class AVL:
     def __len__(self):
         return self._size
 
+    def height(self):
+        """Height of the tree (0 when empty)."""
+        return self._height(self.root)
+
     def insert(self, key):
         """Insert a key into the AVL tree."""
         def _insert(node, key):
@@ -0,0 +1,136 @@
+class TrieNode:
+    __slots__ = ('key', 'parent', 'children', 'depth', 'count', 'data')
+
+    def __init__(self, key, parent=None, depth=0):
+        self.key = key
+        self.parent = parent
+        self.children = {}
+        self.depth = depth
+        self.count = 0  # Secuencias que pasan por este prefijo
+        self.data = None  # Información asociada al prefijo (e.g., costo acumulado)
+
+    def __str__(self):
+        return f"TrieNode({self.key}, depth={self.depth}, count={self.count})"
+
+
+class RouteTrie:
+    """
+    Trie de prefijos sobre secuencias de nodos.
+
+    Además del árbol mantiene un índice (primer elemento, elemento) -> prefijos
+    que terminan en ese elemento, de modo que "¿hay una secuencia guardada que
+    empiece en A y pase por B?" se responde sin recorrer el árbol.
+    """
+
+    def __init__(self):
+        self.root = TrieNode(None, depth=-1)
+        self._reach = {}  # (primer_elemento, elemento) -> {TrieNode: None}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, sequence, data_for_prefix=None):
+        """
+        Inserta una secuencia en el trie.
+
+        Args:
+            sequence: Secuencia de claves (e.g., códigos de nodo)
+            data_for_prefix: Función opcional (índice) -> dato para guardar en
+                cada prefijo de la secuencia; también reemplaza el dato de los
+                prefijos que ya existían, que podría estar desactualizado
+
+        Returns:
+            TrieNode: Nodo final de la secuencia
+        """
+        if not sequence:
+            return None
+        first = sequence[0]
+        node = self.root
+        for i, key in enumerate(sequence):
+            child = node.children.get(key)
+            if child is None:
+                child = TrieNode(key, node, node.depth + 1)
+                node.children[key] = child
+                self._reach.setdefault((first, key), {})[child] = None
+            if data_for_prefix is not None:
+                child.data = data_for_prefix(i)
+            child.count += 1
+            node = child
+        self._size += 1
+        return node
+
+    def remove(self, sequence):
+        """
+        Elimina una secuencia previamente insertada.
+        Los prefijos que ya no pertenecen a ninguna secuencia se podan.
+
+        Args:
+            sequence: Secuencia de claves
+
+        Returns:
+            bool: True si la secuencia estaba en el trie
+        """
+        node = self.find(sequence)
+        if node is None:
+            return False
+        first = sequence[0]
+        while node is not self.root:
+            node.count -= 1
+            parent = node.parent
+            if node.count == 0:
+                del parent.children[node.key]
+                holders = self._reach[(first, node.key)]
+                del holders[node]
+                if not holders:
+                    del self._reach[(first, node.key)]
+            node = parent
+        self._size -= 1
+        return True
+
+    def find(self, sequence):
+        """
+        Busca el nodo del trie que corresponde a una secuencia exacta.
+
+        Returns:
+            TrieNode: Nodo del último elemento o None
+        """
+        node = self.root
+        for key in sequence:
+            node = node.children.get(key)
+            if node is None:
+                return None
+        return node
+
+    def prefixes_reaching(self, first, key):
+        """
+        Prefijos guardados que empiezan en first y terminan en key.
+
+        Args:
+            first: Primer elemento de la secuencia
+            key: Elemento en el que debe terminar el prefijo
+
+        Returns:
+            list: Nodos del trie (usar path() para reconstruir cada prefijo)
+        """
+        return list(self._reach.get((first, key), ()))
+
+    def path(self, node):
+        """
+        Reconstruye la secuencia desde la raíz hasta un nodo del trie.
+
+        Returns:
+            list: Claves del prefijo en orden
+        """
+        keys = []
+        while node is not self.root:
+            keys.append(node.key)
+            node = node.parent
+        keys.reverse()
+        return keys
+
+    def clear(self):
+        """Elimina todas las secuencias."""
+        self.root = TrieNode(None, depth=-1)
+        self._reach.clear()
+        self._size = 0
@@ -1,5 +1,8 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from src.model.GraphChange import EDGE_ADDED, EDGE_REMOVED, EDGE_UPDATED, VERTEX_DISABLED, VERTEX_ENABLED
+
+DISABLED_COLOR = '#7f8c8d'  # Gris para nodos fuera de servicio
 
 class NetworkXAdapter:
     def __init__(self, graph):
@@ -8,18 +11,45 @@ class NetworkXAdapter:
         self.node_colors = {}
         self.highlighted_path = None
         self.node_positions = None  # Para mantener las posiciones consistentes
+        self.graph.subscribe(self._on_graph_change)
+
+    def _node_color(self, vertex):
+        if self.graph.is_disabled(vertex):
+            return DISABLED_COLOR
+        if vertex.startswith('S'):  # Storage nodes
+            return '#3498db'  # Azul
+        elif vertex.startswith('C'):  # Charging nodes
+            return '#f1c40f'  # Amarillo
+        elif vertex.startswith('T'):  # Target/Client nodes
+            return '#2ecc71'  # Verde
+        return DISABLED_COLOR
+
+    def _on_graph_change(self, change):
+        """
+        Actualiza solo la arista o el nodo afectado, sin reconstruir el grafo
+        de networkx ni recalcular las posiciones.
+        """
+        if not self.nx_graph:
+            return
+        u, v = change.start, change.end
+        if change.kind in (EDGE_ADDED, EDGE_UPDATED):
+            self.nx_graph.add_edge(u, v, weight=change.new_weight)
+        elif change.kind == EDGE_REMOVED:
+            # La vista es no dirigida: conservar la arista si existe el sentido inverso
+            reverse_weight = self.graph.get_edge_weight(v, u)
+            if reverse_weight is not None:
+                self.nx_graph.add_edge(u, v, weight=reverse_weight)
+            elif self.nx_graph.has_edge(u, v):
+                self.nx_graph.remove_edge(u, v)
+        elif change.kind in (VERTEX_DISABLED, VERTEX_ENABLED):
+            self.node_colors[u] = self._node_color(u)
 
     def convert_to_networkx(self):
         self.nx_graph.clear()
         
         # Agregar nodos con sus tipos
         for vertex in self.graph.vertices():
-            if vertex.startswith('S'):  # Storage nodes
-                self.node_colors[vertex] = '#3498db'  # Azul
-            elif vertex.startswith('C'):  # Charging nodes
-                self.node_colors[vertex] = '#f1c40f'  # Amarillo
-            elif vertex.startswith('T'):  # Target/Client nodes
-                self.node_colors[vertex] = '#2ecc71'  # Verde
+            self.node_colors[vertex] = self._node_color(vertex)
             self.nx_graph.add_node(vertex)
         
         # Agregar aristas con pesos
@@ -3,6 +3,10 @@ import matplotlib.pyplot as plt
 import networkx as nx
 from src.model.Graph import Graph
 from src.sim.SimulationInitializer import SimulationInitializer
+from src.sim.RouteCacheStore import RouteCacheStore
+from src.sim.ColumnarExporter import ColumnarExporter
+from src.sim.Profiling import PhaseProfiler, PHASES
+from src.sim.Metrics import MetricsRegistry
 from src.visual.NetworkXAdapter import NetworkXAdapter
 from src.visual.AVLVisualizer import AVLVisualizer
 from src.tda.AVL import AVL
@@ -10,6 +14,42 @@ from src.domain.Route import Route
 from src.domain.Order import Order
 import pandas as pd
 import json
+import io
+import os
+import time
+
+# Etiquetas de los métodos de búsqueda de SimulationInitializer.find_path_with_charging
+SEARCH_METHOD_LABELS = {
+    'bfs': 'Búsqueda en anchura (BFS)',
+    'bidirectional': 'Bidireccional',
+    'alt': 'A* con landmarks',
+    'overlay': 'Overlay de estaciones de carga',
+    'ch': 'Jerarquía de contracción',
+}
+
+# Etiquetas de las fases que mide PhaseProfiler en initialize_simulation
+PHASE_LABELS = {
+    'network': 'Generación de la red',
+    'client_assignment': 'Creación de clientes',
+    'connectivity': 'Verificación de conectividad',
+    'orders': 'Generación de órdenes',
+    'depot_assignment': 'Asignación de clientes a depósitos',
+    'route_registration': 'Registro de rutas',
+    'route_costs': 'Costo de las rutas',
+}
+
+# Directorio de las bitácoras de eventos (una por simulación iniciada o restaurada)
+EVENT_LOG_DIR = 'event_logs'
+
+# Bitácoras que se conservan en EVENT_LOG_DIR (las más recientes)
+EVENT_LOG_KEEP = 10
+
+# Tamaño máximo de red para la validación previa con la matriz de factibilidad
+# (todos los pares: memoria O(n²) y Floyd-Warshall O(n³), ~0,5 s con 500 nodos)
+FEASIBILITY_MAX_NODES = 500
+
+# Puerto local del endpoint de métricas (formato de texto de Prometheus)
+METRICS_PORT = 9464
 
 # Must be the first Streamlit command
 st.set_page_config(
@@ -120,6 +160,50 @@ try:
 except ImportError:
     HAS_PLOTLY = False
 
+@st.cache_resource
+def get_route_store():
+    """Caché persistente de rutas compartida por todas las ejecuciones del dashboard."""
+    return RouteCacheStore()
+
+@st.cache_resource
+def get_metrics_server():
+    """
+    Endpoint HTTP local con las métricas del registro compartido. Si el
+    puerto METRICS_PORT está ocupado (p. ej. otro dashboard) usa uno libre.
+    """
+    try:
+        return MetricsRegistry.shared().serve(port=METRICS_PORT)
+    except OSError:
+        return MetricsRegistry.shared().serve()
+
+def record_action(action):
+    """Cuenta una acción del usuario en el dashboard."""
+    MetricsRegistry.shared().counter('sisdrones_dashboard_actions_total',
+                                     'Acciones ejecutadas desde el dashboard', ('action',)).labels(action).inc()
+
+def new_event_log_path():
+    """
+    Archivo nuevo de bitácora de eventos para una simulación. Rota las
+    bitácoras: se eliminan las más antiguas (con sus archivos .sym e .idx)
+    para que, con la nueva, queden a lo sumo EVENT_LOG_KEEP.
+    """
+    if os.path.isdir(EVENT_LOG_DIR):
+        logs = sorted(name for name in os.listdir(EVENT_LOG_DIR)
+                      if name.startswith('simulacion_') and name.endswith('.evlog'))
+        for name in logs[:max(len(logs) - EVENT_LOG_KEEP + 1, 0)]:
+            for suffix in ('', '.sym', '.idx'):
+                try:
+                    os.remove(os.path.join(EVENT_LOG_DIR, name + suffix))
+                except OSError:
+                    pass  # Ya eliminado o abierto por otro proceso
+    return os.path.join(EVENT_LOG_DIR, f"simulacion_{time.time_ns()}.evlog")
+
+def close_event_log():
+    """Cierra la bitácora de la simulación actual antes de reemplazarla."""
+    simulation = st.session_state.get('simulation_initializer')
+    if simulation is not None and simulation.event_log is not None:
+        simulation.event_log.close()
+
 def run_simulation_tab():
     st.header('⚙️ Inicializar Simulación')
     
@@ -132,25 +216,40 @@ def run_simulation_tab():
         st.markdown(f"Nodos Cliente Derivados: {int(num_nodes * 0.6)} ({int(0.6 * 100)}% de {num_nodes})")
         if num_nodes < 15:
             st.warning('⚠️ La simulación puede no ser funcional con menos de 15 nodos debido a restricciones de conectividad y roles. Se recomienda usar al menos 15 nodos.')
+        profile_run = st.checkbox('🔍 Perfilar esta ejecución',
+                                  help='Tiempo de reloj, tiempo de CPU y pico de memoria de cada fase')
+        profile_phase = None
+        if profile_run:
+            profile_phase = st.selectbox('Fase a perfilar con cProfile', [None] + list(PHASES),
+                                         format_func=lambda phase: PHASE_LABELS.get(phase, '(ninguna)'))
     
     with col2:
         if st.button('🚀 Iniciar Simulación', use_container_width=True):
             with st.spinner('Inicializando simulación...'):
                 try:
                     # Siempre crear una nueva instancia al iniciar la simulación
+                    close_event_log()
                     st.session_state.simulation_initializer = SimulationInitializer()
+                    st.session_state.simulation_initializer.use_route_store(get_route_store())
+                    st.session_state.simulation_initializer.use_event_log(new_event_log_path())
+                    st.session_state.simulation_initializer.use_metrics()
                     st.session_state.avl_tree = AVL()
-                    st.session_state.routes = []
-                    st.session_state.route_counter = 0
+                    st.session_state.route_registry = None
                     st.session_state.order_counter = 0
                     st.session_state.node_visits = {}
+                    st.session_state.export_files = {}
                     st.session_state.orders = []
+                    st.session_state.order_table = None
                     st.session_state.clients = []
                     st.session_state.graph = None
                     st.session_state.network_adapter = None
                     
+                    profiler = None
+                    if profile_run:
+                        profiler = PhaseProfiler(profile_phases=[profile_phase] if profile_phase else ())
+                    st.session_state.profiler = profiler
                     graph, orders, clients = st.session_state.simulation_initializer.initialize_simulation(
-                        num_nodes, num_edges, num_orders
+                        num_nodes, num_edges, num_orders, profiler=profiler
                     )
                     
                     if not graph or not graph.vertices():
@@ -158,13 +257,14 @@ def run_simulation_tab():
                     
                     st.session_state.graph = graph
                     st.session_state.orders = orders.copy() if orders else []
+                    st.session_state.order_table = st.session_state.simulation_initializer.order_table
                     st.session_state.clients = clients.copy() if clients else []
-                    st.session_state.routes = st.session_state.simulation_initializer.routes.copy()
+                    st.session_state.route_registry = st.session_state.simulation_initializer.route_registry
                     st.session_state.order_counter = len(st.session_state.orders)
-                    st.session_state.route_counter = len(st.session_state.routes)
                     
                     st.session_state.network_adapter = NetworkXAdapter(st.session_state.graph)
                     st.session_state.network_adapter.convert_to_networkx()
+                    record_action('simulation_started')
                 
                     st.success('✅ Simulación inicializada exitosamente!')
                     st.rerun()
@@ -172,6 +272,69 @@ def run_simulation_tab():
                     st.error(f"❌ Error al inicializar la simulación: {str(e)}")
                     return
 
+        # Guardar y restaurar el estado completo sin recalcularlo
+        if st.session_state.get('simulation_initializer') and st.session_state.graph:
+            # El snapshot se serializa solo a pedido (no en cada rerun) y se
+            # ofrece mientras el estado no cambie desde que se preparó
+            simulation = st.session_state.simulation_initializer
+            state = (id(simulation), len(simulation.order_table), simulation.route_registry.total_frequency())
+            if st.button('💾 Preparar Snapshot', use_container_width=True):
+                buffer = io.BytesIO()
+                simulation.save_snapshot(buffer)
+                st.session_state.snapshot_data = (state, buffer.getvalue())
+            prepared = st.session_state.get('snapshot_data')
+            if prepared is not None and prepared[0] == state:
+                st.download_button('⬇️ Descargar Snapshot', prepared[1], file_name='simulacion.npz',
+                                   mime='application/octet-stream', use_container_width=True)
+            event_log = simulation.event_log
+            if event_log is not None:
+                st.caption(f"📝 Bitácora de eventos: {event_log.path} ({len(event_log)} eventos)")
+        snapshot_file = st.file_uploader('📂 Restaurar Snapshot', type=['npz'], key='snapshot_file')
+        if snapshot_file is not None and st.button('Restaurar', use_container_width=True):
+            try:
+                simulation = SimulationInitializer()
+                simulation.use_route_store(get_route_store())
+                graph, orders, clients = simulation.load_snapshot(snapshot_file)
+                simulation.use_event_log(new_event_log_path())
+                simulation.use_metrics()
+                close_event_log()
+                st.session_state.simulation_initializer = simulation
+                st.session_state.avl_tree = AVL()
+                st.session_state.node_visits = {}
+                st.session_state.export_files = {}
+                st.session_state.graph = graph
+                st.session_state.orders = orders.copy()
+                st.session_state.order_table = simulation.order_table
+                st.session_state.clients = clients.copy()
+                st.session_state.route_registry = simulation.route_registry
+                st.session_state.order_counter = len(st.session_state.orders)
+                st.session_state.network_adapter = NetworkXAdapter(graph)
+                st.session_state.network_adapter.convert_to_networkx()
+                record_action('snapshot_restored')
+                st.success('✅ Snapshot restaurado')
+                st.rerun()
+            except (ValueError, KeyError, OSError) as e:
+                st.error(f"❌ No se pudo restaurar el snapshot: {str(e)}")
+
+    # Resultados del perfilado de la última ejecución
+    profiler = st.session_state.get('profiler')
+    if profiler is not None and profiler.results():
+        st.subheader('🔍 Perfil de la Inicialización')
+        results = profiler.results()
+        st.dataframe(pd.DataFrame([{
+            'Fase': '\u2003' * result['depth'] + PHASE_LABELS.get(result['phase'], result['phase']),
+            'Llamadas': result['calls'],
+            'Reloj (s)': round(result['wall_s'], 4),
+            'CPU (s)': round(result['cpu_s'], 4),
+            'Pico de memoria (MB)': round(result['peak_mb'], 2),
+        } for result in results]), hide_index=True)
+        st.caption('Las fases anidadas están incluidas en la fase que las contiene. '
+                   'Con tracemalloc activo los tiempos son mayores que sin perfilar.')
+        for result in results:
+            if result['profiled']:
+                with st.expander(f"cProfile: {PHASE_LABELS.get(result['phase'], result['phase'])}"):
+                    st.code(profiler.profile_stats(result['phase']))
+
 def explore_network_tab():
     st.header('🗺️ Explorar Red')
     
@@ -214,6 +377,26 @@ def explore_network_tab():
         else:
             end_node = st.selectbox('Seleccionar nodo destino', client_nodes, key='dest')
 
+    search_method = st.selectbox(
+        'Método de búsqueda',
+        list(SEARCH_METHOD_LABELS),
+        format_func=SEARCH_METHOD_LABELS.get,
+        key='search_method'
+    )
+
+    # Validación inmediata con la matriz de factibilidad de todos los pares
+    # (solo en redes chicas; en redes grandes (p. ej. importadas) decide la búsqueda)
+    if len(st.session_state.graph.vertices()) <= FEASIBILITY_MAX_NODES:
+        feasibility = st.session_state.simulation_initializer.check_feasibility(start_node, end_node)
+        if feasibility['feasible']:
+            st.caption(f"✅ Ruta factible: costo mínimo {feasibility['cost']:g} con "
+                       f"{feasibility['recharges']} recarga(s)")
+        else:
+            st.caption("⛔ No existe ruta factible con la autonomía actual")
+    else:
+        st.caption(f"ℹ️ Red de más de {FEASIBILITY_MAX_NODES} nodos: la factibilidad se "
+                   f"informa al calcular la ruta")
+
     if 'current_path' not in st.session_state:
         st.session_state.current_path = None
         st.session_state.current_cost = 0
@@ -223,7 +406,11 @@ def explore_network_tab():
     with col2:
         if st.button('✈️ Calcular Ruta', use_container_width=True):
             st.session_state.network_adapter.clear_path()
-            result = st.session_state.simulation_initializer.find_path_with_charging(start_node, end_node)
+            result = st.session_state.simulation_initializer.find_path_with_charging(
+                start_node, end_node, method=search_method)
+            record_action('route_calculated')
+            if st.session_state.simulation_initializer.route_store is not None:
+                st.session_state.simulation_initializer.route_store.flush()
             path = result['path']
             completed = result['completed']
             battery_left = result['battery_left']
@@ -234,29 +421,25 @@ def explore_network_tab():
             full_battery_left = result.get('full_battery_left', None)
             
             if path:
-                total_cost = 0
-                current_autonomy = st.session_state.simulation_initializer.DRONE_AUTONOMY
-                valid_path = completed
+                # Perfil de energía precalculado de la ruta (costos y batería por nodo)
+                simulation = st.session_state.simulation_initializer
+                route = simulation.route_registry.get(path) or Route('Vista_previa', path)
+                route.energy_profile(st.session_state.graph, simulation.DRONE_AUTONOMY)
+                total_cost = route.total_cost
                 segments = []
                 charging_points = []
                 
                 for i in range(len(path)-1):
-                    edge = st.session_state.graph.get_edge(path[i], path[i+1])
-                    if edge:
-                        edge_cost = edge.element()
-                        if path[i].startswith('C') or path[i+1].startswith('C'):
-                            charging_node = path[i] if path[i].startswith('C') else path[i+1]
-                            if charging_node not in charging_points:
-                                charging_points.append(charging_node)
-                            current_autonomy = st.session_state.simulation_initializer.DRONE_AUTONOMY
-                            segments.append(f"🔋 Recargando en {charging_node} (Energía restaurada a {current_autonomy})")
-                        current_autonomy -= edge_cost
-                        segments.append(f"{path[i]} → {path[i+1]} (Costo: {edge_cost}, Energía: {current_autonomy})")
-                        total_cost += edge_cost
-                    else:
-                        valid_path = False
+                    if not st.session_state.graph.has_edge(path[i], path[i+1]):
                         st.error(f"❌ No hay conexión directa entre {path[i]} y {path[i+1]}")
                         break
+                    edge_cost = route.segment_cost(i, i+1)
+                    if path[i].startswith('C') or path[i+1].startswith('C'):
+                        charging_node = path[i] if path[i].startswith('C') else path[i+1]
+                        if charging_node not in charging_points:
+                            charging_points.append(charging_node)
+                        segments.append(f"🔋 Recargando en {charging_node} (Energía restaurada a {simulation.DRONE_AUTONOMY})")
+                    segments.append(f"{path[i]} → {path[i+1]} (Costo: {edge_cost:g}, Energía: {route.remaining_energy(i+1):g})")
 
                 st.session_state.network_adapter.highlight_path(path)
                 st.session_state.current_path = path
@@ -283,6 +466,18 @@ def explore_network_tab():
                             st.markdown("---")
                             st.success(f"✅ Ruta completa posible: {' → '.join(full_path)}")
                             st.info(f"💰 Costo total: {total_cost} unidades | Energía restante: {full_battery_left}")
+
+                # Frontera de Pareto (costo, recargas, saltos) en una sola búsqueda
+                alternatives = simulation.find_route_alternatives(start_node, end_node)
+                if len(alternatives) > 1:
+                    with st.expander(f"🔀 Rutas alternativas ({len(alternatives)})"):
+                        st.dataframe(pd.DataFrame([{
+                            'Ruta': ' → '.join(option['path']),
+                            'Costo': option['cost'],
+                            'Recargas': option['recharges'],
+                            'Saltos': option['hops'],
+                            'Batería final': option['battery_left']
+                        } for option in alternatives]), hide_index=True)
             else:
                 st.error(f"❌ No se encontró ninguna ruta posible: {reason}")
                 st.session_state.path_calculated = False
@@ -300,24 +495,7 @@ def explore_network_tab():
                             st.session_state.node_visits = {}
                         st.session_state.node_visits[node] = st.session_state.node_visits.get(node, 0) + 1
                     
-                    st.session_state.route_counter += 1
-                    route_id = f"Ruta_{st.session_state.route_counter}"
-                    
-                    existing_route = None
-                    route_nodes_tuple = tuple(path)
-                    
-                    for r in st.session_state.routes:
-                        if tuple(r.nodes) == route_nodes_tuple:
-                            existing_route = r
-                            break
-                    
-                    if existing_route:
-                        route = existing_route
-                        route.increment_frequency()
-                    else:
-                        route = Route(route_id, path)
-                        route.frequency = 1
-                        st.session_state.routes.append(route)
+                    route = st.session_state.simulation_initializer.register_route(path)
                     
                     st.session_state.order_counter += 1
                     order_id = f"ORD_{st.session_state.order_counter}"
@@ -333,13 +511,19 @@ def explore_network_tab():
                             destination=end_node,
                             client_id=client.client_id,
                             client_name=client.name,
-                            priority=client.client_type
+                            priority=client.client_type,
+                            table=st.session_state.order_table
                         )
                         client.add_order(order)
                         
                         order.assign_route(route)
                         order.route_cost = total_cost
-                        order.status = "Completado"
+                        simulation = st.session_state.simulation_initializer
+                        simulation.record_order(order)
+                        simulation.complete_delivery(order)
+                        if simulation.event_log is not None:
+                            simulation.event_log.flush()
+                        record_action('delivery_completed')
                         
                         st.session_state.orders.append(order)
                         
@@ -373,65 +557,62 @@ def clients_orders_tab():
     
     st.subheader('📋 Clientes')
     if st.session_state.clients:
-        clients_json = []
-        for client in st.session_state.clients:
-            total_orders = len([order for order in st.session_state.orders if order.client_id == client.client_id])
-            client_data = {
-                "ID": client.client_id,
-                "Nombre": client.name,
-                "Tipo": client.client_type,
-                "Total Órdenes": total_orders,
-                "Nodo": client.node_id if hasattr(client, 'node_id') else 'N/A'
-            }
-            clients_json.append(client_data)
-        st.json(clients_json)
+        orders_per_client = st.session_state.order_table.orders_per_client()
+        clients = st.session_state.clients
+        st.dataframe(pd.DataFrame({
+            "ID": [client.client_id for client in clients],
+            "Nombre": [client.name for client in clients],
+            "Tipo": [client.client_type for client in clients],
+            "Total Órdenes": [orders_per_client.get(client.client_id, 0) for client in clients],
+            "Nodo": [client.node_id or 'N/A' for client in clients]
+        }), hide_index=True)
     else:
         st.info('No hay clientes disponibles.')
     
     st.subheader('📦 Órdenes')
-    if st.session_state.orders:
-        orders_json = []
-        for order in st.session_state.orders:
-            if not hasattr(order, 'total_cost') or not order.total_cost:
-                total_cost = 0
-                if hasattr(order, 'route') and order.route:
-                    for i in range(len(order.route.nodes)-1):
-                        edge = st.session_state.graph.get_edge(order.route.nodes[i], order.route.nodes[i+1])
-                        if edge:
-                            total_cost += edge.element()
-                    order.total_cost = total_cost
-            
-            order_data = {
-                "ID Orden": order.order_id,
-                "ID Cliente": order.client_id if hasattr(order, 'client_id') else None,
-                "Nombre Cliente": order.client_name if hasattr(order, 'client_name') else None,
-                "Origen": order.origin,
-                "Destino": order.destination,
-                "Estado": order.status if hasattr(order, 'status') else "Pendiente",
-                "Prioridad": order.priority if hasattr(order, 'priority') else "Normal",
-                "Fecha Creación": order.creation_date.strftime("%Y-%m-%d %H:%M:%S") if hasattr(order, 'creation_date') and order.creation_date else None,
-                "Fecha Entrega": order.delivery_date.strftime("%Y-%m-%d %H:%M:%S") if hasattr(order, 'delivery_date') and order.delivery_date else None,
-                "Costo Total": order.total_cost if hasattr(order, 'total_cost') else total_cost,
-                "Ruta": ' → '.join(order.route.nodes) if hasattr(order, 'route') and order.route else 'No asignada'
-            }
-            orders_json.append(order_data)
-        st.json(orders_json)
+    if len(st.session_state.order_table):
+        st.dataframe(st.session_state.order_table.to_frame(), hide_index=True)
     else:
         st.info('No hay órdenes disponibles.')
 
+    st.subheader('📤 Exportar Datos')
+    exporter = ColumnarExporter()
+    if st.button('Preparar archivos de exportación'):
+        simulation = st.session_state.simulation_initializer
+        writers = {
+            'ordenes': lambda target: exporter.export_orders(st.session_state.order_table, target),
+            'rutas': lambda target: exporter.export_routes(simulation.route_registry.routes(),
+                                                           st.session_state.graph, target),
+            'visitas': lambda target: exporter.export_visits(simulation.route_registry.node_visits(), target),
+        }
+        files = {}
+        for name, write in writers.items():
+            buffer = io.BytesIO()
+            write(buffer)
+            files[name] = buffer.getvalue()
+        st.session_state.export_files = files
+        record_action('export_prepared')
+    for name, data in st.session_state.get('export_files', {}).items():
+        st.download_button(f'⬇️ {name.capitalize()} ({exporter.file_format})', data,
+                           file_name=name + exporter.extension, key=f'export_{name}')
+
 def route_analytics_tab():
     st.header('📋 Análisis de Rutas')
     
-    if not st.session_state.routes:
+    if not st.session_state.route_registry:
         st.info('No hay rutas registradas aún. Use la pestaña "Explorar Red" para crear rutas.')
         return
 
     try:
-        sorted_routes = sorted(st.session_state.routes, key=lambda x: x.frequency, reverse=True)
+        routes = st.session_state.route_registry.routes()
+        sorted_routes = sorted(routes, key=lambda x: x.frequency, reverse=True)
 
         avl_tree = AVL()
         for route in sorted_routes:
             avl_tree.insert(route)
+        metrics = MetricsRegistry.shared()
+        metrics.gauge('sisdrones_avl_nodes', 'Nodos del árbol AVL de frecuencias de rutas').set(len(avl_tree))
+        metrics.gauge('sisdrones_avl_height', 'Altura del árbol AVL de frecuencias de rutas').set(avl_tree.height())
         
         st.subheader('🌳 Árbol AVL de Frecuencias de Rutas')
         avl_visualizer = AVLVisualizer(avl_tree)
@@ -467,11 +648,11 @@ def route_analytics_tab():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            total_routes = len(st.session_state.routes)
+            total_routes = len(routes)
             st.metric("Total de Rutas Únicas", total_routes)
         
         with col2:
-            total_frequency = sum(route.frequency for route in st.session_state.routes)
+            total_frequency = st.session_state.route_registry.total_frequency()
             st.metric("Total de Viajes Realizados", total_frequency)
         
         with col3:
@@ -516,12 +697,10 @@ def general_statistics_tab():
         return None
 
     # Agregar visitas de todas las rutas por tipo de nodo
+    all_visits = st.session_state.route_registry.node_visits() if st.session_state.route_registry else {}
+
     def aggregate_visits_by_type(node_type_prefix):
-        visits = {}
-        for route in getattr(st.session_state, 'routes', []):
-            for node, count in route.get_node_visits().items():
-                if node.startswith(node_type_prefix):
-                    visits[node] = visits.get(node, 0) + count
+        visits = {node: count for node, count in all_visits.items() if node.startswith(node_type_prefix)}
         # Ordenar por visitas descendente
         return sorted(visits.items(), key=lambda x: x[1], reverse=True)
 
@@ -608,16 +787,51 @@ def general_statistics_tab():
             st.metric('Total de Órdenes', total_orders)
         
         with col2:
-            avg_cost = sum(order.route_cost for order in st.session_state.orders) / total_orders if total_orders > 0 else 0
+            avg_cost = st.session_state.order_table.mean_route_cost()
             st.metric('Costo Promedio', f"{avg_cost:.2f}")
         
         with col3:
-            priorities = [order.priority for order in st.session_state.orders]
-            most_common = max(set(priorities), key=priorities.count) if priorities else "N/A"
-            st.metric('Prioridad Más Común', most_common)
+            st.metric('Prioridad Más Común', st.session_state.order_table.most_common_priority())
     else:
         st.info('No hay datos de órdenes disponibles.')
 
+    # Instrumentación de find_path_with_charging (se activa en tiempo de ejecución)
+    st.subheader('🔬 Instrumentación de Búsqueda de Rutas')
+    instrumentation = st.session_state.simulation_initializer.instrumentation
+    enabled = st.checkbox('Registrar contadores de búsqueda', value=instrumentation.enabled,
+                          help='Estados generados, pico de cola, aciertos de caché y tiempos por consulta')
+    instrumentation.enabled = enabled
+    summary = instrumentation.summary()
+    if not summary:
+        st.info('Sin consultas registradas. Active la instrumentación y calcule rutas en "Explorar Red".')
+        return
+    st.dataframe(pd.DataFrame([{
+        'Método': SEARCH_METHOD_LABELS.get(method, method),
+        'Consultas': counters['calls'],
+        'Aciertos de caché': f"{counters['hit_ratio']:.0%}",
+        'Promedio ms': round(counters['avg_ms'], 3),
+        'Búsqueda ms': round(counters['avg_search_ms'], 3),
+        'Estados promedio': round(counters['avg_states'], 1),
+        'Pico de cola': counters['queue_peak'],
+        'Recargas consideradas': counters['recharges_considered'],
+        'Completas': counters['completed'],
+    } for method, counters in summary.items()]), hide_index=True)
+    histogram = instrumentation.histogram()
+    fig = plt.figure(figsize=(10, 3))
+    plt.bar([label for label, _ in histogram], [count for _, count in histogram], color='#66B2FF')
+    plt.xticks(rotation=45)
+    plt.title('Latencia de las consultas')
+    plt.tight_layout()
+    st.pyplot(fig)
+    plt.close()
+    st.markdown('🐢 Consultas más lentas')
+    st.dataframe(pd.DataFrame(instrumentation.slowest()), hide_index=True)
+    if st.button('Reiniciar contadores'):
+        instrumentation.reset()
+        st.rerun()
+
+    st.caption(f"📡 Métricas en formato Prometheus: {get_metrics_server().url}")
+
 def tabs_container():
     tabs = st.tabs([
         "⚙️ Inicializar Simulación",
@@ -641,6 +855,7 @@ def tabs_container():
 def run_dashboard():
     # Main title
     st.title('🚁 Sistema de Entrega con Drones')
+    get_metrics_server()
     
     # Initialize session state variables if they don't exist
     if 'graph' not in st.session_state:
@@ -649,14 +864,14 @@ def run_dashboard():
         st.session_state.simulation_initializer = None
     if 'network_adapter' not in st.session_state:
         st.session_state.network_adapter = None
-    if 'routes' not in st.session_state:
-        st.session_state.routes = []
+    if 'route_registry' not in st.session_state:
+        st.session_state.route_registry = None
     if 'orders' not in st.session_state:
         st.session_state.orders = []
+    if 'order_table' not in st.session_state:
+        st.session_state.order_table = None
     if 'clients' not in st.session_state:
         st.session_state.clients = []
-    if 'route_counter' not in st.session_state:
-        st.session_state.route_counter = 0
     if 'order_counter' not in st.session_state:
         st.session_state.order_counter = 0
     
@@ -0,0 +1,27 @@
+import random
+
+from src.sim.SimulationInitializer import SimulationInitializer, SEARCH_METHODS
+
+
+def test_same_origin_and_destination_is_completed_for_every_method():
+    random.seed(7)
+    simulation = SimulationInitializer()
+    simulation.initialize_network(15)
+    node = simulation._storage_nodes[0]
+
+    for method in SEARCH_METHODS:
+        result = simulation.find_path_with_charging(node, node, method=method)
+        assert result['completed'], method
+        assert result['path'] == [node], method
+
+
+def test_bidirectional_matches_bfs_for_single_node_route():
+    random.seed(7)
+    simulation = SimulationInitializer()
+    simulation.initialize_network(15)
+    node = simulation._storage_nodes[0]
+
+    bidirectional = simulation.find_path_with_charging(node, node, method='bidirectional')
+    bfs = simulation.find_path_with_charging(node, node)
+
+    assert bidirectional['battery_left'] == bfs['battery_left']
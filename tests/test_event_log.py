@@ -0,0 +1,68 @@
+import io
+import random
+
+from src.sim.EventLog import EventLog, EVENT_ORDER_CREATED, EVENT_ROUTE_USED, HEADER_DTYPE, RECORD_DTYPE
+from src.sim.SimulationInitializer import SimulationInitializer
+
+
+def test_log_survives_reopening_and_drops_a_truncated_record(tmp_path):
+    path = str(tmp_path / 'eventos.evlog')
+    with EventLog(path, index_stride=2, buffer_size=2) as log:
+        for second in range(5):
+            log.append(EVENT_ROUTE_USED, timestamp=100.0 + second, route=f"S1\tT{second}")
+        log.append(EVENT_ORDER_CREATED, timestamp=105.0, order='ORD_1', origin='S1', destination='T1')
+    with open(path, 'ab') as handle:
+        handle.write(b'\0' * (RECORD_DTYPE.itemsize // 2))  # Escritura interrumpida
+
+    with EventLog(path) as log:
+        assert len(log) == 6
+        assert log.index_stride == 2
+        records = log.read(4)
+        assert records['kind'].tolist() == [EVENT_ROUTE_USED, EVENT_ORDER_CREATED]
+        assert log.symbol(int(records['order'][1])) == 'ORD_1'
+        assert log.offset_at(102.5) == 3
+        assert log.offset_at(200.0) == 6
+    size = HEADER_DTYPE.itemsize + 6 * RECORD_DTYPE.itemsize
+    assert (tmp_path / 'eventos.evlog').stat().st_size == size
+
+
+def run_logged_simulation(path):
+    random.seed(11)
+    simulation = SimulationInitializer()
+    simulation.use_event_log(path)
+    simulation.initialize_simulation(30, 45, 40)
+    return simulation
+
+
+def test_replay_rebuilds_routes_and_orders_from_the_network(tmp_path):
+    original = run_logged_simulation(str(tmp_path / 'eventos.evlog'))
+    snapshot = io.BytesIO()
+    original.save_snapshot(snapshot)
+    snapshot.seek(0)
+
+    restored = SimulationInitializer()
+    restored.load_snapshot(snapshot, sections=('graph',))
+    result = restored.replay_events(original.event_log, start=0)
+
+    assert result['skipped'] == 0
+    assert result['offset'] == len(original.event_log)
+    assert restored.get_route_frequencies() == original.get_route_frequencies()
+    assert restored.order_table.to_frame().drop(columns='Fecha_Creacion').equals(
+        original.order_table.to_frame().drop(columns='Fecha_Creacion'))
+
+
+def test_replay_after_a_snapshot_applies_only_later_events(tmp_path):
+    original = run_logged_simulation(str(tmp_path / 'eventos.evlog'))
+    snapshot = io.BytesIO()
+    original.save_snapshot(snapshot)
+    snapshot.seek(0)
+    delivered = original.orders[3]
+    original.complete_delivery(delivered)
+
+    restored = SimulationInitializer()
+    restored.load_snapshot(snapshot)
+    result = restored.replay_events(original.event_log)
+
+    assert result['records'] == 1
+    assert restored.orders[3].status == delivered.status == 'Completada'
+    assert restored.route_registry.total_frequency() == original.route_registry.total_frequency()
@@ -0,0 +1,72 @@
+from src.model.Graph import Graph
+from src.model.GraphChange import EDGE_ADDED, EDGE_REMOVED, EDGE_UPDATED, VERTEX_DISABLED, VERTEX_ENABLED
+from src.sim.SimulationInitializer import SimulationInitializer
+
+
+def build_simulation():
+    # S1 -> C1 -> T1 es la ruta corta; S1 -> C2 -> C3 -> T1 es el desvío
+    graph = Graph()
+    for start, end, weight in (('S1', 'C1', 30), ('C1', 'T1', 30), ('S1', 'C2', 30),
+                               ('C2', 'C3', 30), ('C3', 'T1', 30), ('T1', 'T2', 10)):
+        graph.add_edge(start, end, weight)
+    simulation = SimulationInitializer()
+    simulation.restore_network(graph, ['S1'], ['C1', 'C2', 'C3'], ['T1', 'T2'], drone_autonomy=50)
+    return simulation
+
+
+def path(simulation, start, end):
+    result = simulation.find_path_with_charging(start, end)
+    return list(result['path']) if result['completed'] else None
+
+
+def test_mutations_publish_change_events():
+    graph = Graph()
+    graph.add_vertex('S1')
+    changes = []
+    graph.subscribe(changes.append)
+
+    graph.add_edge('S1', 'T1', 5)
+    graph.update_edge_weight('S1', 'T1', 3)
+    graph.add_edge('S1', 'T1', 3)  # Mismo peso: no es un cambio
+    graph.disable_vertex('T1')
+    graph.enable_vertex('T1')
+    graph.remove_edge('S1', 'T1')
+
+    assert [change.kind for change in changes] == [EDGE_ADDED, EDGE_UPDATED, VERTEX_DISABLED,
+                                                   VERTEX_ENABLED, EDGE_REMOVED]
+    assert (changes[1].old_weight, changes[1].new_weight) == (5, 3)
+    assert [change.improves() for change in changes] == [True, True, False, True, False]
+    assert [change.degrades() for change in changes] == [False, False, True, False, True]
+
+
+def test_disable_then_enable_restores_the_shorter_route():
+    simulation = build_simulation()
+    assert path(simulation, 'S1', 'T1') == ['S1', 'C1', 'T1']
+
+    simulation.graph.disable_vertex('C1')
+    assert path(simulation, 'S1', 'T1') == ['S1', 'C2', 'C3', 'T1']
+
+    simulation.graph.enable_vertex('C1')
+    assert path(simulation, 'S1', 'T1') == ['S1', 'C1', 'T1']
+
+
+def test_added_edge_replaces_a_cached_detour():
+    simulation = build_simulation()
+    simulation.graph.remove_edge('C1', 'T1')
+    assert path(simulation, 'S1', 'T1') == ['S1', 'C2', 'C3', 'T1']
+    assert path(simulation, 'S1', 'T2') == ['S1', 'C2', 'C3', 'T1', 'T2']
+
+    simulation.graph.add_edge('S1', 'T1', 20)
+
+    assert path(simulation, 'S1', 'T1') == ['S1', 'T1']
+    assert path(simulation, 'S1', 'T2') == ['S1', 'T1', 'T2']
+
+
+def test_removed_edge_repairs_registered_routes():
+    simulation = build_simulation()
+    route = simulation.register_route(['S1', 'C1', 'T1'])
+
+    simulation.graph.remove_edge('C1', 'T1')
+
+    assert route not in simulation.route_index
+    assert path(simulation, 'S1', 'T1') == ['S1', 'C2', 'C3', 'T1']
@@ -0,0 +1,85 @@
+import pytest
+
+from src.model.GraphLoader import GraphLoader
+from src.sim.SimulationInitializer import SimulationInitializer
+
+EDGES_CSV = """source,target,weight
+S1,C1,10
+C1,T1,12.0
+T1,S1,8
+depot-2,T1,4
+"""
+
+NODES_CSV = """id,role
+depot-2,storage
+S1,storage
+"""
+
+GRAPHML = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="role" attr.type="string"/>
+  <key id="d1" for="edge" attr.name="weight" attr.type="double"/>
+  <graph id="G" edgedefault="undirected">
+    <node id="hub"><data key="d0">depot</data></node>
+    <node id="C1"/>
+    <node id="T1"/>
+    <edge source="hub" target="C1"><data key="d1">7</data></edge>
+    <edge source="C1" target="T1"><data key="d1">2.5</data></edge>
+  </graph>
+</graphml>
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 200_000])
+def test_csv_loads_the_same_graph_for_any_chunk_size(tmp_path, chunk_size):
+    loader = GraphLoader(chunk_size=chunk_size)
+    graph = loader.load_csv(write(tmp_path, 'edges.csv', EDGES_CSV),
+                            nodes_path=write(tmp_path, 'nodes.csv', NODES_CSV))
+
+    assert graph.edge_weights == {('S1', 'C1'): 10, ('C1', 'T1'): 12, ('T1', 'S1'): 8, ('Sdepot-2', 'T1'): 4}
+    assert loader.renamed == {'depot-2': 'Sdepot-2'}
+    assert (loader.storage_nodes, loader.charging_nodes, loader.client_nodes) == (['S1', 'Sdepot-2'], ['C1'],
+                                                                                 ['T1'])
+    assert loader.components == 1
+
+
+def test_edge_list_skips_comments_and_defaults_weights(tmp_path):
+    path = write(tmp_path, 'edges.txt', "# red de prueba\nS1 C1 3\nC1 T1\n")
+
+    graph = GraphLoader(bidirectional=True).load_edge_list(path)
+
+    assert graph.edge_weights == {('S1', 'C1'): 3, ('C1', 'T1'): 1, ('C1', 'S1'): 3, ('T1', 'C1'): 1}
+
+
+def test_undirected_graphml_is_loaded_in_both_directions(tmp_path):
+    loader = GraphLoader()
+    graph = loader.load_graphml(write(tmp_path, 'net.graphml', GRAPHML))
+
+    assert graph.edge_weights == {('Shub', 'C1'): 7.0, ('C1', 'T1'): 2.5, ('C1', 'Shub'): 7.0, ('T1', 'C1'): 2.5}
+    assert loader.storage_nodes == ['Shub']
+    assert loader.bidirectional is False
+
+
+def test_disconnected_networks_are_rejected_or_reported(tmp_path):
+    path = write(tmp_path, 'edges.txt', "S1 T1 1\nS2 T2 1\n")
+
+    with pytest.raises(ValueError):
+        GraphLoader().load_edge_list(path)
+    loader = GraphLoader(validate='warn')
+    loader.load_edge_list(path)
+    assert loader.components == 2
+
+
+def test_load_network_creates_a_client_per_client_node(tmp_path):
+    simulation = SimulationInitializer()
+    simulation.load_network(write(tmp_path, 'edges.csv', EDGES_CSV), file_format='csv',
+                            nodes_path=write(tmp_path, 'nodes.csv', NODES_CSV))
+
+    assert [client.node_id for client in simulation.clients] == ['T1']
+    assert simulation.find_path_with_charging('Sdepot-2', 'S1')['completed']
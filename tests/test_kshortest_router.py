@@ -0,0 +1,37 @@
+from src.model.Graph import Graph
+from src.sim.SimulationInitializer import SimulationInitializer
+
+
+def build_detour_simulation():
+    """Red cuyo único desvío que evita TX es S1 → TD → TE → T9."""
+    graph = Graph()
+    edges = [('S1', 'T1', 1), ('T1', 'TX', 1), ('TX', 'T9', 1), ('T1', 'TB', 1), ('TB', 'TX', 1),
+             ('S1', 'TD', 2), ('TD', 'TX', 2), ('TD', 'TE', 5), ('TE', 'T9', 5)]
+    for start, end, _ in edges:
+        graph.add_vertex(start)
+        graph.add_vertex(end)
+    for start, end, weight in edges:
+        graph.add_edge(start, end, weight)
+    simulation = SimulationInitializer()
+    nodes = graph.vertices()
+    simulation.restore_network(graph, [node for node in nodes if node.startswith('S')], [],
+                               [node for node in nodes if node.startswith('T')])
+    return simulation
+
+
+def test_reroute_after_alternatives_finds_discarded_detour():
+    simulation = build_detour_simulation()
+    simulation.find_alternative_routes('S1', 'T9', k=2)
+
+    result = simulation.reroute('S1', 'T9', failed_node='TX')
+
+    assert result['completed']
+    assert result['path'] == ['S1', 'TD', 'TE', 'T9']
+
+
+def test_reroute_matches_fresh_router():
+    warm = build_detour_simulation()
+    warm.find_alternative_routes('S1', 'T9', k=2)
+    fresh = build_detour_simulation()
+
+    assert warm.reroute('S1', 'T9', failed_node='TX') == fresh.reroute('S1', 'T9', failed_node='TX')
@@ -0,0 +1,21 @@
+import warnings
+
+from src.model.Graph import Graph
+from src.sim.SimulationInitializer import SimulationInitializer
+
+
+def test_alt_search_without_landmark_bounds_does_not_warn():
+    # T8 y T9 quedan fuera del alcance de los landmarks: sus cotas son inf - inf
+    graph = Graph()
+    for start, end, weight in (('S1', 'C1', 20), ('C1', 'T1', 20), ('T1', 'S1', 20), ('T8', 'T9', 5)):
+        graph.add_edge(start, end, weight)
+    simulation = SimulationInitializer()
+    simulation.restore_network(graph, ['S1'], ['C1'], ['T1', 'T8', 'T9'], drone_autonomy=50)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        reachable = simulation.find_path_with_charging('S1', 'T1', method='alt')
+        unreachable = simulation.find_path_with_charging('S1', 'T9', method='alt')
+
+    assert reachable['completed'] and list(reachable['path']) == ['S1', 'C1', 'T1']
+    assert not unreachable['completed']
@@ -0,0 +1,35 @@
+import uuid
+
+from src.domain.Order import Order
+from src.domain.OrderTable import OrderTable
+
+
+def test_long_order_ids_are_accepted():
+    table = OrderTable()
+    short = Order('ORD_1', 'S1', 'T1', table=table)
+    long_id = str(uuid.uuid4())
+    long = Order(long_id, 'S1', 'T2', table=table)
+
+    assert short.order_id == 'ORD_1'
+    assert long.order_id == long_id
+    assert list(table.to_frame()['ID']) == ['ORD_1', long_id]
+
+
+def test_long_order_ids_survive_state_round_trip():
+    table = OrderTable()
+    ids = [f"pedido-{i}-{uuid.uuid4()}" for i in range(3)]
+    for order_id in ids:
+        Order(order_id, 'S1', 'T1', table=table)
+
+    restored = OrderTable.from_state(**table.export_state())
+
+    assert [restored.get_order_id(row) for row in range(len(restored))] == ids
+
+
+def test_standalone_orders_do_not_share_a_table():
+    first = Order('ORD_1', 'S1', 'T1')
+    second = Order('ORD_2', 'S1', 'T2')
+
+    assert first.table is not second.table
+    assert len(first.table) == 1 and len(second.table) == 1
+    assert second.order_id == 'ORD_2'
@@ -0,0 +1,64 @@
+import itertools
+
+from src.model.Graph import Graph
+from src.sim import RouteCacheStore as route_cache_module
+from src.sim.RouteCacheStore import RouteCacheStore
+from src.sim.SimulationInitializer import SimulationInitializer
+
+RESULT = {'path': ['S1', 'C1', 'T1'], 'completed': True, 'battery_left': 20}
+
+
+def test_results_survive_reopening_the_store(tmp_path):
+    path = tmp_path / 'routes.sqlite'
+    with RouteCacheStore(str(path), batch_size=2) as store:
+        store.put('red-a', 'S1-T1', RESULT)
+        assert store.get('red-a', 'S1-T1') == RESULT  # Pendiente, aún sin confirmar
+        store.put('red-a', 'S1-T2', dict(RESULT, completed=False))
+
+    with RouteCacheStore(str(path)) as store:
+        assert len(store) == 2
+        assert store.load('red-a')['S1-T1'] == RESULT
+        assert store.get('red-b', 'S1-T1') is None
+
+
+def test_prune_keeps_the_most_recently_used_networks(monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(route_cache_module.time, 'time', lambda: next(clock))
+    store = RouteCacheStore(':memory:', max_networks=2)
+    for fingerprint in ('red-a', 'red-b'):
+        store.put(fingerprint, 'S1-T1', RESULT)
+        store.load(fingerprint)
+
+    store.load('red-a')  # red-b pasa a ser la usada hace más tiempo
+    store.put('red-c', 'S1-T1', RESULT)
+    store.load('red-c')
+
+    assert store.get('red-a', 'S1-T1') == RESULT
+    assert store.get('red-b', 'S1-T1') is None
+    assert store.get('red-c', 'S1-T1') == RESULT
+    assert store.discard(keep='red-c') == 1
+    assert len(store) == 1
+
+
+def build_simulation(store):
+    graph = Graph()
+    for start, end, weight in (('S1', 'C1', 30), ('C1', 'T1', 30), ('S1', 'T2', 10)):
+        graph.add_edge(start, end, weight)
+    simulation = SimulationInitializer()
+    simulation.restore_network(graph, ['S1'], ['C1'], ['T1', 'T2'], drone_autonomy=50)
+    simulation.use_route_store(store)
+    return simulation
+
+
+def test_a_new_simulation_on_the_same_network_reads_the_store():
+    store = RouteCacheStore(':memory:')
+    first = build_simulation(store)
+    expected = first.find_path_with_charging('S1', 'T1')
+    store.flush()
+
+    second = build_simulation(store)
+    assert second.find_path_with_charging('S1', 'T1') == expected
+    assert second._route_store_hits == 1
+
+    second.graph.add_edge('T2', 'T1', 10)  # Otra huella: no reutiliza resultados
+    assert list(second.find_path_with_charging('S1', 'T1')['path']) == ['S1', 'T2', 'T1']
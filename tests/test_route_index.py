@@ -0,0 +1,39 @@
+from src.model.Graph import Graph
+from src.model.NodeRegistry import NodeRegistry
+from src.sim.SimulationInitializer import SimulationInitializer
+
+
+def build_shared_prefix_simulation():
+    graph = Graph()
+    edges = [('S1', 'T1', 1), ('T1', 'T2', 1), ('T2', 'T3', 1), ('S1', 'T4', 2), ('T4', 'T2', 2)]
+    for start, end, _ in edges:
+        graph.add_vertex(start)
+        graph.add_vertex(end)
+    for start, end, weight in edges:
+        graph.add_edge(start, end, weight)
+    simulation = SimulationInitializer()
+    simulation.restore_network(graph, ['S1'], [], ['T1', 'T2', 'T3', 'T4'])
+    for path in (['S1', 'T1', 'T2', 'T3'], ['S1', 'T1', 'T2'], ['S1', 'T4', 'T2']):
+        simulation.register_route(path)
+    return simulation
+
+
+def test_edge_weight_change_refreshes_shared_prefix_costs():
+    simulation = build_shared_prefix_simulation()
+
+    simulation.graph.update_edge_weight('T1', 'T2', 10)
+
+    prefix = simulation.route_index._trie.find(NodeRegistry.shared().encode(['S1', 'T1', 'T2']))
+    assert prefix.data == (0, 11)
+    assert simulation.route_index.find_prefix('S1', 'T2') == ['S1', 'T4', 'T2']
+
+
+def test_routes_through_edge_to_an_unrouted_node():
+    simulation = build_shared_prefix_simulation()
+    NodeRegistry.shared().encode(['T9'])  # Internado por una red anterior, sin rutas
+
+    assert simulation.route_index.routes_through_edge('T3', 'T9') == []
+
+    simulation.graph.add_vertex('T9')
+    simulation.graph.add_edge('T3', 'T9', 1)
+    assert simulation.route_index.routes_through_edge('T1', 'T2') != []
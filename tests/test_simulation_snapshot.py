@@ -0,0 +1,63 @@
+import io
+import json
+import random
+
+import numpy as np
+import pytest
+
+from src.sim.SimulationInitializer import SimulationInitializer
+from src.sim.SimulationSnapshot import SimulationSnapshot
+
+
+def build_simulation():
+    random.seed(7)
+    simulation = SimulationInitializer()
+    simulation.initialize_simulation(30, 45, 40)
+    simulation.find_path_with_charging('S1', 'T1')
+    simulation.complete_delivery(simulation.orders[0])
+    return simulation
+
+
+def save(simulation):
+    buffer = io.BytesIO()
+    simulation.save_snapshot(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_snapshot_round_trip_restores_the_full_state():
+    original = build_simulation()
+
+    restored = SimulationInitializer()
+    graph, orders, clients = restored.load_snapshot(save(original))
+
+    assert graph.edge_weights == original.graph.edge_weights
+    assert restored.node_types == original.node_types
+    assert restored.DRONE_AUTONOMY == original.DRONE_AUTONOMY
+    assert restored.get_route_frequencies() == original.get_route_frequencies()
+    assert len(orders) == len(original.orders)
+    assert restored.order_table.to_frame().equals(original.order_table.to_frame())
+    assert [len(client.orders) for client in clients] == [len(client.orders) for client in original.clients]
+    assert restored.path_cache.keys() == original.path_cache.keys()
+    assert restored.find_path_with_charging('S1', 'T1') == original.find_path_with_charging('S1', 'T1')
+
+
+def test_snapshot_restores_only_the_requested_sections():
+    original = build_simulation()
+
+    restored = SimulationInitializer()
+    restored.load_snapshot(save(original), sections=('graph',))
+
+    assert restored.graph.edge_weights == original.graph.edge_weights
+    assert restored.route_registry.total_frequency() == 0
+    assert len(restored.orders) == 0
+    assert restored.path_cache == {}
+
+
+def test_snapshot_rejects_an_unknown_format_version():
+    buffer = io.BytesIO()
+    np.savez(buffer, meta=np.array(json.dumps({'format_version': 999})))
+    buffer.seek(0)
+
+    with pytest.raises(ValueError):
+        SimulationSnapshot.open(buffer)